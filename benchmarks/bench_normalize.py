@@ -0,0 +1,51 @@
+"""
+Compares normalize_dataframe with the row-by-row reference path on
+SyntheticBoard items. The speedup is measured against the
+row-by-row path plus the dtype conversions the columnar path does.
+
+    python -m benchmarks.bench_normalize [item_count ...]
+"""
+import sys
+import time
+import pandas as pd
+from benchmarks.synthetic import SyntheticBoard
+from src.data_processor import normalize_dataframe, normalize_dataframe_rowwise
+
+
+def rowwise_then_typed(items):
+    """
+    The row-by-row path followed by the dtype conversions normalize_dataframe
+    does, i.e. what the old path costs for the same output.
+    """
+    df = normalize_dataframe_rowwise(items)
+    for col, col_type in {cell['id']: cell['type'] for cell in items[0]['column_values']}.items():
+        if col_type == 'date':
+            df[col] = pd.to_datetime(df[col].replace('', None), errors='coerce', format='ISO8601')
+        elif col_type in ('status', 'dropdown'):
+            df[col] = df[col].astype('category')
+        elif col_type in ('people', 'tags'):
+            df[col] = [text.split(', ') if isinstance(text, str) and text else [] for text in df[col]]
+    return df
+
+
+def best_of(fn, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(counts):
+    print(f"{'items':>8} {'rowwise (s)':>12} {'rowwise+typed (s)':>18} {'columnar (s)':>13} {'speedup':>8}")
+    for count in counts:
+        items = SyntheticBoard(count).items()
+        rowwise = best_of(lambda: normalize_dataframe_rowwise(items))
+        typed = best_of(lambda: rowwise_then_typed(items))
+        columnar = best_of(lambda: normalize_dataframe(items))
+        print(f"{count:>8} {rowwise:>12.3f} {typed:>18.3f} {columnar:>13.3f} {typed / columnar:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000])
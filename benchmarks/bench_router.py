@@ -0,0 +1,99 @@
+"""
+Compares the compiled Router with the keyword if/elif chain the CLI used
+before, over a corpus of founder questions (founder_questions.txt), then
+with an intent table grown by synthetic intents to show how each scales.
+
+    python -m benchmarks.bench_router [repeat]
+"""
+import os
+import random
+import string
+import sys
+import time
+from src.router import INTENTS, Router
+
+CORPUS = os.path.join(os.path.dirname(__file__), 'founder_questions.txt')
+
+
+def legacy_route(query):
+    """
+    The routing main.py did before the router, for comparison.
+    """
+    user_input = query.lower()
+    if 'update' in user_input or 'summary' in user_input or 'report' in user_input:
+        return 'leadership_update'
+    elif any(word in user_input for word in ('risk', 'deliver', 'conversion', 'stuck', 'blocked')):
+        return 'cross_board'
+    elif 'pipeline' in user_input or 'sales' in user_input or 'deal' in user_input:
+        return 'pipeline'
+    elif 'operation' in user_input or 'work' in user_input or 'order' in user_input or 'status' in user_input:
+        return 'operations'
+    return None
+
+
+def chain_route(intents):
+    """
+    A generic if/elif substring chain over an intent table.
+    """
+    def route(query):
+        user_input = query.lower()
+        for intent, _, _, keywords in intents:
+            if any(keyword in user_input for keyword in keywords):
+                return intent
+        return None
+    return route
+
+
+def grown_intents(extra, seed=0):
+    """
+    INTENTS followed by extra synthetic intents of eight made-up keywords each.
+    """
+    rng = random.Random(seed)
+    synthetic = [
+        (f'intent_{index}', 'get_pipeline_benth', '',
+         [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10))) for _ in range(8)])
+        for index in range(extra)
+    ]
+    return INTENTS + synthetic
+
+
+def load_corpus():
+    with open(CORPUS) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def per_query_us(fn, questions, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for question in questions:
+            fn(question)
+    return (time.perf_counter() - start) / (repeat * len(questions)) * 1e6
+
+
+def main(repeat=2000):
+    questions = load_corpus()
+    start = time.perf_counter()
+    router = Router()
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    legacy = per_query_us(legacy_route, questions, repeat)
+    routed = per_query_us(router.route, questions, repeat)
+    answered = sum(router.route(question) is not None for question in questions)
+    with_params = sum(bool(route.params) for route in map(router.route, questions) if route)
+    legacy_answered = sum(legacy_route(question) is not None for question in questions)
+
+    print(f"{len(questions)} questions, router compiled in {compile_ms:.2f} ms")
+    print(f"{'':<8} {'us/query':>9} {'answered':>9} {'with params':>12}")
+    print(f"{'legacy':<8} {legacy:>9.2f} {legacy_answered:>9} {'-':>12}")
+    print(f"{'router':<8} {routed:>9.2f} {answered:>9} {with_params:>12}")
+
+    print(f"\n{'intents':>8} {'chain us/query':>15} {'router us/query':>16}")
+    for extra in (0, 20, 100):
+        intents = grown_intents(extra)
+        chain = per_query_us(chain_route(intents), questions, repeat // 4)
+        routed = per_query_us(Router(intents).route, questions, repeat // 4)
+        print(f"{len(intents):>8} {chain:>15.2f} {routed:>16.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
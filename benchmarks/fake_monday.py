@@ -0,0 +1,210 @@
+"""
+Local HTTP stand-in for https://api.monday.com/v2, serving SyntheticBoards.
+
+It understands the queries MondayClient sends: items_page with cursors,
+query_params updated-since filters and projected column_values, columns,
+and items_count, one board per request or batched under aliases (b0:
+boards, p0: next_items_page). Each page costs PAGE_COMPLEXITY points,
+reported when the query asks for complexity. Latency and rate limiting
+(HTTP 429 with Retry-After) can be simulated.
+
+    with FakeMondayServer({1: SyntheticBoard(10_000)}, latency=0.05) as server:
+        client = MondayClient(api_key="test", api_url=server.url)
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from benchmarks.synthetic import items_page_payload
+
+LIMIT_RE = re.compile(r"limit:\s*(\d+)")
+VALUE_FIELD_RE = re.compile(r"\bvalue\b")
+ALIAS_RE = re.compile(r"\b([bp]\d+): (boards|next_items_page) \(")
+
+PAGE_COMPLEXITY = 5_000
+ACCOUNT_COMPLEXITY = 10_000_000
+
+
+class FakeMondayServer:
+    """
+    Serves boards ({board_id: SyntheticBoard}) on a local port.
+    Every rate_limit_every-th request is answered with a 429.
+    """
+    def __init__(self, boards, latency=0.0, rate_limit_every=0, retry_after=0, host="127.0.0.1", port=0):
+        self.boards = boards
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.stats = {"requests": 0, "throttled": 0, "bytes_sent": 0, "complexity": 0}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v2"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-monday", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                status, payload, headers = server.handle(body.get("query", ""), body.get("variables") or {})
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+                with server._lock:
+                    server.stats["bytes_sent"] += len(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def handle(self, query, variables):
+        """
+        Answers one GraphQL request. Returns (status, payload, headers).
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            throttle = self.rate_limit_every and self.stats["requests"] % self.rate_limit_every == 0
+            if throttle:
+                self.stats["throttled"] += 1
+        if throttle:
+            return 429, {"error_message": "Rate limit exceeded"}, {"Retry-After": str(self.retry_after)}
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if ALIAS_RE.search(query):
+            payload, pages = self._batch(query, variables)
+        else:
+            payload, pages = self._single(query, variables)
+        if "complexity" in query and "data" in payload:
+            cost = 10 + pages * PAGE_COMPLEXITY
+            with self._lock:
+                self.stats["complexity"] += cost
+                used = self.stats["complexity"]
+            payload["data"]["complexity"] = {"query": cost, "after": max(0, ACCOUNT_COMPLEXITY - used)}
+        return 200, payload, {}
+
+    def _single(self, query, variables):
+        board = self.boards.get(int(variables.get("board_id", [0])[0]))
+        if board is None:
+            return {"data": {"boards": []}}, 0
+
+        if "items_page" in query:
+            return self._items_page(board, query, variables), 1
+        if "items_count" in query:
+            return {"data": {"boards": [{"items_count": board.item_count}]}}, 0
+        if "columns" in query:
+            return {"data": {"boards": [{"columns": board.schema()}]}}, 0
+        return {"errors": [{"message": "Unsupported query"}]}, 0
+
+    def _batch(self, query, variables):
+        """
+        Answers each aliased boards / next_items_page field of a batched query.
+        """
+        data = {}
+        pages = 0
+        matches = list(ALIAS_RE.finditer(query))
+        for position, match in enumerate(matches):
+            alias, field = match.groups()
+            index = alias[1:]
+            end = matches[position + 1].start() if position + 1 < len(matches) else len(query)
+            body = query[match.start():end]
+
+            if field == "next_items_page":
+                board_id, offset, updated_after = self._parse_cursor(variables[f"cursor_{index}"])
+                items, cursor = self._page(self.boards[board_id], body, variables.get(f"columns_{index}"), offset,
+                                           updated_after)
+                data[alias] = {"cursor": cursor, "items": items}
+                pages += 1
+                continue
+
+            board = self.boards.get(int(variables[f"board_{index}"][0]))
+            if board is None:
+                data[alias] = []
+                continue
+            result = {"id": str(board.board_id)}
+            if "items_count" in body:
+                result["items_count"] = board.item_count
+            if "columns {" in body:
+                result["columns"] = board.schema()
+            if "items_page" in body:
+                updated_after = self._updated_after({"query_params": variables.get(f"params_{index}")})
+                items, cursor = self._page(board, body, variables.get(f"columns_{index}"), 0, updated_after)
+                result["items_page"] = {"cursor": cursor, "items": items}
+                pages += 1
+            data[alias] = [result]
+        return {"data": data}, pages
+
+    @staticmethod
+    def _updated_after(variables):
+        for rule in (variables.get("query_params") or {}).get("rules", []):
+            if rule.get("column_id") == "__last_updated__":
+                return rule["compare_value"][-1]
+        return None
+
+    @staticmethod
+    def _parse_cursor(cursor):
+        # board_id:offset:updated_after, the filter carried on like Monday's cursors
+        board_id, offset, updated_after = (cursor.split(":", 2) + [""])[:3]
+        return int(board_id), int(offset), updated_after or None
+
+    def _items_page(self, board, query, variables):
+        cursor = variables.get("cursor")
+        if cursor:
+            _, offset, updated_after = self._parse_cursor(cursor)
+        else:
+            offset, updated_after = 0, self._updated_after(variables)
+        items, next_cursor = self._page(board, query, variables.get("column_ids"), offset, updated_after)
+        return items_page_payload(items, next_cursor)
+
+    def _page(self, board, query, column_ids, offset, updated_after):
+        """
+        One page of board from offset: (items, next cursor or None).
+        """
+        match = LIMIT_RE.search(query)
+        limit = int(match.group(1)) if match else 25
+        bare = "column_values" not in query
+        with_value = not bare and bool(VALUE_FIELD_RE.search(query.split("column_values", 1)[1].split("}", 1)[0]))
+
+        items = []
+        while offset < board.item_count and len(items) < limit:
+            item = board.item(offset, column_ids, with_value)
+            offset += 1
+            if updated_after is not None and item["updated_at"] <= updated_after:
+                continue
+            if bare:
+                del item["column_values"]
+            items.append(item)
+
+        next_cursor = f"{board.board_id}:{offset}:{updated_after or ''}" if offset < board.item_count else None
+        return items, next_cursor
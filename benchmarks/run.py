@@ -0,0 +1,166 @@
+"""
+Offline benchmark suite for the fetch, normalize and analyze hot paths.
+
+Fetches run against a FakeMondayServer in a child process, so its memory
+and CPU don't count against the client. For every board size it reports
+throughput, latency percentiles and peak traced memory of:
+
+    fetch      MondayClient.get_board_items (p50/p95 per HTTP request)
+    stream     DataProcessor.from_pages over iter_board_pages (also the
+               frame's size before and after compaction)
+    normalize  normalize_dataframe on items already in memory
+    analyze.*  each Analyzer method on a fresh Analyzer (cold aggregates),
+               over the normalized frame cleaned and compacted as the app does
+
+    python -m benchmarks.run [--sizes 1000 10000 100000] [--latency 0.02]
+                             [--rate-limit-every 0] [--json results.json]
+"""
+import argparse
+import json
+import multiprocessing
+import time
+import tracemalloc
+from benchmarks.fake_monday import FakeMondayServer
+from benchmarks.synthetic import SyntheticBoard
+from src.analyzer import Analyzer
+from src.data_processor import DataProcessor, normalize_dataframe
+from src.monday_api import MondayClient
+
+ANALYZER_METHODS = ['get_pipeline_benth', 'get_operational_status', 'generate_leadership_update']
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(round(p * (len(samples) - 1))))]
+
+
+def measure(fn, repeat):
+    """
+    Runs fn repeat times for timings, then once more under tracemalloc for
+    the peak. Returns (timings, peak_bytes, last_result).
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return timings, peak, result
+
+
+def row(name, items, timings, peak, latencies=None):
+    latencies = timings if latencies is None else latencies
+    best = min(timings)
+    return {
+        "benchmark": name,
+        "items": items,
+        "items_per_s": items / best if best else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "peak_mb": peak / (1024 * 1024),
+    }
+
+
+def _serve(boards, options, urls, stop):
+    with FakeMondayServer(boards, **options) as server:
+        urls.put(server.url)
+        stop.wait()
+
+
+class ServerProcess:
+    """
+    Runs a FakeMondayServer in a child process for the duration of a with block.
+    """
+    def __init__(self, boards, **options):
+        self.boards = boards
+        self.options = options
+
+    def __enter__(self):
+        context = multiprocessing.get_context("spawn")
+        urls = context.Queue()
+        self.stop = context.Event()
+        self.process = context.Process(target=_serve, args=(self.boards, self.options, urls, self.stop), daemon=True)
+        self.process.start()
+        return urls.get(timeout=30)
+
+    def __exit__(self, *exc):
+        self.stop.set()
+        self.process.join(timeout=10)
+
+
+def bench_size(size, args):
+    board = SyntheticBoard(size, column_count=args.columns, messiness=args.messiness)
+    results = []
+
+    with ServerProcess({board.board_id: board}, latency=args.latency,
+                       rate_limit_every=args.rate_limit_every) as url:
+        client = MondayClient(api_key="bench", api_url=url, backoff_base=0.01, backoff_max=0.1)
+        timings, peak, _ = measure(lambda: client.get_board_items(board.board_id), args.repeat)
+        summary = client.stats.summary()
+        results.append(row("fetch", size, timings, peak, list(client.stats.latencies)))
+        results[-1]["retries"] = summary["retries"]
+
+        timings, peak, processor = measure(
+            lambda: DataProcessor.from_pages(client.iter_board_pages(board.board_id)), args.repeat
+        )
+        results.append(row("stream", size, timings, peak))
+        total = processor.memory_report().loc['total']
+        results[-1]["frame_mb_before"] = total['bytes_before'] / 1e6
+        results[-1]["frame_mb_after"] = total['bytes_after'] / 1e6
+        client.close()
+
+    items = board.items()
+    columns_map = {col['id']: col['title'] for col in board.schema()}
+    timings, peak, df = measure(lambda: normalize_dataframe(items, columns_map), args.repeat)
+    results.append(row("normalize", size, timings, peak))
+    del items
+
+    # Cleaned and compacted as the app loads boards, so amounts typed as text
+    # are parsed and the analytics take their real value-column path
+    df = DataProcessor.from_frames([df]).clean_data()
+    for method in ANALYZER_METHODS:
+        timings, peak, _ = measure(lambda: getattr(Analyzer(df, df), method)(), args.repeat)
+        results.append(row(f"analyze.{method}", size, timings, peak))
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--columns", type=int, default=12)
+    parser.add_argument("--messiness", type=float, default=0.1)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated API latency per request, seconds")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth request with a 429")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'benchmark':<38} {'items':>8} {'items/s':>12} {'p50 ms':>9} {'p95 ms':>9} {'peak MB':>9}")
+    for size in args.sizes:
+        for result in bench_size(size, args):
+            results.append(result)
+            print(f"{result['benchmark']:<38} {result['items']:>8} {result['items_per_s']:>12,.0f} "
+                  f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['peak_mb']:>9.1f}")
+            if "frame_mb_after" in result:
+                print(f"{'  frame size, compacted':<38} {result['frame_mb_before']:>8.1f} MB -> "
+                      f"{result['frame_mb_after']:.1f} MB")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
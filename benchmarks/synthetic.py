@@ -0,0 +1,99 @@
+"""
+Synthetic Monday boards: a column schema plus items shaped like the
+items_page payloads of the v2 API, with configurable size and messiness.
+
+Items are generated deterministically from (seed, index), so a board of
+any size can be served page by page without holding it in memory.
+"""
+import json
+import random
+
+# Columns every synthetic board starts with, so the analytics have
+# something to find; extra columns cycle through EXTRA_COLUMNS
+BASE_COLUMNS = [
+    ('deal_stage', 'Deal Stage', 'status'),
+    ('deal_value', 'Deal Value', 'numbers'),
+    ('close_date', 'Close Date', 'date'),
+    ('owner', 'Owner', 'people'),
+    ('status', 'Status', 'status'),
+    ('priority', 'Priority', 'status'),
+]
+EXTRA_COLUMNS = [('text', 'Notes'), ('numbers', 'Cost'), ('dropdown', 'Sector'), ('tags', 'Tags'), ('date', 'Start')]
+
+STAGES = ['Lead', 'Qualified', 'Proposal', 'Negotiation', 'Closed Won', 'Closed Lost']
+STATUSES = ['Not Started', 'Working on it', 'Stuck', 'Done']
+PRIORITIES = ['Low', 'Medium', 'High', 'Critical']
+SECTORS = ['Mining', 'Energy', 'Agriculture', 'Infrastructure', 'Defence']
+PEOPLE = ['Asha Rao', 'Ben Ortiz', 'Chen Wei', 'Dana Kim', 'Eli Novak']
+
+
+class SyntheticBoard:
+    """
+    A board of item_count items and column_count columns (at least the
+    base ones). messiness is the share of cells given empty, badly
+    formatted or inconsistently cased values.
+    """
+    def __init__(self, item_count, column_count=10, messiness=0.1, seed=0, board_id=1):
+        self.item_count = item_count
+        self.messiness = messiness
+        self.seed = seed
+        self.board_id = board_id
+        self.columns = list(BASE_COLUMNS)
+        for index in range(max(0, column_count - len(BASE_COLUMNS))):
+            col_type, title = EXTRA_COLUMNS[index % len(EXTRA_COLUMNS)]
+            self.columns.append((f'{col_type}_{index}', f'{title} {index}', col_type))
+
+    def schema(self):
+        return [{'id': col_id, 'title': title, 'type': col_type} for col_id, title, col_type in self.columns]
+
+    def item(self, index, column_ids=None, with_value=True):
+        rng = random.Random(self.seed * 1_000_003 + index)
+        column_values = []
+        for col_id, _, col_type in self.columns:
+            if column_ids is not None and col_id not in column_ids:
+                continue
+            text = self._text(col_id, col_type, rng)
+            cell = {'id': col_id, 'text': text, 'type': col_type}
+            if with_value:
+                cell['value'] = json.dumps({'text': text}) if text else None
+            column_values.append(cell)
+        return {
+            'id': str(self.board_id * 10_000_000 + index),
+            'name': f'Item {index}',
+            'updated_at': f'2026-{1 + index % 12:02d}-{1 + index % 28:02d}T00:00:00Z',
+            'column_values': column_values,
+        }
+
+    def items(self, start=0, stop=None, column_ids=None, with_value=True):
+        stop = self.item_count if stop is None else min(stop, self.item_count)
+        return [self.item(index, column_ids, with_value) for index in range(start, stop)]
+
+    def _text(self, col_id, col_type, rng):
+        messy = rng.random() < self.messiness
+        if messy and rng.random() < 0.4:
+            return rng.choice(['', None])
+
+        if col_type == 'numbers':
+            value = rng.uniform(1_000, 2_000_000)
+            if messy:
+                return rng.choice([f' {value:,.2f} ', 'TBD', f'{value:.0f}'])
+            return f'{value:.2f}'
+        if col_type == 'date':
+            day = f'2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'
+            return f'{day} 09:30' if messy else day
+        if col_type == 'people':
+            return ', '.join(rng.sample(PEOPLE, rng.randint(1, 2)))
+        if col_type == 'tags':
+            return ', '.join(rng.sample(SECTORS, rng.randint(0, 2)))
+        if col_type in ('status', 'dropdown'):
+            choices = {'deal_stage': STAGES, 'status': STATUSES, 'priority': PRIORITIES}.get(col_id, SECTORS)
+            text = rng.choice(choices)
+            return text.lower() if messy else text
+        return f'note {rng.randint(0, 100_000)}'
+
+
+def items_page_payload(items, cursor):
+    """
+    The JSON body Monday returns for one items_page request.
+    """
+    return {'data': {'boards': [{'items_page': {'cursor': cursor, 'items': items}}]}}
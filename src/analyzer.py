@@ -1,84 +1,536 @@
+import re
+import threading
+import numpy as np
 import pandas as pd
+from src.columns import resolve_frame_columns
+from src.linkage import LinkIndex, name_column
+from src.tracing import tracer, traced
+
+# Status and stage words the cross-board metrics look for
+BLOCKED_STATUSES = ['stuck', 'blocked', 'on hold']
+DONE_STATUSES = ['done', 'complete', 'delivered']
+WON_STAGES = ['won']
+LOST_STAGES = ['lost']
+
+def _matches(series, words):
+    """
+    Boolean mask of cells containing any of words, case insensitive.
+    Categorical columns are matched once per category.
+    """
+    pattern = '|'.join(words)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        flags = np.append(np.asarray(series.cat.categories.astype(str).str.lower().str.contains(pattern, regex=True),
+                                     dtype=bool), False)
+        # Missing values have code -1, which picks the trailing False
+        return pd.Series(flags[series.cat.codes.values], index=series.index)
+    return series.astype(str).str.lower().str.contains(pattern, regex=True) & series.notna()
+
+def _amounts(series):
+    """
+    An amount column as float64 with blanks as 0. Amounts are parsed once
+    when boards are cleaned (see clean_frame), never here.
+    """
+    return series.to_numpy(dtype='float64', na_value=0.0)
+
+def _counts(series):
+    """
+    value_counts without the zero rows categorical columns report for unused categories.
+    """
+    counts = series.value_counts()
+    return counts[counts > 0]
+
+def quarter_range(quarter):
+    """
+    (start, end) timestamps of a 'YYYY-Qn' quarter, end exclusive.
+    """
+    year, number = quarter.upper().split('-Q')
+    start = pd.Timestamp(int(year), 3 * (int(number) - 1) + 1, 1)
+    return start, start + pd.DateOffset(months=3)
+
+# Trend periods: calendar buckets as resample rules, rolling windows in days
+PERIODS = {'month': 'MS', 'quarter': 'QS'}
+ROLLING_PERIODS = {'rolling_30d': 30, 'rolling_90d': 90}
+
+def _date_indexed(df, date_col):
+    """
+    df indexed by date_col and sorted, without rows lacking a date; None
+    if there is no such column. Dates are already datetime64 for frames
+    from normalize_dataframe.
+    """
+    if df is None or df.empty or not date_col:
+        return None
+    dates = pd.to_datetime(df[date_col], errors='coerce')
+    if getattr(dates.dt, 'tz', None) is not None:
+        dates = dates.dt.tz_localize(None)
+    view = df.set_index(pd.DatetimeIndex(dates.values, name='date'))
+    return view[view.index.notna()].sort_index(kind='stable')
+
+def _slice_quarter(view, quarter):
+    """
+    Rows of a date-indexed view within quarter, by binary search on the index.
+    """
+    start, end = quarter_range(quarter)
+    return view.loc[start:end - pd.Timedelta(1, 'ns')].reset_index(drop=True)
+
+def _period_table(flags, period):
+    """
+    Sums the numeric columns of a date-indexed frame per period: one row
+    per month or quarter start, or per day over a trailing rolling window.
+    """
+    if period in PERIODS:
+        return flags.resample(PERIODS[period]).sum()
+    if period in ROLLING_PERIODS:
+        daily = flags.resample('D').sum()
+        return daily.rolling(ROLLING_PERIODS[period], min_periods=1).sum()
+    raise ValueError(f"Unknown period '{period}', expected one of {sorted(PERIODS) + sorted(ROLLING_PERIODS)}")
+
+def _ratio(numerator, denominator):
+    return (numerator / denominator.where(denominator > 0)).astype('float64')
+
+def _filter_frame(df, columns, owner=None, sector=None):
+    """
+    Rows of df matching owner (any listed name containing it) and sector,
+    using the frame's semantic columns. Filters whose column the frame
+    doesn't have are skipped.
+    """
+    if df is None or df.empty:
+        return df
+    mask = pd.Series(True, index=df.index)
+    if owner and columns.get('owner'):
+        needle = owner.lower()
+        mask &= df[columns['owner']].map(
+            lambda names: any(needle in str(name).lower() for name in (names if isinstance(names, list) else [names]))
+        ).astype(bool)
+    if sector and columns.get('sector'):
+        mask &= _matches(df[columns['sector']], [re.escape(sector.lower())])
+    return df[mask.values]
+
+# Aggregates built from each frame, dropped when it is replaced
+CROSS_BOARD_AGGREGATES = ('links', 'cross_board', 'cross_board_text')
+DEALS_AGGREGATES = ('deals_columns', 'pipeline', 'pipeline_text', 'deals_by_date', 'deal_flags',
+                    'pipeline_trend') + CROSS_BOARD_AGGREGATES
+WORK_ORDERS_AGGREGATES = ('work_orders_columns', 'operations', 'operations_text', 'work_orders_by_date',
+                          'work_order_flags', 'throughput_trend') + CROSS_BOARD_AGGREGATES
 
 class Analyzer:
+    """
+    Answers pipeline and operations questions over the deals and work
+    orders frames.
+
+    The aggregates behind every answer are computed once and stored until
+    a frame is replaced; assigning a different deals_df or work_orders_df
+    invalidates only the aggregates built from it, while re-assigning the
+    same object keeps them. Frames are treated as immutable, so pass a new
+    frame rather than editing one in place.
+
+    Aggregates are computed under a lock, so threads may share an Analyzer
+    whose frames they do not replace; servers keep one per data version
+    (see AnalyzerVersions).
+    """
     def __init__(self, deals_df=None, work_orders_df=None):
+        self._lock = threading.RLock()
+        self._aggregates = {}
+        # Kept across frame changes so it can be updated incrementally
+        self._links = LinkIndex()
         self.deals_df = deals_df
         self.work_orders_df = work_orders_df
 
-    def _find_column_by_similarity(self, df, keywords):
+    @property
+    def deals_df(self):
+        return self._deals_df
+
+    @deals_df.setter
+    def deals_df(self, df):
+        # Waits for aggregates being computed from the frame it replaces
+        with self._lock:
+            if df is getattr(self, '_deals_df', None) and df is not None:
+                return
+            self._deals_df = df
+            self._invalidate(DEALS_AGGREGATES)
+
+    @property
+    def work_orders_df(self):
+        return self._work_orders_df
+
+    @work_orders_df.setter
+    def work_orders_df(self, df):
+        # Waits for aggregates being computed from the frame it replaces
+        with self._lock:
+            if df is getattr(self, '_work_orders_df', None) and df is not None:
+                return
+            self._work_orders_df = df
+            self._invalidate(WORK_ORDERS_AGGREGATES)
+
+    def _invalidate(self, names):
+        # Per-period aggregates are keyed 'name:period'
+        with self._lock:
+            for key in [key for key in self._aggregates if key.split(':')[0] in names]:
+                del self._aggregates[key]
+
+    def _cached(self, key, compute):
+        # Reentrant: aggregates are built from other aggregates
+        with self._lock:
+            value = self._aggregates.get(key)
+            if value is not None or key in self._aggregates:
+                tracer.count('analyzer.cache.hits')
+                return value
+            tracer.count('analyzer.cache.misses')
+            value = self._aggregates[key] = compute()
+            return value
+
+    def with_frames(self, deals_df, work_orders_df):
+        """
+        A new Analyzer over deals_df and work_orders_df that starts with
+        this one's aggregates of the frames the two share, leaving this
+        one untouched.
+        """
+        analyzer = Analyzer()
+        with self._lock:
+            analyzer._aggregates = dict(self._aggregates)
+            analyzer._links = self._links.copy()
+            analyzer._deals_df = self._deals_df
+            analyzer._work_orders_df = self._work_orders_df
+        analyzer.deals_df = deals_df
+        analyzer.work_orders_df = work_orders_df
+        return analyzer
+
+    def scoped(self, owner=None, sector=None, quarter=None):
+        """
+        A new Analyzer over the deals and work orders of one owner, sector
+        and/or quarter ('YYYY-Qn', by each board's date column).
+        """
+        deals, work_orders = self.deals_df, self.work_orders_df
+        if quarter:
+            # Boards without a date column stay unfiltered
+            if self.deals_by_date() is not None:
+                deals = _slice_quarter(self.deals_by_date(), quarter)
+            if self.work_orders_by_date() is not None:
+                work_orders = _slice_quarter(self.work_orders_by_date(), quarter)
+        return Analyzer(
+            _filter_frame(deals, self.deals_columns(), owner, sector),
+            _filter_frame(work_orders, self.work_orders_columns(), owner, sector),
+        )
+
+    def sectors(self):
+        """
+        Distinct sector values of the deals, for query parsing.
+        """
+        col = self.deals_columns().get('sector')
+        if not col:
+            return []
+        return [str(value) for value in self.deals_df[col].dropna().unique()]
+
+    def owners(self):
+        """
+        Distinct names in the deals' owner column, for query parsing.
+        """
+        col = self.deals_columns().get('owner')
+        if not col:
+            return []
+        names = set()
+        for value in self.deals_df[col].dropna():
+            names.update(str(name) for name in (value if isinstance(value, list) else [value]) if name)
+        return sorted(names)
+
+    def deals_columns(self):
+        """
+        Semantic columns of the deals frame ({'value': title, 'stage': title, ...}).
+        """
+        return self._cached('deals_columns', self._resolve_deals_columns)
+
+    def _resolve_deals_columns(self):
+        columns = resolve_frame_columns(self.deals_df)
+        # A value column still holding text after cleaning holds no amounts
+        value_col = columns.get('value')
+        if value_col and not pd.api.types.is_numeric_dtype(self.deals_df[value_col].dtype):
+            del columns['value']
+        return columns
+
+    def work_orders_columns(self):
+        """
+        Semantic columns of the work orders frame ({'status': title, ...}).
+        """
+        return self._cached('work_orders_columns', lambda: resolve_frame_columns(self.work_orders_df))
+
+    @traced('analyzer.pipeline_metrics')
+    def pipeline_metrics(self):
+        """
+        Pipeline aggregates: total_deals, value_col, total_value, avg_value,
+        stage_col, stage_counts and, for deals merged from several registry
+        boards, value_by_source. None if there is no deals data.
+        """
+        return self._cached('pipeline', self._compute_pipeline_metrics)
+
+    def _compute_pipeline_metrics(self):
+        if self.deals_df is None or self.deals_df.empty:
+            return None
+
+        columns = self.deals_columns()
+        value_col = columns.get('value')
+        stage_col = columns.get('stage')
+
+        metrics = {
+            'total_deals': len(self.deals_df),
+            'value_col': value_col,
+            'total_value': None,
+            'avg_value': None,
+            'stage_col': stage_col,
+            'stage_counts': None,
+            'value_by_source': None,
+        }
+        if value_col:
+            numeric_values = pd.Series(_amounts(self.deals_df[value_col]), index=self.deals_df.index)
+            metrics['total_value'] = numeric_values.sum()
+            metrics['avg_value'] = numeric_values.mean()
+            if 'source' in self.deals_df.columns and self.deals_df['source'].nunique() > 1:
+                by_source = numeric_values.groupby(self.deals_df['source'].values).sum()
+                metrics['value_by_source'] = by_source.sort_values(ascending=False)
+        if stage_col:
+            metrics['stage_counts'] = _counts(self.deals_df[stage_col])
+        return metrics
+
+    @traced('analyzer.operations_metrics')
+    def operations_metrics(self):
         """
-        Helper to find a column name that matches a list of keywords.
+        Work order aggregates: total, status_col, status_counts,
+        priority_col and priority_counts. None if there is no work orders data.
         """
-        if df is None or df.empty:
+        return self._cached('operations', self._compute_operations_metrics)
+
+    def _compute_operations_metrics(self):
+        if self.work_orders_df is None or self.work_orders_df.empty:
             return None
-            
-        columns = df.columns.str.lower()
-        for col in df.columns:
-            col_lower = col.lower()
-            for keyword in keywords:
-                if keyword in col_lower:
-                    return col
-        return None
 
+        columns = self.work_orders_columns()
+        status_col = columns.get('status')
+        priority_col = columns.get('priority')
+
+        return {
+            'total': len(self.work_orders_df),
+            'status_col': status_col,
+            'status_counts': _counts(self.work_orders_df[status_col]) if status_col else None,
+            'priority_col': priority_col,
+            'priority_counts': _counts(self.work_orders_df[priority_col]) if priority_col else None,
+        }
+
+    def deals_by_date(self):
+        """
+        Deals with a close date, indexed and sorted by it. None without a date column.
+        """
+        return self._cached('deals_by_date', lambda: _date_indexed(self.deals_df, self.deals_columns().get('date')))
+
+    def work_orders_by_date(self):
+        """
+        Work orders with a due date, indexed and sorted by it. None without a date column.
+        """
+        return self._cached('work_orders_by_date',
+                            lambda: _date_indexed(self.work_orders_df, self.work_orders_columns().get('date')))
+
+    def _deal_flags(self):
+        """
+        Numeric per-deal columns to resample: deals, value, won, lost and won_value.
+        """
+        view = self.deals_by_date()
+        columns = self.deals_columns()
+        value = _amounts(view[columns['value']]) if columns.get('value') else np.zeros(len(view))
+        stage = view[columns['stage']] if columns.get('stage') else pd.Series('', index=view.index)
+        lost = _matches(stage, LOST_STAGES).values
+        won = _matches(stage, WON_STAGES).values & ~lost
+        return pd.DataFrame({'deals': 1, 'value': value, 'won': won.astype(int), 'lost': lost.astype(int),
+                             'won_value': np.where(won, value, 0.0)}, index=view.index)
+
+    def _work_order_flags(self):
+        """
+        Numeric per-work-order columns to resample: total, done and blocked.
+        """
+        view = self.work_orders_by_date()
+        status_col = self.work_orders_columns().get('status')
+        status = view[status_col] if status_col else pd.Series('', index=view.index)
+        return pd.DataFrame({'total': 1, 'done': _matches(status, DONE_STATUSES).values.astype(int),
+                             'blocked': _matches(status, BLOCKED_STATUSES).values.astype(int)}, index=view.index)
+
+    @traced('analyzer.pipeline_trend')
+    def pipeline_trend(self, period='quarter'):
+        """
+        Deals per close-date period ('month', 'quarter', 'rolling_30d' or
+        'rolling_90d'): deals, value, won, lost, won_value and win_rate
+        (won / decided), one row per period. None without dated deals.
+        """
+        def compute():
+            if self.deals_by_date() is None:
+                return None
+            flags = self._cached('deal_flags', self._deal_flags)
+            table = _period_table(flags, period)
+            table['win_rate'] = _ratio(table['won'], table['won'] + table['lost'])
+            return table
+        return self._cached(f'pipeline_trend:{period}', compute)
+
+    @traced('analyzer.throughput_trend')
+    def throughput_trend(self, period='quarter'):
+        """
+        Work orders per due-date period (see pipeline_trend): total, done,
+        blocked and done_rate. None without dated work orders.
+        """
+        def compute():
+            if self.work_orders_by_date() is None:
+                return None
+            flags = self._cached('work_order_flags', self._work_order_flags)
+            table = _period_table(flags, period)
+            table['done_rate'] = _ratio(table['done'], table['total'])
+            return table
+        return self._cached(f'throughput_trend:{period}', compute)
+
+    @traced('analyzer.links')
+    def links(self):
+        """
+        (deal_id, work_order_id, source) pairs linking the two boards, see LinkIndex.
+        """
+        return self._cached('links', lambda: self._links.update(self.deals_df, self.work_orders_df))
+
+    @traced('analyzer.cross_board_metrics')
+    def cross_board_metrics(self):
+        """
+        Joined deal and work order aggregates: linked_deals,
+        linked_work_orders, at_risk (won or open deals with a blocked work
+        order, as a frame of id, name and value), revenue_at_risk,
+        won_deals, won_with_work_orders, won_delivered, conversion_rate
+        and delivery_rate. None unless both boards have data and links.
+        """
+        return self._cached('cross_board', self._compute_cross_board_metrics)
+
+    def _compute_cross_board_metrics(self):
+        if self.deals_df is None or self.deals_df.empty or self.work_orders_df is None or self.work_orders_df.empty:
+            return None
+        pairs = self.links()
+        if pairs.empty:
+            return None
+
+        deal_columns = self.deals_columns()
+        value_col = deal_columns.get('value')
+        stage_col = deal_columns.get('stage')
+        status_col = self.work_orders_columns().get('status')
+
+        deals = pd.DataFrame({'deal_id': self.deals_df['id'].astype(str).values})
+        name_col = name_column(self.deals_df)
+        deals['name'] = self.deals_df[name_col].values if name_col else None
+        deals['value'] = _amounts(self.deals_df[value_col]) if value_col else 0.0
+        stage = self.deals_df[stage_col] if stage_col else pd.Series('', index=self.deals_df.index)
+        deals['won'] = _matches(stage, WON_STAGES).values & ~_matches(stage, LOST_STAGES).values
+        deals['lost'] = _matches(stage, LOST_STAGES).values
+
+        status = self.work_orders_df[status_col] if status_col else pd.Series('', index=self.work_orders_df.index)
+        orders = pd.DataFrame({
+            'work_order_id': self.work_orders_df['id'].astype(str).values,
+            'blocked': _matches(status, BLOCKED_STATUSES).values,
+            'done': _matches(status, DONE_STATUSES).values,
+        })
+
+        linked = pairs.merge(orders, on='work_order_id').groupby('deal_id')[['blocked', 'done']].any()
+        deals = deals.merge(linked, left_on='deal_id', right_index=True, how='left')
+        has_orders = deals['blocked'].notna()
+        blocked = deals['blocked'].fillna(False).astype(bool)
+        done = deals['done'].fillna(False).astype(bool)
+
+        at_risk = deals[blocked & ~deals['lost']]
+        won = deals['won']
+        won_count = int(won.sum())
+        won_with_orders = int((won & has_orders).sum())
+        won_delivered = int((won & done).sum())
+        return {
+            'linked_deals': int(has_orders.sum()),
+            'linked_work_orders': pairs['work_order_id'].nunique(),
+            'at_risk': at_risk[['deal_id', 'name', 'value']].rename(columns={'deal_id': 'id'}).reset_index(drop=True),
+            'revenue_at_risk': float(at_risk['value'].sum()),
+            'won_deals': won_count,
+            'won_with_work_orders': won_with_orders,
+            'won_delivered': won_delivered,
+            'conversion_rate': won_with_orders / won_count if won_count else None,
+            'delivery_rate': won_delivered / won_count if won_count else None,
+        }
+
+    @traced('analyzer.get_cross_board_status')
+    def get_cross_board_status(self):
+        """
+        Revenue at risk from blocked work orders and deal-to-delivery conversion.
+        """
+        return self._cached('cross_board_text', self._render_cross_board)
+
+    def _render_cross_board(self):
+        metrics = self.cross_board_metrics()
+        if metrics is None:
+            return "No linked deals and work orders found."
+
+        insights = []
+        insights.append(f"Deals with Work Orders: {metrics['linked_deals']} ({metrics['linked_work_orders']} work orders)")
+        insights.append(f"Revenue at Risk from Blocked Work Orders: ${metrics['revenue_at_risk']:,.2f}")
+        for deal in metrics['at_risk'].itertuples():
+            insights.append(f"  - {deal.name or deal.id}: ${deal.value:,.2f}")
+        if metrics['won_deals']:
+            insights.append(f"Won Deals with Work Orders: {metrics['won_with_work_orders']}/{metrics['won_deals']} "
+                            f"({metrics['conversion_rate']:.0%})")
+            insights.append(f"Won Deals Delivered: {metrics['won_delivered']}/{metrics['won_deals']} "
+                            f"({metrics['delivery_rate']:.0%})")
+
+        return "\n".join(insights)
+
+    @traced('analyzer.get_pipeline_benth')
     def get_pipeline_benth(self):
         """
         Analyzes the health of the sales pipeline.
         """
-        if self.deals_df is None or self.deals_df.empty:
+        return self._cached('pipeline_text', self._render_pipeline)
+
+    def _render_pipeline(self):
+        metrics = self.pipeline_metrics()
+        if metrics is None:
             return "No deals data available."
 
-        # Attempt to find relevant columns
-        value_col = self._find_column_by_similarity(self.deals_df, ['deal value', 'amount', 'price', 'revenue', 'value'])
-        stage_col = self._find_column_by_similarity(self.deals_df, ['stage', 'status', 'phase'])
-        
         insights = []
+        insights.append(f"Total Deals in Pipeline: {metrics['total_deals']}")
         
-        total_deals = len(self.deals_df)
-        insights.append(f"Total Deals in Pipeline: {total_deals}")
+        if metrics['value_col']:
+            insights.append(f"Total Pipeline Value: ${metrics['total_value']:,.2f}")
+            insights.append(f"Average Deal Size: ${metrics['avg_value']:,.2f}")
+        if metrics['value_by_source'] is not None:
+            insights.append("\nPipeline Value by Source:")
+            for source, value in metrics['value_by_source'].items():
+                insights.append(f"  - {source}: ${value:,.2f}")
         
-        if value_col:
-            # Clean non-numeric values just in case
-            numeric_values = pd.to_numeric(self.deals_df[value_col], errors='coerce').fillna(0)
-            total_value = numeric_values.sum()
-            avg_value = numeric_values.mean()
-            insights.append(f"Total Pipeline Value: ${total_value:,.2f}")
-            insights.append(f"Average Deal Size: ${avg_value:,.2f}")
-        
-        if stage_col:
-            stage_counts = self.deals_df[stage_col].value_counts()
+        if metrics['stage_col']:
             insights.append("\nDeal Distribution by Stage:")
-            for stage, count in stage_counts.items():
+            for stage, count in metrics['stage_counts'].items():
                 insights.append(f"  - {stage}: {count}")
                 
         return "\n".join(insights)
 
+    @traced('analyzer.get_operational_status')
     def get_operational_status(self):
         """
         Analyzes work orders / operational status.
         """
-        if self.work_orders_df is None or self.work_orders_df.empty:
+        return self._cached('operations_text', self._render_operations)
+
+    def _render_operations(self):
+        metrics = self.operations_metrics()
+        if metrics is None:
             return "No work orders data available."
-            
-        status_col = self._find_column_by_similarity(self.work_orders_df, ['status', 'state', 'progress'])
-        priority_col = self._find_column_by_similarity(self.work_orders_df, ['priority', 'urgency'])
-        
+
         insights = []
-        insights.append(f"Total Work Orders: {len(self.work_orders_df)}")
+        insights.append(f"Total Work Orders: {metrics['total']}")
         
-        if status_col:
-            status_counts = self.work_orders_df[status_col].value_counts()
+        if metrics['status_col']:
             insights.append("\nWork Order Status:")
-            for status, count in status_counts.items():
+            for status, count in metrics['status_counts'].items():
                 insights.append(f"  - {status}: {count}")
                 
-        if priority_col:
-             priority_counts = self.work_orders_df[priority_col].value_counts()
+        if metrics['priority_col']:
              insights.append("\nBreakdown by Priority:")
-             for prio, count in priority_counts.items():
+             for prio, count in metrics['priority_counts'].items():
                  insights.append(f"  - {prio}: {count}")
                  
         return "\n".join(insights)
 
+    @traced('analyzer.generate_leadership_update')
     def generate_leadership_update(self):
         """
         Generates a high-level executive summary.
@@ -93,5 +545,43 @@ class Analyzer:
         # Operations Highlights
         summary.append("OPERATIONS & EXECUTION")
         summary.append(self.get_operational_status())
+
+        # Cross-board Highlights, only when the boards are linked
+        if self.cross_board_metrics() is not None:
+            summary.append("\n" + "-"*30 + "\n")
+            summary.append("DEALS TO DELIVERY")
+            summary.append(self.get_cross_board_status())
         
         return "\n".join(summary)
+
+
+class AnalyzerVersions:
+    """
+    One Analyzer per data version, shared by every thread answering from
+    that version and never given other frames.
+
+    The Analyzer of a new version starts from the latest one's aggregates
+    (see Analyzer.with_frames), so frames a version did not replace keep
+    theirs. Only the newest keep versions are held.
+    """
+    def __init__(self, keep=2):
+        self.keep = keep
+        self._analyzers = {}
+        self._lock = threading.Lock()
+
+    def get(self, version, frames):
+        """
+        The Analyzer of version, built over frames ({role: DataFrame}) the
+        first time the version is asked for.
+        """
+        with self._lock:
+            analyzer = self._analyzers.get(version)
+            if analyzer is None:
+                latest = self._analyzers[max(self._analyzers)] if self._analyzers else Analyzer()
+                frames = frames or {}
+                analyzer = latest.with_frames(frames.get('deals', pd.DataFrame()),
+                                              frames.get('work_orders', pd.DataFrame()))
+                self._analyzers[version] = analyzer
+                for old in sorted(self._analyzers)[:-self.keep]:
+                    del self._analyzers[old]
+            return analyzer
@@ -0,0 +1,324 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import requests
+from requests.adapters import HTTPAdapter
+from src.data_processor import DataProcessor, apply_column_titles, normalize_dataframe
+from src.fetcher import DEFAULT_MAX_CONCURRENCY
+from src.monday_api import (BOARD_COLUMNS_QUERY, ITEMS_BY_ID_QUERY, ITEMS_COUNT_QUERY, BaseMondayClient, MondayClient,
+                            build_page_request, item_fields_for, items_page_of, parse_board_columns, parse_items,
+                            parse_items_count)
+from src.tracing import tracer
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+
+class ThreadTransport:
+    """
+    Sends requests with one keep-alive requests.Session on a pool of
+    pool_size threads, for installs without aiohttp.
+    """
+    errors = (requests.ConnectionError, requests.Timeout)
+
+    def __init__(self, headers, pool_size, timeout):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(headers)
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="monday-http")
+
+    async def post(self, url, data):
+        """
+        (status code, headers, body bytes) of a POST of data as JSON.
+        """
+        post = partial(self.session.post, url, json=data, timeout=self.timeout)
+        response = await asyncio.get_running_loop().run_in_executor(self.executor, post)
+        return response.status_code, response.headers, response.content
+
+    async def close(self):
+        self.executor.shutdown(wait=False)
+        self.session.close()
+
+
+class AiohttpTransport:
+    """
+    Sends requests over one aiohttp session whose connection pool holds
+    up to pool_size keep-alive connections. The session is opened on
+    first use, in the event loop that uses it.
+    """
+    errors = (aiohttp.ClientError, asyncio.TimeoutError) if HAS_AIOHTTP else ()
+
+    def __init__(self, headers, pool_size, timeout):
+        self.headers = headers
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = None
+
+    async def post(self, url, data):
+        if self.session is None:
+            connect, read = self.timeout
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read),
+            )
+        async with self.session.post(url, json=data) as response:
+            return response.status, response.headers, await response.read()
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+class AsyncMondayClient(BaseMondayClient):
+    """
+    asyncio counterpart of MondayClient: the same methods as coroutines
+    (iter_board_pages as an async generator), with the same retries,
+    complexity budget and stats.
+
+    All requests share one connection pool of pool_size connections:
+    aiohttp's (see requirements.txt), or a requests session on as many
+    threads when aiohttp is not installed or transport=ThreadTransport. While a page is being decoded and normalized, the
+    request for the next one is already in flight, and fetch_boards runs
+    up to max_concurrency boards at once.
+    """
+    def __init__(self, api_key=None, api_url=None, timeout=None, max_retries=None,
+                 backoff_base=1.0, backoff_max=60.0, pool_size=10, budget=None, max_concurrency=None,
+                 stats=None, transport=None):
+        super().__init__(api_key, api_url, timeout, max_retries, backoff_base, backoff_max, pool_size, budget)
+        if stats is not None:
+            self.stats = stats
+        self.max_concurrency = max_concurrency or int(os.getenv("MONDAY_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+        if transport is None:
+            transport = AiohttpTransport if HAS_AIOHTTP else ThreadTransport
+        self.transport = transport(self.headers, pool_size, self.timeout)
+
+    async def close(self):
+        await self.transport.close()
+
+    async def _wait_for_budget(self):
+        while True:
+            delay = self.budget.delay()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+            self.budget.waited += delay
+
+    async def execute_query(self, query, variables=None):
+        self._check_api_key()
+        with tracer.span("monday.execute_query") as span:
+            return await self._execute_query(query, variables, span)
+
+    async def _execute_query(self, query, variables, span):
+        data = {"query": query, "variables": variables}
+        attempt = 0
+
+        while True:
+            retry_after = None
+            if self.budget is not None:
+                await self._wait_for_budget()
+            start = time.perf_counter()
+            try:
+                with tracer.span("monday.http"):
+                    status_code, headers, content = await self.transport.post(self.api_url, data)
+            except self.transport.errors as e:
+                self.stats.record(time.perf_counter() - start)
+                error = f"Monday API Error: {e}"
+            else:
+                self.stats.record(time.perf_counter() - start, len(content))
+                json_response, error, retry_after = self._check_response(
+                    status_code, headers, len(content), lambda: content.decode(errors="replace"),
+                    lambda: json.loads(content), span, attempt)
+                if json_response is not None:
+                    return json_response
+
+            await asyncio.sleep(self._retry_delay(attempt, error, retry_after))
+            attempt += 1
+
+    async def _paginate_items(self, board_id, item_fields, query_params=None, column_ids=None, prefetch=True):
+        """
+        Yields the items of every page of a board, following the cursor.
+        With prefetch the next page is requested before the current one is
+        handed over.
+        """
+        pending = asyncio.ensure_future(
+            self.execute_query(*build_page_request(board_id, item_fields, None, query_params, column_ids)))
+        try:
+            while True:
+                items_page = items_page_of(await pending)
+                pending = None
+                if items_page is None:
+                    return
+                cursor = items_page["cursor"]
+                next_page = build_page_request(board_id, item_fields, cursor, None, column_ids) if cursor else None
+                if next_page and prefetch:
+                    pending = asyncio.ensure_future(self.execute_query(*next_page))
+                yield items_page["items"]
+                if not next_page:
+                    return
+                if pending is None:
+                    pending = asyncio.ensure_future(self.execute_query(*next_page))
+        finally:
+            # The consumer stopped early
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+    def iter_board_pages(self, board_id, updated_since=None, prefetch=True, column_ids=None):
+        """
+        Async generator of the items of a board one items_page at a time,
+        see MondayClient.iter_board_pages.
+        """
+        query_params = self._updated_since_params(updated_since)
+        return self._paginate_items(board_id, item_fields_for(column_ids), query_params,
+                                    list(column_ids) if column_ids else None, prefetch)
+
+    async def get_board_items(self, board_id, updated_since=None, column_ids=None):
+        all_items = []
+        async for items in self.iter_board_pages(board_id, updated_since, prefetch=False, column_ids=column_ids):
+            all_items.extend(items)
+        return all_items
+
+    async def get_items(self, item_ids):
+        return parse_items(await self.execute_query(ITEMS_BY_ID_QUERY, {"item_ids": list(item_ids)}))
+
+    async def get_board_item_ids(self, board_id):
+        item_ids = []
+        async for items in self._paginate_items(board_id, "id"):
+            item_ids.extend(item["id"] for item in items)
+        return item_ids
+
+    async def get_board_items_count(self, board_id):
+        return parse_items_count(await self.execute_query(ITEMS_COUNT_QUERY, {"board_id": [board_id]}))
+
+    async def get_board_schema(self, board_id):
+        return parse_board_columns(await self.execute_query(BOARD_COLUMNS_QUERY, {"board_id": [board_id]}))
+
+    async def get_board_columns(self, board_id):
+        return {col["id"]: col["title"] for col in await self.get_board_schema(board_id)}
+
+    async def get_board_schemas(self, board_ids):
+        """
+        {board_id: [{'id', 'title', 'type'}]} of several boards, requested concurrently.
+        """
+        board_ids = list(dict.fromkeys(board_ids))
+        schemas = await asyncio.gather(*(self.get_board_schema(board_id) for board_id in board_ids))
+        return dict(zip(board_ids, schemas))
+
+    async def stream_board(self, board_id, updated_since=None, column_ids=None):
+        """
+        A board's items as a cleaned frame keyed by column ID. Each page is
+        normalized on a worker thread, so the event loop keeps the next
+        page's request and other boards moving meanwhile.
+        """
+        frames = []
+        async for items in self.iter_board_pages(board_id, updated_since, column_ids=column_ids):
+            frames.append(await asyncio.to_thread(normalize_dataframe, items))
+        return DataProcessor.from_frames(frames).clean_data()
+
+    async def fetch_board(self, board_id, projection=None):
+        """
+        (DataFrame, columns_map) of one board, like fetcher.fetch_boards:
+        with a ColumnProjection the schema is read first and only the
+        projected columns are streamed, otherwise both run at once.
+        """
+        if projection is None:
+            schema, df = await asyncio.gather(self.get_board_schema(board_id), self.stream_board(board_id))
+            columns_map = {col["id"]: col["title"] for col in schema}
+            return apply_column_titles(df, columns_map), columns_map
+
+        schema = await self.get_board_schema(board_id)
+        columns_map = {col["id"]: col["title"] for col in schema}
+        projected = projection.select(board_id, schema)
+        if projected is not None:
+            columns_map = projected
+        df = await self.stream_board(board_id, column_ids=list(projected) if projected is not None else None)
+        return apply_column_titles(df, columns_map), columns_map
+
+    async def fetch_boards(self, board_ids, projection=None, max_concurrency=None):
+        """
+        {board_id: (DataFrame, columns_map)} of every board, at most
+        max_concurrency (default self.max_concurrency) boards at a time.
+        The first failure is raised.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def fetch(board_id):
+            async with semaphore:
+                return await self.fetch_board(board_id, projection)
+
+        board_ids = list(dict.fromkeys(board_ids))
+        with tracer.span("monday.fetch_boards", boards=len(board_ids)):
+            results = await asyncio.gather(*(fetch(board_id) for board_id in board_ids))
+        return dict(zip(board_ids, results))
+
+
+class SyncMondayClient(MondayClient):
+    """
+    A MondayClient whose requests go through an AsyncMondayClient running
+    on an event loop thread of its own, so blocking callers (the CLI, the
+    syncer, the Streamlit app) use the async connection pool and pipelined
+    pagination unchanged. fetch_boards runs every board on that loop
+    instead of one thread per board.
+    """
+    def __init__(self, api_key=None, api_url=None, timeout=None, max_retries=None,
+                 backoff_base=1.0, backoff_max=60.0, pool_size=10, budget=None, max_concurrency=None):
+        # Not MondayClient.__init__: the async client's pool sends every
+        # request, so this client opens no requests session of its own
+        BaseMondayClient.__init__(self, api_key, api_url, timeout, max_retries, backoff_base, backoff_max,
+                                  pool_size, budget)
+        self.async_client = AsyncMondayClient(self.api_key, self.api_url, self.timeout, self.max_retries,
+                                              backoff_base, backoff_max, pool_size, budget, max_concurrency,
+                                              stats=self.stats)
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def _run(self, coro):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="monday-async", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self.async_client.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+
+    def execute_query(self, query, variables=None):
+        return self._run(self.async_client.execute_query(query, variables))
+
+    def iter_board_pages(self, board_id, updated_since=None, prefetch=True, column_ids=None):
+        pages = self.async_client.iter_board_pages(board_id, updated_since, prefetch, column_ids)
+        try:
+            while True:
+                try:
+                    yield self._run(pages.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._run(pages.aclose())
+
+    def fetch_boards(self, board_ids, projection=None, max_concurrency=None):
+        return self._run(self.async_client.fetch_boards(board_ids, projection, max_concurrency))
+
+
+def create_client(**options):
+    """
+    A SyncMondayClient when MONDAY_ASYNC_CLIENT=on, otherwise a MondayClient.
+    """
+    if os.getenv("MONDAY_ASYNC_CLIENT", "off").lower() in ("on", "1", "true"):
+        return SyncMondayClient(**options)
+    return MondayClient(**options)
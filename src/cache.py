@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+import pandas as pd
+from src.tracing import tracer
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+DEFAULT_CACHE_DIR = ".monday_cache"
+DEFAULT_TTL = 15 * 60
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Bumped when stored frames change shape; entries of older versions are
+# misses. 2: frames are cleaned (see clean_frame)
+FRAME_VERSION = 2
+
+
+def schema_hash(columns_map):
+    """
+    Short stable hash of a board's column map, so a schema change never
+    reads back a frame built for different columns.
+    """
+    payload = json.dumps(columns_map or {}, sort_keys=True).encode()
+    return hashlib.sha1(payload).hexdigest()[:12]
+
+
+def list_columns(df):
+    """
+    Names of the object columns holding lists (people, tags).
+    """
+    columns = []
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        values = df[col].dropna()
+        if not values.empty and isinstance(values.iloc[0], list):
+            columns.append(col)
+    return columns
+
+
+class CacheEntry:
+    """
+    A normalized board read back from disk, with the metadata it was stored with.
+    """
+    def __init__(self, board_id, df, columns_map, synced_at, stored_at, ttl):
+        self.board_id = board_id
+        self.df = df
+        self.columns_map = columns_map
+        self.synced_at = synced_at
+        self.stored_at = stored_at
+        self.ttl = ttl
+
+    @property
+    def age(self):
+        return time.time() - self.stored_at
+
+    @property
+    def stale(self):
+        return self.age > self.ttl
+
+
+class BoardCache:
+    """
+    On-disk cache of normalized board DataFrames, one columnar file per
+    (board_id, schema hash) plus a JSON sidecar with the column map and
+    sync time.
+
+    Frames are written as Parquet and read back memory-mapped. Frames that
+    Arrow cannot represent (e.g. a text column mixing strings and
+    numbers) and installs without pyarrow fall back to pickle.
+
+    Entries older than ttl are still returned but flagged stale so callers
+    can serve them while refreshing. Entries older than max_age are
+    evicted, and the least recently read ones go once the directory grows
+    past max_bytes.
+    """
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, max_age=DEFAULT_MAX_AGE,
+                 max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+    def _base(self, board_id, digest):
+        return os.path.join(self.cache_dir, f"board_{board_id}_{digest}")
+
+    def _entries(self, board_id=None):
+        """
+        Yields (meta_path, meta) for every entry on disk, optionally for one board only.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        prefix = f"board_{board_id}_" if board_id is not None else "board_"
+        for name in os.listdir(self.cache_dir):
+            if not (name.startswith(prefix) and name.endswith(".json")):
+                continue
+            meta_path = os.path.join(self.cache_dir, name)
+            try:
+                with open(meta_path) as f:
+                    yield meta_path, json.load(f)
+            except (OSError, ValueError):
+                continue
+
+    def get(self, board_id, columns_map=None):
+        """
+        Returns the CacheEntry for board_id, or None on a miss.
+        With columns_map only an entry built for that exact schema matches,
+        otherwise the most recently stored entry of the board is returned.
+        """
+        candidates = [meta for _, meta in self._entries(board_id)
+                      if meta.get("board_id") == str(board_id) and meta.get("frame_version", 1) == FRAME_VERSION]
+        if columns_map is not None:
+            digest = schema_hash(columns_map)
+            candidates = [meta for meta in candidates if meta["schema_hash"] == digest]
+        candidates = [meta for meta in candidates if time.time() - meta["stored_at"] <= self.max_age]
+        if not candidates:
+            self.stats["misses"] += 1
+            tracer.count("cache.misses")
+            return None
+
+        meta = max(candidates, key=lambda m: m["stored_at"])
+        data_path = self._base(board_id, meta["schema_hash"]) + "." + meta["format"]
+        try:
+            if meta["format"] == "parquet":
+                df = pd.read_parquet(data_path, memory_map=True)
+                # Arrow hands list columns back as arrays
+                for col in meta.get("list_columns", []):
+                    df[col] = df[col].map(list)
+            else:
+                df = pd.read_pickle(data_path)
+        except Exception as e:
+            print(f"Ignoring unreadable cache entry for board {board_id}: {e}")
+            self.stats["misses"] += 1
+            tracer.count("cache.misses")
+            return None
+
+        # Reads count as use for LRU eviction
+        os.utime(data_path)
+        self.stats["hits"] += 1
+        tracer.count("cache.hits")
+        synced_at = datetime.fromisoformat(meta["synced_at"]) if meta.get("synced_at") else None
+        return CacheEntry(board_id, df, meta["columns_map"], synced_at, meta["stored_at"], self.ttl)
+
+    def put(self, board_id, df, columns_map, synced_at=None):
+        """
+        Stores the normalized frame of board_id and drops entries of the
+        board built for an older schema.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        digest = schema_hash(columns_map)
+        base = self._base(board_id, digest)
+
+        with self._lock:
+            fmt = "parquet" if HAS_PYARROW else "pkl"
+            # Write to temp files first so a crash never leaves a half-written entry
+            if fmt == "parquet":
+                try:
+                    df.to_parquet(base + ".parquet.tmp", index=False)
+                except Exception:
+                    self._remove(base, ["parquet.tmp"])
+                    fmt = "pkl"
+            if fmt == "pkl":
+                df.to_pickle(base + ".pkl.tmp")
+
+            meta = {
+                "board_id": str(board_id),
+                "schema_hash": digest,
+                "columns_map": columns_map,
+                "synced_at": synced_at.isoformat() if synced_at else None,
+                "stored_at": time.time(),
+                "format": fmt,
+                "frame_version": FRAME_VERSION,
+                "rows": len(df),
+                "list_columns": list_columns(df),
+            }
+            with open(base + ".json.tmp", "w") as f:
+                json.dump(meta, f)
+
+            self._remove(base, [ext for ext in ("parquet", "pkl") if ext != fmt])
+            os.replace(f"{base}.{fmt}.tmp", f"{base}.{fmt}")
+            os.replace(base + ".json.tmp", base + ".json")
+
+            for meta_path, other in self._entries(board_id):
+                if other.get("board_id") == str(board_id) and other["schema_hash"] != digest:
+                    self._remove(meta_path[:-len(".json")])
+            self.stats["writes"] += 1
+            self._evict()
+
+    @staticmethod
+    def _remove(base, exts=("parquet", "pkl", "json")):
+        for ext in exts:
+            path = f"{base}.{ext}"
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _evict(self):
+        entries = []
+        for meta_path, meta in self._entries():
+            base = meta_path[:-len(".json")]
+            data_path = f"{base}.{meta['format']}"
+            if not os.path.exists(data_path):
+                continue
+            if time.time() - meta["stored_at"] > self.max_age:
+                self._remove(base)
+                self.stats["evictions"] += 1
+                continue
+            stat = os.stat(data_path)
+            entries.append((stat.st_mtime, stat.st_size, base))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, base in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(base)
+            total -= size
+            self.stats["evictions"] += 1
+
+
+def create_board_cache():
+    """
+    Returns a BoardCache configured from the environment, or None when
+    MONDAY_CACHE=off.
+    """
+    if os.getenv("MONDAY_CACHE", "on").lower() in ("off", "0", "false"):
+        return None
+    return BoardCache(
+        cache_dir=os.getenv("MONDAY_SNAPSHOT_DIR", DEFAULT_CACHE_DIR),
+        ttl=float(os.getenv("MONDAY_CACHE_TTL", DEFAULT_TTL)),
+        max_age=float(os.getenv("MONDAY_CACHE_MAX_AGE", DEFAULT_MAX_AGE)),
+        max_bytes=int(float(os.getenv("MONDAY_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024),
+    )
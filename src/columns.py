@@ -0,0 +1,101 @@
+from functools import lru_cache
+import pandas as pd
+from src.data_processor import CATEGORICAL_TYPES, DATE_TYPES, LIST_TYPES, NUMERIC_TYPES
+
+# Item fields normalize_dataframe adds next to the board's own columns
+ITEM_FIELDS = ('id', 'name', 'updated_at')
+
+# Semantic columns the analytics read, with the Monday types each may have
+# and title keywords in order of preference
+COLUMN_RULES = {
+    'value': (NUMERIC_TYPES | {'formula'}, ['deal value', 'amount', 'price', 'revenue', 'value']),
+    'stage': (CATEGORICAL_TYPES, ['stage', 'phase', 'status']),
+    'status': (CATEGORICAL_TYPES, ['status', 'state', 'progress']),
+    'priority': (CATEGORICAL_TYPES, ['priority', 'urgency']),
+    'date': (DATE_TYPES | {'timeline'}, ['close', 'due', 'deadline', 'date']),
+    'owner': (LIST_TYPES, ['owner', 'assignee', 'manager', 'person', 'people']),
+    'sector': (CATEGORICAL_TYPES | {'text'}, ['sector', 'industry', 'vertical', 'segment']),
+}
+
+# Rules whose keywords are too generic to trust without the right type
+# ('date' is in "Updates")
+TYPED_ONLY = {'date', 'owner'}
+
+# Semantic columns each board role needs
+ROLE_COLUMNS = {
+    'deals': ['value', 'stage', 'date', 'owner', 'sector'],
+    'work_orders': ['status', 'priority', 'date', 'owner'],
+}
+
+
+def _match(schema, keywords, types=None):
+    for keyword in keywords:
+        for title, col_type in schema:
+            if keyword in str(title).lower() and (types is None or col_type in types):
+                return title
+    return None
+
+
+def resolve_columns(schema):
+    """
+    Resolves the semantic columns of one board schema, given as a tuple of
+    (title, monday_type) pairs in board order. Returns {semantic: title}
+    for every rule that matched.
+
+    Keywords are tried in order of preference, so 'stage' beats an earlier
+    'Status' column. Columns of a matching Monday type win over ones that
+    only match by title, which TYPED_ONLY rules don't accept at all.
+    Results are memoized per schema.
+    """
+    return dict(_resolve(tuple(schema)))
+
+
+@lru_cache(maxsize=256)
+def _resolve(schema):
+    resolved = []
+    for semantic, (types, keywords) in COLUMN_RULES.items():
+        title = _match(schema, keywords, types)
+        if title is None and semantic not in TYPED_ONLY:
+            title = _match(schema, keywords)
+        if title is not None:
+            resolved.append((semantic, title))
+    return tuple(resolved)
+
+
+def _dtype_type(series):
+    """
+    Monday type implied by the dtype normalize_dataframe gave a column, or None.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return 'status'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'date'
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return 'numbers'
+    values = series.dropna()
+    if series.dtype == object and not values.empty and isinstance(values.iloc[0], list):
+        return 'people'
+    return None
+
+
+def frame_schema(df):
+    """
+    The (title, monday_type) schema of a normalized frame. Types come from
+    the column_types normalize_dataframe records in df.attrs, falling back
+    to the column's dtype for frames built elsewhere.
+    """
+    if df is None or df.empty:
+        return ()
+    types = df.attrs.get('column_types', {})
+    return tuple(
+        (col, types.get(col) or _dtype_type(df[col]))
+        for col in df.columns
+        if col not in ITEM_FIELDS
+    )
+
+
+def resolve_frame_columns(df):
+    """
+    Semantic columns of a normalized frame, see resolve_columns.
+    """
+    return resolve_columns(frame_schema(df))
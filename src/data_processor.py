@@ -1,5 +1,36 @@
+import os
+import re
+from functools import lru_cache
+import numpy as np
 import pandas as pd
 import json
+from src.tracing import tracer, traced
+
+# Monday column types with a dedicated dtype. The legacy names ("color",
+# "multiple-person", "numeric") still show up on older boards.
+NUMERIC_TYPES = {'numbers', 'numeric'}
+DATE_TYPES = {'date'}
+CATEGORICAL_TYPES = {'status', 'color', 'dropdown'}
+LIST_TYPES = {'people', 'multiple-person', 'tags'}
+# Connect-boards and mirror columns: their text lists the linked items'
+# names (or mirrored values), kept as lists like LIST_TYPES
+RELATION_TYPES = {'board_relation', 'board-relation', 'mirror', 'lookup'}
+
+# Monday item IDs are well within int64; longer digit strings stay strings
+MAX_ID_DIGITS = 18
+# Text columns with at most this share of distinct values become categorical
+MAX_CATEGORY_RATIO = 0.5
+
+# Amounts as people type them: "$1,200.50", "(300)", "12.5%", "1.2M",
+# "EUR 400". Whitespace and thousands separators are removed first.
+AMOUNT_RE = re.compile(r'^(?P<open>\()?(?:[A-Za-z]{3})?(?P<sign>-)?(?P<currency>[$€£¥₹])?(?P<sign2>-)?'
+                       r'(?P<number>\d+(?:\.\d*)?|\.\d+)(?P<scale>[kKmM]|bn|BN)?(?P<percent>%)?'
+                       r'(?:[A-Za-z]{3})?\)?$')
+AMOUNT_SCALES = {'k': 1e3, 'm': 1e6, 'bn': 1e9}
+
+# Counters clean_frame reports for each frame
+QUALITY_COUNTERS = ('rows', 'duplicates', 'amounts_parsed', 'invalid_amounts', 'labels_canonicalized')
+
 
 def clean_column_value(col_data):
     """
@@ -22,9 +53,11 @@ def clean_column_value(col_data):
         
     return text
 
-def normalize_dataframe(items, columns_map=None):
+def normalize_dataframe_rowwise(items, columns_map=None):
     """
-    Converts list of items into a clean Pandas DataFrame.
+    Reference row-by-row normalization: one dict per item and one
+    clean_column_value call per cell. Kept to check and benchmark
+    normalize_dataframe against.
     """
     if not items:
         return pd.DataFrame()
@@ -33,6 +66,8 @@ def normalize_dataframe(items, columns_map=None):
     
     for item in items:
         row = {'id': item['id'], 'name': item['name']}
+        if 'updated_at' in item:
+            row['updated_at'] = item['updated_at']
         
         for col in item['column_values']:
             clean_val = clean_column_value(col)
@@ -48,16 +83,480 @@ def normalize_dataframe(items, columns_map=None):
     df = pd.DataFrame(processed_data)
     return df
 
+def _convert_column(texts, col_type):
+    """
+    Converts the raw cell texts of one column in a single vectorized step,
+    based on the Monday column type.
+    """
+    if col_type in NUMERIC_TYPES:
+        numbers = pd.to_numeric(pd.Series([text.replace(',', '') if text else None for text in texts], dtype=object),
+                                errors='coerce')
+        if numbers.count() == sum(1 for text in texts if text):
+            return numbers.astype('float64')
+        # Keep unparseable text as is, like clean_column_value
+        return pd.Series([
+            number if number == number else (text or None)
+            for number, text in zip(numbers.tolist(), texts)
+        ], dtype=object)
+
+    if col_type in DATE_TYPES:
+        dates = pd.to_datetime(pd.Series([text or None for text in texts], dtype=object),
+                               errors='coerce', format='ISO8601')
+        if dates.count() != sum(1 for text in texts if text):
+            return pd.Series(texts, dtype=object)
+        return dates
+
+    if col_type in CATEGORICAL_TYPES:
+        return pd.Series(pd.Categorical(texts))
+
+    if col_type in LIST_TYPES or col_type in RELATION_TYPES:
+        return pd.Series([text.split(', ') if text else [] for text in texts], dtype=object)
+
+    return pd.Series(texts, dtype=object)
+
+@traced('normalize.dataframe')
+def normalize_dataframe(items, columns_map=None, column_types=None):
+    """
+    Converts list of items into a clean Pandas DataFrame.
+
+    Cells are first grouped by column ID and each column is then converted
+    in one step by its Monday type: numbers become float64, dates
+    datetime64, status and dropdown columns categorical and people, tags,
+    connect-boards and mirror columns lists of names. column_types maps column ID to type; by
+    default the type each cell reports is used. The types end up in
+    df.attrs['column_types'], keyed like the frame's columns.
+    """
+    if not items:
+        return pd.DataFrame()
+
+    count = len(items)
+    data = {
+        'id': [item['id'] for item in items],
+        'name': [item['name'] for item in items],
+    }
+    if any('updated_at' in item for item in items):
+        data['updated_at'] = [item.get('updated_at') for item in items]
+
+    types = dict(column_types or {})
+    cells = {}
+    for position, item in enumerate(items):
+        # Projected queries may leave column_values out entirely
+        for col in item.get('column_values', ()):
+            column = cells.get(col['id'])
+            if column is None:
+                column = cells[col['id']] = [None] * count
+                types.setdefault(col['id'], col.get('type'))
+            column[position] = col.get('text')
+
+    column_types = {}
+    for col_id, texts in cells.items():
+        # Use title if map provided, else ID
+        col_key = columns_map.get(col_id, col_id) if columns_map else col_id
+        data[col_key] = _convert_column(texts, types.get(col_id))
+        column_types[col_key] = types.get(col_id)
+
+    df = pd.DataFrame(data)
+    # Monday types travel with the frame for column resolution
+    df.attrs['column_types'] = column_types
+    return df
+
+def normalize_pages(pages, columns_map=None, column_types=None):
+    """
+    Normalizes each page of items into a DataFrame chunk as it arrives, so
+    only one page of raw items needs to be alive at a time.
+    """
+    for items in pages:
+        yield normalize_dataframe(items, columns_map, column_types)
+
+def concat_frames(frames):
+    """
+    Concatenates normalized chunks. Columns that were categorical stay
+    categorical even when the chunks saw different categories, and the
+    column types of all chunks are kept.
+    """
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+
+    df = pd.concat(frames, ignore_index=True)
+    categorical = {col for frame in frames for col in frame.select_dtypes('category').columns}
+    for col in categorical:
+        if not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+
+    # concat only keeps attrs the frames agree on
+    column_types = {}
+    for frame in frames:
+        column_types.update(frame.attrs.get('column_types', {}))
+    df.attrs['column_types'] = column_types
+    return df
+
+def apply_column_titles(df, columns_map):
+    """
+    Renames column IDs to their titles. When two columns share a title the
+    later one wins, as in normalize_dataframe.
+    """
+    if not columns_map or df.empty:
+        return df
+    column_types = df.attrs.get('column_types', {})
+    df = df.rename(columns=columns_map)
+    if df.columns.duplicated().any():
+        df = df.loc[:, ~df.columns.duplicated(keep='last')]
+    df.attrs['column_types'] = {columns_map.get(col, col): col_type for col, col_type in column_types.items()}
+    return df
+
+def _is_text(series):
+    # pandas 3 infers its str dtype where older versions used object
+    return series.dtype == object or isinstance(series.dtype, pd.StringDtype)
+
+def compact_ids(ids):
+    """
+    Item IDs as int64 when they are all decimal strings, as Monday's are,
+    instead of one Python string per row. Anything else is left as is.
+    """
+    if not _is_text(ids) or ids.empty:
+        return ids
+    texts = ids.astype(str)
+    if not (texts.str.len().max() <= MAX_ID_DIGITS and texts.str.isdecimal().all()):
+        return ids
+    return texts.astype('int64')
+
+def item_id_values(ids, values):
+    """
+    values as the dtype of an id column, for lookups (webhook and API IDs are strings).
+    """
+    if pd.api.types.is_integer_dtype(ids.dtype):
+        return [int(value) for value in values]
+    return [str(value) for value in values]
+
+def compact_numbers(series):
+    """
+    float64 columns holding only whole numbers as int32 (int64 past its
+    range). Columns with blanks or fractions stay float64: float32 would
+    lose cents on large deal values. So do whole numbers beyond int64.
+    """
+    if series.dtype != 'float64' or series.empty or series.isna().any():
+        return series
+    values = series.values
+    if not (np.isfinite(values).all() and (values == values.round()).all()):
+        return series
+    low, high = values.min(), values.max()
+    for dtype in ('int32', 'int64'):
+        # 2**63 itself rounds to float64 exactly, so int64's max is excluded
+        if low >= np.iinfo(dtype).min and high < np.iinfo(dtype).max:
+            return series.astype(dtype)
+    return series
+
+def compact_text(series):
+    """
+    Text columns repeating a few values (status-like text, stage, sector,
+    priority) as categoricals. Columns holding lists or mixed values are
+    left alone.
+    """
+    if not _is_text(series) or series.empty:
+        return series
+    present = series.dropna()
+    if present.empty or pd.api.types.infer_dtype(present, skipna=True) != 'string':
+        return series
+    if present.nunique() > len(present) * MAX_CATEGORY_RATIO:
+        return series
+    return series.astype('category')
+
+def compact_dataframe(df):
+    """
+    A copy of a normalized frame using less memory: int64 IDs, whole
+    numbers as ints and low-cardinality text as categoricals. Values, column
+    order and attrs are unchanged.
+    """
+    if df.empty:
+        return df
+    data = {}
+    for col in df.columns:
+        series = df[col]
+        if col == 'id':
+            series = compact_ids(series)
+        elif col not in ('name', 'updated_at'):
+            series = compact_text(compact_numbers(series))
+        data[col] = series
+    compacted = pd.DataFrame(data, index=df.index)
+    compacted.attrs = dict(df.attrs)
+    return compacted
+
+def align_dtypes(df, like):
+    """
+    df with its IDs in like's id dtype, and without categoricals where like
+    has none, so merging a few changed rows into a board doesn't turn its
+    free-text columns categorical or mix string and int IDs. Labels are
+    spelled the way like spells them.
+    """
+    if df.empty or like.empty:
+        return df
+    df = df.copy()
+    if 'id' in df.columns and 'id' in like.columns and df['id'].dtype != like['id'].dtype:
+        df['id'] = pd.Series(item_id_values(like['id'], df['id']), index=df.index, dtype=like['id'].dtype)
+    for col in df.select_dtypes('category').columns:
+        if col in like.columns and not isinstance(like[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+        elif col in like.columns:
+            # A lone changed row can't tell which spelling the board uses
+            spellings = {_label_key(label): label for label in like[col].cat.categories}
+            df[col], _ = canonical_labels(df[col], spellings)
+    # Text labels compaction made categorical on the board (see canonical_text)
+    for col in df.columns:
+        if col in like.columns and _is_text(df[col]) and isinstance(like[col].dtype, pd.CategoricalDtype):
+            spellings = {_label_key(label): label for label in like[col].cat.categories}
+            df[col] = df[col].map(lambda value: spellings.get(_label_key(value), value) if isinstance(value, str) else value)
+    return df
+
+def _label_key(label):
+    return ' '.join(str(label).split()).casefold()
+
+def load_label_map(path):
+    """
+    Reads a label mapping file, {"raw label": "Canonical Label"}, keyed
+    case and whitespace insensitively.
+    """
+    with open(path) as f:
+        mapping = json.load(f)
+    if not isinstance(mapping, dict):
+        raise ValueError(f"Invalid label map in {path}, expected an object of label: canonical label")
+    return {_label_key(raw): canonical for raw, canonical in mapping.items()}
+
+@lru_cache(maxsize=8)
+def _label_map(path):
+    return load_label_map(path) if path else {}
+
+def create_label_map():
+    """
+    The status and stage label mapping in the file MONDAY_LABEL_MAP points
+    to, or an empty one. Read once per path.
+    """
+    return _label_map(os.getenv('MONDAY_LABEL_MAP'))
+
+def dedup_items(df):
+    """
+    One row per item ID, last write wins: the row with the latest
+    updated_at, or the later row on ties and without updated_at (an item
+    edited mid-download shows up again on a later page). Kept rows keep
+    their order.
+    """
+    if 'id' not in df.columns or not df['id'].duplicated().any():
+        return df
+    if 'updated_at' in df.columns:
+        updated = pd.to_datetime(df['updated_at'], errors='coerce', utc=True, format='ISO8601')
+        positions = updated.reset_index(drop=True).sort_values(kind='stable', na_position='first').index
+    else:
+        positions = np.arange(len(df))
+    ordered = df.iloc[positions]
+    kept = np.sort(positions[~ordered['id'].duplicated(keep='last').values])
+    deduped = df.iloc[kept].reset_index(drop=True)
+    deduped.attrs = dict(df.attrs)
+    return deduped
+
+def parse_amounts(series, strict=False):
+    """
+    Parses the text left in an amount column by normalize_dataframe
+    (currency symbols and codes, thousands separators, "(300)" for -300,
+    k/M/bn suffixes and percentages, "12.5%" becoming 0.125) and returns
+    (float64 series, cells parsed, cells that held no amount). Cells
+    holding no amount become blank. With strict, series is returned as is
+    unless every cell is blank or an amount.
+    """
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        return series, 0, 0
+    values = series.astype(object)
+    is_text = values.map(lambda value: isinstance(value, str)).values.astype(bool)
+    texts = values[is_text].str.replace(r'[\s,]', '', regex=True)
+    texts = texts[texts != '']
+    match = texts.str.extract(AMOUNT_RE)
+
+    amounts = match['number'].astype('float64')
+    scales = match['scale'].str.lower().map(AMOUNT_SCALES).astype('float64').fillna(1.0)
+    negative = match['open'].notna() | match['sign'].notna() | match['sign2'].notna()
+    amounts = amounts * scales * np.where(match['percent'].notna(), 0.01, 1.0) * np.where(negative, -1.0, 1.0)
+
+    others = pd.to_numeric(values[~is_text].where(values[~is_text].map(np.isscalar), None), errors='coerce')
+    invalid = int(amounts.isna().sum() + (others.isna() & values[~is_text].notna()).sum())
+    if strict and invalid:
+        return series, 0, 0
+    parsed = pd.concat([others, amounts]).reindex(series.index)
+    return parsed.astype('float64').rename(series.name), int(amounts.notna().sum()), invalid
+
+def canonical_labels(series, labels=None):
+    """
+    A categorical column with each label folded onto one spelling: the
+    mapping in labels (keyed like load_label_map) where it has one,
+    otherwise the column's most frequent spelling of the label ignoring
+    case and stray whitespace. Blank labels become missing. Returns
+    (series, cells changed); other columns are returned unchanged.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype) or series.empty:
+        return series, 0
+    labels = labels or {}
+    categories = [str(category) for category in series.cat.categories]
+    codes = series.cat.codes.values
+    counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+
+    spellings = {}
+    for position in np.argsort(-counts, kind='stable'):
+        spellings.setdefault(_label_key(categories[position]), categories[position])
+    targets = []
+    for category in categories:
+        key = _label_key(category)
+        targets.append(labels.get(key, spellings[key]) if key else None)
+    if targets == categories:
+        return series, 0
+
+    new_categories = list(dict.fromkeys(target for target in targets if target is not None))
+    positions = {label: position for position, label in enumerate(new_categories)}
+    # Missing values have code -1, which picks the trailing -1 / False
+    mapper = np.array([positions[target] if target is not None else -1 for target in targets] + [-1])
+    changed = np.array([target != category for target, category in zip(targets, categories)] + [False])
+    cleaned = pd.Categorical.from_codes(mapper[codes], new_categories)
+    return pd.Series(cleaned, index=series.index, name=series.name), int(changed[codes].sum())
+
+def canonical_text(series, labels=None):
+    """
+    A text column repeating a few labels once case and whitespace are
+    ignored (a text-typed stage, status or sector column) with its labels
+    folded like canonical_labels. The column stays text; compact_text
+    makes it categorical later. Free text and columns holding lists or
+    mixed values are returned unchanged. Returns (series, cells changed).
+    """
+    present = series.dropna()
+    if present.empty or pd.api.types.infer_dtype(present, skipna=True) != 'string':
+        return series, 0
+    if present.map(_label_key).nunique() > len(present) * MAX_CATEGORY_RATIO:
+        return series, 0
+    # Categories in order of appearance, so equally frequent spellings fold onto the first seen
+    categorical = pd.Series(pd.Categorical(series, categories=present.unique()), index=series.index, name=series.name)
+    folded, changed = canonical_labels(categorical, labels)
+    if not changed:
+        return series, 0
+    return folded.astype(series.dtype), changed
+
+@traced('processor.clean')
+def clean_frame(df, labels=None):
+    """
+    The validation stage every normalized frame goes through once, before
+    it is compacted, cached or analyzed, so the analytics never coerce
+    values again. In one pass it
+      - drops duplicate items, last write wins (see dedup_items),
+      - parses amounts in numbers columns, and in text columns holding
+        nothing but currency or percent amounts (see parse_amounts),
+      - folds status and dropdown labels onto one spelling (see
+        canonical_labels), and those of text columns repeating a few
+        labels (see canonical_text), with labels defaulting to
+        create_label_map().
+    Returns (df, quality), quality counting each of QUALITY_COUNTERS. The
+    counts are added to the tracer's clean.* counters too.
+    """
+    quality = dict.fromkeys(QUALITY_COUNTERS, 0)
+    if df.empty:
+        return df, quality
+    labels = create_label_map() if labels is None else labels
+    deduped = dedup_items(df)
+    quality['rows'] = len(deduped)
+    quality['duplicates'] = len(df) - len(deduped)
+
+    types = deduped.attrs.get('column_types', {})
+    data = {}
+    for col in deduped.columns:
+        series = deduped[col]
+        col_type = types.get(col)
+        if col_type in NUMERIC_TYPES:
+            series, parsed, invalid = parse_amounts(series)
+            quality['amounts_parsed'] += parsed
+            quality['invalid_amounts'] += invalid
+        elif col_type in CATEGORICAL_TYPES:
+            series, changed = canonical_labels(series, labels)
+            quality['labels_canonicalized'] += changed
+        elif col_type in (None, 'text') and col not in ('id', 'name', 'updated_at') and _is_text(series):
+            # Only text made of currency or percent amounts; plain digits
+            # (codes, phone numbers) stay text
+            present = series.dropna().astype(str)
+            if not present.empty and present.str.contains(r'[$€£¥₹%]', regex=True).all():
+                series, parsed, _ = parse_amounts(series, strict=True)
+                quality['amounts_parsed'] += parsed
+            else:
+                series, changed = canonical_text(series, labels)
+                quality['labels_canonicalized'] += changed
+        data[col] = series
+
+    cleaned = pd.DataFrame(data, index=deduped.index)
+    cleaned.attrs = dict(deduped.attrs)
+    for name, value in quality.items():
+        if name != 'rows' and value:
+            tracer.count(f'clean.{name}', value)
+    return cleaned, quality
+
+def memory_usage(df):
+    """
+    Bytes per column, counting the Python objects object columns point to.
+    """
+    return df.memory_usage(deep=True, index=False)
+
 class DataProcessor:
-    def __init__(self, items, columns_map=None):
-        self.raw_items = items
-        self.df = normalize_dataframe(items, columns_map)
+    def __init__(self, items, columns_map=None, column_types=None, compact=True):
+        # Raw items aren't kept; they are several times the size of the frame
+        with tracer.span('processor.build', items=len(items)):
+            self._set_frame(normalize_dataframe(items, columns_map, column_types), compact)
+
+    @classmethod
+    def from_pages(cls, pages, columns_map=None, column_types=None, compact=True):
+        """
+        Builds the frame from an iterable of item pages, normalizing each
+        page as it arrives instead of collecting all items first.
+        """
+        processor = cls([], compact=compact)
+        # Includes the time spent waiting for pages to arrive
+        with tracer.span('processor.from_pages') as span:
+            processor._set_frame(concat_frames(normalize_pages(pages, columns_map, column_types)), compact)
+            span.set(items=len(processor.df))
+        return processor
+
+    @classmethod
+    def from_frames(cls, frames, compact=True):
+        """
+        Builds the frame from pages normalized elsewhere, e.g. pages of
+        several boards arriving interleaved from one batched query.
+        """
+        processor = cls([], compact=compact)
+        processor._set_frame(concat_frames(frames), compact)
+        return processor
+
+    def _set_frame(self, df, compact):
+        # Cleaned and compacted once the whole board is in: last write wins
+        # and cardinality need every row
+        df, self.quality = clean_frame(df)
+        self._memory_before = memory_usage(df)
+        self._dtypes_before = df.dtypes
+        self.df = compact_dataframe(df) if compact else df
+
+    def memory_report(self):
+        """
+        Per-column dtype and bytes of the normalized frame before and after
+        compaction, with a 'total' row.
+        """
+        after = memory_usage(self.df)
+        report = pd.DataFrame({
+            'dtype_before': self._dtypes_before.astype(str),
+            'dtype_after': self.df.dtypes.astype(str),
+            'bytes_before': self._memory_before,
+            'bytes_after': after,
+        }).reindex(self.df.columns)
+        report.loc['total'] = ['', '', self._memory_before.sum(), after.sum()]
+        report['saved'] = 1 - report['bytes_after'] / report['bytes_before'].where(report['bytes_before'] > 0)
+        return report
 
     def get_dataframe(self):
         return self.df
 
     def clean_data(self):
-        # Remove duplicates
-        if not self.df.empty:
-            self.df.drop_duplicates(subset=['id'], inplace=True)
+        """
+        The frame, cleaned by clean_frame while it was built; quality holds
+        its counters.
+        """
         return self.df
@@ -0,0 +1,453 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import pandas as pd
+from src.columns import ROLE_COLUMNS, resolve_columns
+from src.data_processor import DataProcessor, apply_column_titles, concat_frames, normalize_dataframe
+from src.monday_api import BoardRequest, batch_queries_enabled, prefetch_pages
+
+# Roles the analytics layer knows about, with their legacy single-board env vars
+LEGACY_BOARD_VARS = {
+    "deals": "DEALS_BOARD_ID",
+    "work_orders": "WORK_ORDERS_BOARD_ID",
+}
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+def load_board_config():
+    """
+    Returns the configured boards as a list of (role, board_id) tuples.
+
+    MONDAY_BOARDS takes a comma separated list of role=board_id pairs, e.g.
+    "deals=123,deals=456,work_orders=789". When it is not set the legacy
+    DEALS_BOARD_ID / WORK_ORDERS_BOARD_ID variables are used.
+    """
+    boards = []
+    spec = os.getenv("MONDAY_BOARDS", "").strip()
+
+    if spec:
+        for entry in spec.split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            if "=" not in entry:
+                raise ValueError(f"Invalid MONDAY_BOARDS entry '{entry}', expected role=board_id")
+            role, board_id = entry.split("=", 1)
+            boards.append((role.strip(), int(board_id.strip())))
+        return boards
+
+    for role, env_var in LEGACY_BOARD_VARS.items():
+        board_id = os.getenv(env_var)
+        if board_id:
+            boards.append((role, int(board_id)))
+    return boards
+
+
+class ColumnProjection:
+    """
+    Narrows a board's schema to the semantic columns its role's analytics
+    read, resolved with the same rules the Analyzer uses. Boards without
+    a known role are not projected.
+    """
+    def __init__(self, boards, role_columns=ROLE_COLUMNS):
+        self.role_columns = role_columns
+        self.roles = {}
+        for role, board_id in boards:
+            self.roles.setdefault(board_id, []).append(role)
+
+    def select(self, board_id, schema):
+        """
+        Takes the board schema from get_board_schema and returns the
+        projected {column_id: title} map, or None if the board should be
+        fetched in full.
+        """
+        semantics = {
+            semantic
+            for role in self.roles.get(board_id, [])
+            for semantic in self.role_columns.get(role, [])
+        }
+        if not semantics:
+            return None
+
+        resolved = resolve_columns(tuple((col['title'], col.get('type')) for col in schema))
+        wanted = {title for semantic, title in resolved.items() if semantic in semantics}
+        # Frames are keyed by title and a repeated title holds the later column
+        ids_by_title = {col['title']: col['id'] for col in schema}
+        selected = {ids_by_title[title] for title in wanted}
+        # Keep board order, normalization and title collisions depend on it
+        return {col['id']: col['title'] for col in schema if col['id'] in selected}
+
+
+def create_projection(boards):
+    """
+    Returns a ColumnProjection for the boards when MONDAY_FIELD_PROJECTION=on, otherwise None.
+    """
+    if os.getenv("MONDAY_FIELD_PROJECTION", "off").lower() not in ("on", "1", "true"):
+        return None
+    return ColumnProjection(boards)
+
+
+def _max_workers(max_workers):
+    if max_workers is None:
+        return int(os.getenv("MONDAY_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+    return max_workers
+
+
+def map_boards(fn, board_ids, max_workers=None):
+    """
+    Runs fn(board_id) for every board on a shared thread pool and
+    returns {board_id: result}. The first failure is raised.
+    """
+    board_ids = list(dict.fromkeys(board_ids))
+    if not board_ids:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=_max_workers(max_workers), thread_name_prefix="monday-fetch") as pool:
+        futures = {board_id: pool.submit(fn, board_id) for board_id in board_ids}
+        return {board_id: future.result() for board_id, future in futures.items()}
+
+
+def _stream_board(client, board_id, column_ids=None):
+    """
+    Streams one board page by page into a frame keyed by column ID.
+    """
+    return DataProcessor.from_pages(client.iter_board_pages(board_id, column_ids=column_ids)).clean_data()
+
+
+def _fetch_projected_board(client, board_id, projection):
+    """
+    Reads the schema first, then streams only the projected columns.
+    """
+    schema = client.get_board_schema(board_id)
+    columns_map = {col['id']: col['title'] for col in schema}
+    projected = projection.select(board_id, schema)
+    if projected is not None:
+        columns_map = projected
+    df = _stream_board(client, board_id, list(projected) if projected is not None else None)
+    return apply_column_titles(df, columns_map), columns_map
+
+
+def stream_board_batch(batch, board_ids):
+    """
+    Normalizes the interleaved pages of a BoardBatch as they arrive, the
+    next request already in flight, into {board_id: DataFrame} keyed by
+    column ID.
+    """
+    chunks = {board_id: [] for board_id in board_ids}
+    for board_id, items in prefetch_pages(batch.pages()):
+        chunks[board_id].append(normalize_dataframe(items))
+    return {board_id: DataProcessor.from_frames(frames).clean_data() for board_id, frames in chunks.items()}
+
+
+def projected_columns(client, board_ids, projection):
+    """
+    ({board_id: columns_map}, {board_id: column_ids or None}) of the
+    boards under projection, from one batched schema query.
+    """
+    schemas = client.get_board_schemas(board_ids)
+    columns_maps = {}
+    column_ids = {}
+    for board_id in board_ids:
+        schema = schemas.get(board_id, [])
+        projected = projection.select(board_id, schema)
+        columns_maps[board_id] = projected if projected is not None else {col['id']: col['title'] for col in schema}
+        column_ids[board_id] = list(projected) if projected is not None else None
+    return columns_maps, column_ids
+
+
+def _fetch_boards_batched(client, board_ids, projection=None):
+    """
+    fetch_boards over batched multi-board queries: every board's schema
+    and first page come back in one request (two with a projection, whose
+    schemas are needed first) and the remaining pages of all boards share
+    requests too.
+    """
+    columns_maps, column_ids = {}, {}
+    if projection is not None:
+        columns_maps, column_ids = projected_columns(client, board_ids, projection)
+    batch = client.batch_boards([
+        BoardRequest(board_id, schema=projection is None, column_ids=column_ids.get(board_id))
+        for board_id in board_ids
+    ])
+    frames = stream_board_batch(batch, board_ids)
+    if projection is None:
+        columns_maps = {
+            board_id: {col['id']: col['title'] for col in batch.schemas.get(board_id, [])} for board_id in board_ids
+        }
+    return {board_id: (apply_column_titles(frames[board_id], columns_maps[board_id]), columns_maps[board_id])
+            for board_id in board_ids}
+
+
+def fetch_boards(client, board_ids, max_workers=None, projection=None):
+    """
+    Fetches items and column schema of every board concurrently.
+    All requests share one thread pool, so max_workers is the total number
+    of in-flight Monday requests regardless of how many boards there are.
+
+    Items are streamed: every page is normalized as it arrives while the
+    next one is being requested, and the raw items are dropped right after.
+    Column titles are applied once the schema request has returned. With
+    a ColumnProjection the schema is read first and only the projected
+    columns are requested; the returned columns_map is the projected one.
+
+    Clients that can batch queries (see batch_queries_enabled) fetch all
+    boards together with aliased multi-board queries instead, and
+    async-backed clients (SyncMondayClient) otherwise fetch them on their
+    event loop.
+
+    Returns {board_id: (DataFrame, columns_map)}. The first failure is raised.
+    """
+    board_ids = list(dict.fromkeys(board_ids))
+    if not board_ids:
+        return {}
+    if batch_queries_enabled(client):
+        return _fetch_boards_batched(client, board_ids, projection)
+    if hasattr(client, "fetch_boards"):
+        # Async-backed clients run every board on their own event loop
+        return client.fetch_boards(board_ids, projection, _max_workers(max_workers))
+
+    with ThreadPoolExecutor(max_workers=_max_workers(max_workers), thread_name_prefix="monday-fetch") as pool:
+        if projection is not None:
+            futures = {
+                board_id: pool.submit(_fetch_projected_board, client, board_id, projection)
+                for board_id in board_ids
+            }
+            return {board_id: future.result() for board_id, future in futures.items()}
+
+        futures = {
+            board_id: (
+                pool.submit(_stream_board, client, board_id),
+                pool.submit(client.get_board_columns, board_id),
+            )
+            for board_id in board_ids
+        }
+        results = {}
+        for board_id, (frame, columns) in futures.items():
+            columns_map = columns.result()
+            results[board_id] = (apply_column_titles(frame.result(), columns_map), columns_map)
+        return results
+
+
+def with_source(df, source):
+    """
+    df with a categorical source column naming the board its rows came from.
+    """
+    if df.empty:
+        return df
+    df = df.assign(source=pd.Categorical([source] * len(df)))
+    df.attrs['column_types'] = dict(df.attrs.get('column_types', {}), source='text')
+    return df
+
+
+def group_by_role(boards, board_frames, sources=None):
+    """
+    Concatenates the frames of boards sharing a role. With sources
+    ({board_id: label}) each row is tagged with its board's label.
+    """
+    frames = {}
+    for role, board_id in boards:
+        df = board_frames[board_id]
+        if sources is not None:
+            df = with_source(df, sources[board_id])
+        frames.setdefault(role, []).append(df)
+
+    return {role: concat_frames(dfs) for role, dfs in frames.items()}
+
+
+def load_board_frames(client, board_ids, max_workers=None, syncer=None, cache=None, projection=None):
+    """
+    Fetches the boards and returns {board_id: DataFrame}.
+
+    With an IncrementalSync, each board is brought up to date from its
+    snapshot instead of being downloaded in full. Otherwise full downloads
+    are written to cache, if given, for the next warm start. projection
+    applies to full downloads; a syncer carries its own.
+    """
+    if syncer is not None:
+        if hasattr(syncer, "sync_many") and batch_queries_enabled(getattr(syncer, "client", None)):
+            return syncer.sync_many(board_ids)
+        return map_boards(syncer.sync, board_ids, max_workers)
+
+    started = datetime.now(timezone.utc)
+    board_frames = {}
+    for board_id, (df, columns_map) in fetch_boards(client, board_ids, max_workers, projection).items():
+        board_frames[board_id] = df
+        if cache is not None:
+            cache.put(board_id, df, columns_map, started)
+    return board_frames
+
+
+def load_role_frames(client, boards, max_workers=None, syncer=None, cache=None, projection=None):
+    """
+    Fetches all configured boards and returns {role: DataFrame}.
+    Boards sharing a role are concatenated into one frame.
+    """
+    board_ids = [board_id for _, board_id in boards]
+    return group_by_role(boards, load_board_frames(client, board_ids, max_workers, syncer, cache, projection))
+
+
+def load_cached_role_frames(cache, boards, sources=None):
+    """
+    Reads every configured board from the on-disk cache without touching
+    the API. Returns ({role: DataFrame}, stale, stored_at) where stored_at
+    is the time the oldest board was cached, or (None, True, None) if any
+    board is missing from the cache.
+    """
+    board_frames = {}
+    stale = False
+    stored_at = None
+    for _, board_id in boards:
+        if board_id in board_frames:
+            continue
+        entry = cache.get(board_id)
+        if entry is None:
+            return None, True, None
+        board_frames[board_id] = entry.df
+        stale = stale or entry.stale
+        stored_at = entry.stored_at if stored_at is None else min(stored_at, entry.stored_at)
+
+    return group_by_role(boards, board_frames, sources), stale, stored_at
+
+
+class BoardFrames:
+    """
+    Latest role frames of the configured boards, served stale-while-revalidate.
+
+    load() answers straight from the on-disk cache when every board is in
+    it, and refreshes on a background thread if any of them is stale.
+    With a cold cache it fetches synchronously. version goes up each time
+    new frames are published, so callers can tell when to rebuild, and
+    updated_at is when the published data was fetched from Monday.com.
+
+    Only one refresh runs at a time: a caller asking for one while another
+    is in flight waits for it and gets its frames. A loader (see
+    ShardedLoader) takes over fetching when boards span several accounts
+    or are ingested by worker processes; sources then labels their rows.
+    """
+    def __init__(self, client, boards, syncer=None, cache=None, max_workers=None, projection=None,
+                 loader=None, sources=None):
+        self.client = client
+        self.boards = boards
+        self.loader = loader
+        self.sources = sources
+        self.syncer = syncer
+        self.cache = cache if cache is not None else getattr(syncer, "cache", None)
+        self.max_workers = max_workers
+        self.projection = projection
+        self.frames = None
+        self.version = 0
+        # Completed refreshes; unlike version, webhook patches don't bump it
+        self.refreshes = 0
+        self.updated_at = None
+        self.error = None
+        self.loaded_from_cache = False
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread = None
+
+    def load(self):
+        """
+        Returns {role: DataFrame}, from the cache if it is warm.
+        """
+        if self.cache is not None and self.boards:
+            frames, stale, stored_at = load_cached_role_frames(self.cache, self.boards, self.sources)
+            if frames is not None:
+                self._publish(frames, stored_at)
+                self.loaded_from_cache = True
+                if stale:
+                    self.refresh_async()
+                return frames
+        return self.refresh()
+
+    def refresh(self):
+        """
+        Fetches the boards (incrementally when a syncer is set) and publishes
+        the result. If a refresh is already running, waits for it instead of
+        fetching again.
+        """
+        refreshes = self.refreshes
+        with self._refresh_lock:
+            if self.refreshes != refreshes and self.frames is not None:
+                return self.frames
+            started = time.time()
+            if self.loader is not None:
+                frames = self.loader.load()
+            else:
+                frames = load_role_frames(self.client, self.boards, self.max_workers, self.syncer, self.cache,
+                                          self.projection)
+            self._publish(frames, started)
+            self.refreshes += 1
+            self.error = None
+            return frames
+
+    @property
+    def stats(self):
+        """
+        RequestStats of the requests fetching the boards: the loader's when
+        it fetches them, otherwise the client's. None when neither has any.
+        """
+        if self.loader is not None:
+            return getattr(self.loader, "stats", None)
+        return getattr(self.client, "stats", None)
+
+    def snapshot(self):
+        """
+        (version, frames) as published together, loading them on first use.
+        """
+        if self.frames is None:
+            self.load()
+        with self._lock:
+            return self.version, self.frames
+
+    def refresh_async(self):
+        """
+        Starts a background refresh unless one is already running and returns its thread.
+        """
+        with self._lock:
+            if self._refresh_thread is None or not self._refresh_thread.is_alive():
+                self._refresh_thread = threading.Thread(
+                    target=self._background_refresh, name="monday-refresh", daemon=True
+                )
+                self._refresh_thread.start()
+            return self._refresh_thread
+
+    @property
+    def refreshing(self):
+        return self._refresh_lock.locked() or (self._refresh_thread is not None and self._refresh_thread.is_alive())
+
+    @property
+    def age(self):
+        """
+        Seconds since the published data was fetched, or None before the first load.
+        """
+        return None if self.updated_at is None else time.time() - self.updated_at
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            # Keep serving what we have; the next refresh tries again
+            self.error = str(e)
+            print(f"Background refresh failed, serving cached data: {e}")
+
+    def apply_patch(self, role, patch):
+        """
+        Publishes a new version in which the frame of role is replaced by
+        patch(frame). The other roles keep their frame objects, so their
+        Analyzer aggregates stay valid.
+        """
+        with self._lock:
+            frames = dict(self.frames or {})
+            frames[role] = patch(frames.get(role, pd.DataFrame()))
+            self.frames = frames
+            self.version += 1
+            return frames[role]
+
+    def _publish(self, frames, updated_at):
+        with self._lock:
+            self.frames = frames
+            self.updated_at = updated_at
+            self.version += 1
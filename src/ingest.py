@@ -0,0 +1,199 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from src.cache import create_board_cache
+from src.fetcher import (DEFAULT_MAX_CONCURRENCY, BoardFrames, create_projection, group_by_role, load_board_frames)
+from src.async_monday_api import create_client
+from src.monday_api import ComplexityBudget, RequestStats
+from src.registry import create_registry
+from src.sync import create_syncer
+from src.tracing import tracer
+
+# Clients and syncers of the shards a worker process has run, so it keeps
+# its keep-alive sessions and sync snapshots between loads
+_SHARD_STATE = {}
+_SHARD_STATE_LOCK = threading.Lock()
+
+
+class Shard:
+    """
+    A slice of one tenant's boards, ingested by one worker with its share
+    (1/count) of the tenant's complexity budget and concurrency.
+    """
+    def __init__(self, tenant, index, count, boards):
+        self.tenant = tenant
+        self.index = index
+        self.count = count
+        self.boards = boards
+
+    @property
+    def key(self):
+        return self.tenant.name, self.index, self.count
+
+    @property
+    def max_workers(self):
+        concurrency = self.tenant.max_concurrency or int(os.getenv("MONDAY_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+        return max(1, concurrency // self.count)
+
+    @property
+    def complexity_per_minute(self):
+        if not self.tenant.complexity_per_minute:
+            return None
+        return self.tenant.complexity_per_minute / self.count
+
+    def __repr__(self):
+        return f"Shard({self.tenant.name!r}, {self.index + 1}/{self.count}, boards={len(self.boards)})"
+
+
+def plan_shards(registry, workers=0):
+    """
+    Splits each tenant's boards into shards, round robin in registry
+    order. With workers, every tenant gets an equal share of them (at least
+    one shard, at most one per board); without, one shard per tenant.
+    """
+    groups = registry.by_tenant()
+    shards = []
+    for name, specs in groups.items():
+        count = max(1, min(len(specs), workers // len(groups))) if workers else 1
+        for index in range(count):
+            boards = [(spec.role, spec.board_id) for spec in specs[index::count]]
+            shards.append(Shard(registry.tenants[name], index, count, boards))
+    return shards
+
+
+def _shard_state(shard, states, stats=None):
+    with _SHARD_STATE_LOCK:
+        if shard.key not in states:
+            tenant = shard.tenant
+            if not tenant.api_key:
+                raise ValueError(f"{tenant.api_key_env} is not set for tenant '{tenant.name}'")
+            budget = ComplexityBudget(shard.complexity_per_minute) if shard.complexity_per_minute else None
+            client = create_client(api_key=tenant.api_key, api_url=tenant.api_url, budget=budget)
+            if stats is not None:
+                client.stats = stats
+            cache = create_board_cache()
+            projection = create_projection(shard.boards)
+            states[shard.key] = (client, create_syncer(client, cache, projection), cache, projection)
+        return states[shard.key]
+
+
+def ingest_shard(shard, states=None, stats=None):
+    """
+    Fetches and normalizes the boards of one shard and returns {board_id: DataFrame}.
+    Runs in a worker process, or on a thread of a loader without workers,
+    which passes its own states and the RequestStats its clients share.
+    """
+    client, syncer, cache, projection = _shard_state(shard, _SHARD_STATE if states is None else states, stats)
+    board_ids = list(dict.fromkeys(board_id for _, board_id in shard.boards))
+    return load_board_frames(client, board_ids, shard.max_workers, syncer, cache, projection)
+
+
+class ShardedLoader:
+    """
+    Loads the boards of a BoardRegistry into role frames, with a source
+    column telling the boards apart.
+
+    Each tenant's boards are split into shards (see plan_shards). With
+    workers, shards run on a pool of that many processes, so fetching and
+    normalizing boards doesn't contend for one interpreter; every worker
+    keeps to its share of its tenant's rate limits. Workers share the
+    on-disk board cache, so incremental sync picks up from the last
+    snapshot whichever worker runs a shard. Without workers, shards run on
+    threads of this process.
+
+    stats counts the requests of this process's clients: the shards'
+    without workers, and client_for's. Worker processes keep their own.
+    """
+    def __init__(self, registry, workers=0):
+        self.registry = registry
+        self.workers = workers
+        self.shards = plan_shards(registry, workers)
+        self._pool = None
+        self._states = {}
+        self._clients = {}
+        self._lock = threading.Lock()
+        self.stats = RequestStats()
+
+    def _executor(self):
+        if not self.workers:
+            return ThreadPoolExecutor(max_workers=len(self.shards), thread_name_prefix="monday-shard")
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a process that runs threads (the app's
+                # refresher, a web server) can deadlock the child
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def load(self):
+        """
+        Ingests every shard and returns {role: DataFrame}. The first failure is raised.
+        """
+        if not self.shards:
+            return {}
+        with tracer.span("ingest.load", shards=len(self.shards), workers=self.workers):
+            executor = self._executor()
+            try:
+                if self.workers:
+                    futures = [executor.submit(ingest_shard, shard) for shard in self.shards]
+                else:
+                    futures = [executor.submit(ingest_shard, shard, self._states, self.stats) for shard in self.shards]
+                board_frames = {}
+                for future in futures:
+                    board_frames.update(future.result())
+            finally:
+                if not self.workers:
+                    executor.shutdown()
+        return group_by_role(self.registry.boards, board_frames, self.registry.sources())
+
+    def client_for(self, board_id):
+        """
+        A client of the tenant owning board_id, for one-off requests from
+        this process, keeping to the tenant's complexity budget.
+        """
+        tenant = next((spec.tenant for spec in self.registry.specs if spec.board_id == int(board_id)), None)
+        tenant = self.registry.tenants.get(tenant)
+        if tenant is None:
+            return None
+        with self._lock:
+            if tenant.name not in self._clients:
+                budget = ComplexityBudget(tenant.complexity_per_minute) if tenant.complexity_per_minute else None
+                client = create_client(api_key=tenant.api_key, api_url=tenant.api_url, budget=budget)
+                client.stats = self.stats
+                self._clients[tenant.name] = client
+            return self._clients[tenant.name]
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+
+def create_loader(registry):
+    """
+    Returns a ShardedLoader running MONDAY_INGEST_WORKERS processes (default
+    0, threads in this process), or None when neither workers nor a
+    registry file are configured and the plain single-account path does.
+    """
+    workers = int(os.getenv("MONDAY_INGEST_WORKERS", "0"))
+    if workers <= 0 and registry.path is None:
+        return None
+    return ShardedLoader(registry, max(0, workers))
+
+
+def create_board_frames(client):
+    """
+    The BoardFrames of the configured boards: from the board registry
+    through a ShardedLoader when one is configured, otherwise from client
+    with the configured syncer and projection.
+    """
+    registry = create_registry()
+    cache = create_board_cache()
+    loader = create_loader(registry)
+    if loader is not None:
+        return BoardFrames(client, registry.boards, cache=cache, loader=loader, sources=registry.sources())
+
+    projection = create_projection(registry.boards)
+    return BoardFrames(client, registry.boards, syncer=create_syncer(client, cache, projection),
+                       cache=cache, projection=projection)
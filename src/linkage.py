@@ -0,0 +1,161 @@
+import copy
+import pandas as pd
+from src.data_processor import RELATION_TYPES
+
+# Columns of the link index
+LINK_COLUMNS = ['deal_id', 'work_order_id', 'source']
+
+
+def normalize_names(series):
+    """
+    Case, punctuation and whitespace insensitive form of item names, for matching.
+    """
+    return (series.astype(str).str.lower()
+            .str.replace(r'[^\w\s]', ' ', regex=True)
+            .str.split().str.join(' '))
+
+
+def name_column(df):
+    for col in ('name', 'Name'):
+        if col in df.columns:
+            return col
+    return None
+
+
+def relation_columns(df):
+    """
+    Connect-boards and mirror columns of a normalized frame.
+    """
+    types = df.attrs.get('column_types', {})
+    return [col for col in df.columns if types.get(col) in RELATION_TYPES]
+
+
+class BoardLinks:
+    """
+    Per-board half of the link index: each item's normalized name, and the
+    normalized names its relation columns point at.
+
+    update() only re-normalizes rows that are new or whose updated_at
+    changed since the previous frame, so a patched or incrementally synced
+    board costs work proportional to the change, not the board.
+    """
+    def __init__(self):
+        self.frame = None
+        self._reset()
+
+    def _reset(self):
+        self.names = pd.DataFrame({'id': pd.Series(dtype=object), 'norm': pd.Series(dtype=object)})
+        self.targets = self.names.copy()
+        self._versions = None
+        self._layout = None
+
+    def update(self, df):
+        """
+        Refreshes the names and targets from df. Returns False if df is the
+        frame seen last time and nothing had to be done.
+        """
+        if df is self.frame:
+            return False
+        self.frame = df
+        if df is None or df.empty or 'id' not in df.columns:
+            self._reset()
+            return True
+
+        ids = df['id'].astype(str)
+        name_col = name_column(df)
+        relations = relation_columns(df)
+        layout = (name_col, tuple(relations))
+        versions = None
+        if 'updated_at' in df.columns and ids.is_unique:
+            versions = pd.Series(df['updated_at'].astype(str).values, index=ids.values)
+
+        if versions is not None and self._versions is not None and layout == self._layout:
+            changed = (self._versions.reindex(versions.index) != versions).values
+            kept = ids[~changed]
+        else:
+            changed = pd.Series(True, index=df.index).values
+            kept = ids.iloc[:0]
+
+        rows = df[changed]
+        row_ids = ids[changed].values
+        names = pd.DataFrame({'id': row_ids, 'norm': None}, dtype=object)
+        if name_col:
+            present = rows[name_col].notna().values
+            names.loc[present, 'norm'] = normalize_names(rows[name_col][present]).values
+        targets = [
+            pd.DataFrame({'id': row_ids, 'name': rows[col].values}).explode('name').dropna()
+            for col in relations
+        ]
+        targets = pd.concat(targets, ignore_index=True) if targets else pd.DataFrame(columns=['id', 'name'])
+        targets = pd.DataFrame({'id': targets['id'].values, 'norm': normalize_names(targets['name']).values})
+
+        self.names = _concat([self.names[self.names['id'].isin(kept)], names])
+        self.targets = _concat([self.targets[self.targets['id'].isin(kept)], targets])
+        self._versions = versions
+        self._layout = layout
+        return True
+
+
+def _concat(frames):
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame({'id': pd.Series(dtype=object), 'norm': pd.Series(dtype=object)})
+    combined = pd.concat(frames, ignore_index=True)
+    # Blank names would match each other
+    return combined[combined['norm'].notna() & (combined['norm'] != '')].reset_index(drop=True)
+
+
+class LinkIndex:
+    """
+    Prebuilt (deal_id, work_order_id) pairs between the deals and work
+    orders boards.
+
+    Pairs come from connect-boards and mirror columns on either board,
+    whose names are resolved to item IDs on the other board. Work orders
+    without such a link fall back to matching their normalized name
+    against deal names. Each board's half is refreshed incrementally (see
+    BoardLinks) and the pairs are then rebuilt with vectorized merges.
+    """
+    def __init__(self):
+        self.deals = BoardLinks()
+        self.work_orders = BoardLinks()
+        self.pairs = pd.DataFrame(columns=LINK_COLUMNS)
+
+    def update(self, deals_df, work_orders_df):
+        """
+        Brings the index up to date with the given frames and returns the pairs.
+        """
+        changed = self.deals.update(deals_df)
+        changed = self.work_orders.update(work_orders_df) or changed
+        if changed:
+            self.pairs = self._join()
+        return self.pairs
+
+    def copy(self):
+        """
+        An index starting from this one's state that is updated separately.
+        update() only reassigns the frames it holds, so they can be shared.
+        """
+        index = copy.copy(self)
+        index.deals = copy.copy(self.deals)
+        index.work_orders = copy.copy(self.work_orders)
+        return index
+
+    def _join(self):
+        deal_names = self.deals.names
+        order_names = self.work_orders.names
+
+        from_orders = self.work_orders.targets.merge(deal_names, on='norm', suffixes=('_order', '_deal'))
+        from_deals = self.deals.targets.merge(order_names, on='norm', suffixes=('_deal', '_order'))
+        linked = pd.concat([
+            pd.DataFrame({'deal_id': from_orders['id_deal'], 'work_order_id': from_orders['id_order']}),
+            pd.DataFrame({'deal_id': from_deals['id_deal'], 'work_order_id': from_deals['id_order']}),
+        ], ignore_index=True)
+        linked['source'] = 'relation'
+
+        unlinked = order_names[~order_names['id'].isin(linked['work_order_id'])]
+        by_name = unlinked.merge(deal_names, on='norm', suffixes=('_order', '_deal'))
+        by_name = pd.DataFrame({'deal_id': by_name['id_deal'], 'work_order_id': by_name['id_order'], 'source': 'name'})
+
+        pairs = pd.concat([linked, by_name], ignore_index=True)
+        return pairs.drop_duplicates(['deal_id', 'work_order_id']).reset_index(drop=True)[LINK_COLUMNS]
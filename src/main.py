@@ -1,77 +1,164 @@
+import argparse
 import os
 import sys
 import pandas as pd
 from dotenv import load_dotenv
-from src.monday_api import MondayClient
-from src.data_processor import DataProcessor
-from src.analyzer import Analyzer
+from src.async_monday_api import create_client
+from src.ingest import create_board_frames
+from src.analyzer import AnalyzerVersions
+from src.webhooks import create_webhook_server
+from src.query_cache import create_query_cache
+from src.router import FALLBACK_ANSWER, create_router
+from src.report import create_leadership_report
+from src.service import create_analytics_server
+from src.service_client import create_service_client
+from src.tracing import create_exporters, format_report, tracer
 
 # Load environment variables
 load_dotenv()
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AI Business Intelligence Agent")
+    parser.add_argument("--profile", action="store_true",
+                        help="print a timing breakdown of fetch, normalize and analyze after loading and after every query")
+    return parser.parse_args(argv)
+
+def print_profile(title):
+    print(f"\n--- Profile: {title} ---")
+    print(format_report(tracer.snapshot()))
+
+def print_banner():
+    print("\n" + "="*50)
+    print(" AGENT READY ")
+    print("="*50)
+    print("You can ask questions like:")
+    print(" - 'How is the pipeline looking?'")
+    print(" - 'Show me operational status'")
+    print(" - 'Which won deals have stuck work orders?'")
+    print(" - 'Give me a leadership update'")
+    print(" - 'exit' to quit")
+    print("-" * 50)
+
+def run_thin_client(service, args):
+    """
+    Answers questions from the analytics service at MONDAY_SERVICE_URL
+    instead of fetching the boards in this process.
+    """
+    try:
+        health = service.health()
+    except Exception as e:
+        print(f"\nCRITICAL ERROR reaching the analytics service: {e}")
+        return
+    print(f"Connected to the analytics service at {service.base_url}.")
+    for role, rows in health['rows'].items():
+        print(f"    Loaded {rows} {role.replace('_', ' ')}.")
+    print_banner()
+
+    while True:
+        try:
+            query = input("\nQuery > ").strip()
+            if query.lower() in ['exit', 'quit', 'q']:
+                print("Goodbye!")
+                break
+            if not query:
+                continue
+
+            answer = service.ask(query)
+            if answer['intent'] is None:
+                print(answer['text'])
+            else:
+                print(f"\n{answer['title']}\n")
+                print(answer['text'])
+            if args.profile:
+                print(f"analytics service: {service.stats}, data version {service.version}")
+
+        except KeyboardInterrupt:
+            print("\nGoodbye!")
+            break
+        except Exception as e:
+            print(f"An error occurred during analysis: {e}")
+
+def main(argv=None):
+    args = parse_args(argv)
     print("Initializing AI Business Intelligence Agent...")
+    create_exporters()
+
+    # A shared analytics service holds the data; nothing to fetch here
+    service = create_service_client()
+    if service is not None:
+        run_thin_client(service, args)
+        return
     
     # 1. Check Configuration
     api_key = os.getenv("MONDAY_API_KEY")
-    wo_board_id = os.getenv("WORK_ORDERS_BOARD_ID")
-    deals_board_id = os.getenv("DEALS_BOARD_ID")
     
-    if not api_key:
+    # A board registry names each account's own key variable
+    if not api_key and not os.getenv("MONDAY_BOARD_REGISTRY"):
         print("Error: MONDAY_API_KEY not found in .env file.")
         print("Please configure your .env file.")
         return
 
-    client = MondayClient()
+    client = create_client()
     
     # 2. Fetch Data (with error handling)
     print("Fetching data from Monday.com...")
     
-    deals_df = pd.DataFrame()
-    wo_df = pd.DataFrame()
-    
     try:
-        if deals_board_id:
-            print(f"  - Fetching Deals (Board ID: {deals_board_id})...")
-            deals_items = client.get_board_items(int(deals_board_id))
-            deals_cols = client.get_board_columns(int(deals_board_id))
-            deals_processor = DataProcessor(deals_items, deals_cols)
-            deals_df = deals_processor.clean_data()
-            print(f"    Loaded {len(deals_df)} deals.")
-        else:
-            print("  - Warning: DEALS_BOARD_ID not set.")
-
-        if wo_board_id:
-            print(f"  - Fetching Work Orders (Board ID: {wo_board_id})...")
-            wo_items = client.get_board_items(int(wo_board_id))
-            wo_cols = client.get_board_columns(int(wo_board_id))
-            wo_processor = DataProcessor(wo_items, wo_cols)
-            wo_df = wo_processor.clean_data()
-            print(f"    Loaded {len(wo_df)} work orders.")
-        else:
-            print("  - Warning: WORK_ORDERS_BOARD_ID not set.")
+        board_frames = create_board_frames(client)
+        boards = board_frames.boards
+        for role, board_id in boards:
+            source = f", {board_frames.sources[board_id]}" if board_frames.sources else ""
+            print(f"  - Fetching {role} (Board ID: {board_id}{source})...")
+        if board_frames.loader is not None:
+            print(f"  - Ingesting {len(board_frames.loader.shards)} shard(s) "
+                  f"on {board_frames.loader.workers or 'no'} worker process(es).")
+        if not any(role == 'deals' for role, _ in boards):
+            print("  - Warning: no deals board configured (DEALS_BOARD_ID or MONDAY_BOARDS).")
+        if not any(role == 'work_orders' for role, _ in boards):
+            print("  - Warning: no work orders board configured (WORK_ORDERS_BOARD_ID or MONDAY_BOARDS).")
+
+        frames = board_frames.load()
+        deals_df = frames.get('deals', pd.DataFrame())
+        wo_df = frames.get('work_orders', pd.DataFrame())
+        print(f"    Loaded {len(deals_df)} deals.")
+        print(f"    Loaded {len(wo_df)} work orders.")
+        if board_frames.refreshing:
+            print("    Served from local cache; refreshing from Monday.com in the background.")
+        webhook_server = create_webhook_server(board_frames)
+        if webhook_server is not None:
+            print(f"    Receiving live updates at {webhook_server.url}")
+        # One Analyzer per data version, shared with the report and the service
+        analyzers = AnalyzerVersions()
+        report = create_leadership_report(board_frames, analyzers)
+        if report is not None:
+            print(f"    Prerendering the leadership report into {report.directory}")
+        analytics_server = create_analytics_server(board_frames, report=report, analyzers=analyzers)
+        if analytics_server is not None:
+            print(f"    Serving analytics at {analytics_server.url}")
             
     except Exception as e:
         print(f"\nCRITICAL ERROR fetching data: {e}")
         return
 
+    if args.profile:
+        print(f"    Monday API: {client.stats.summary()}")
+        print_profile("load")
+
     # 3. Initialize Analyzer
-    analyzer = Analyzer(deals_df, wo_df)
+    analyzer_version, frames = board_frames.snapshot()
+    analyzer = analyzers.get(analyzer_version, frames)
+    # Answers are reused until the analyzer picks up a newer data version
+    query_cache = create_query_cache()
+
+    router = create_router(analyzer)
     
-    print("\n" + "="*50)
-    print(" AGENT READY ")
-    print("="*50)
-    print("You can ask questions like:")
-    print(" - 'How is the pipeline looking?'")
-    print(" - 'Show me operational status'")
-    print(" - 'Give me a leadership update'")
-    print(" - 'exit' to quit")
-    print("-" * 50)
+    print_banner()
 
     # 4. Main Interaction Loop
     while True:
         try:
-            user_input = input("\nQuery > ").strip().lower()
+            query = input("\nQuery > ").strip()
+            user_input = query.lower()
             
             if user_input in ['exit', 'quit', 'q']:
                 print("Goodbye!")
@@ -79,22 +166,31 @@ def main():
                 
             if not user_input:
                 continue
+
+            # Each query's profile only covers its own work
+            if args.profile:
+                tracer.reset()
+
+            # Pick up frames published by a background refresh; unchanged
+            # frames keep their precomputed aggregates
+            analyzer_version, frames = board_frames.snapshot()
+            analyzer = analyzers.get(analyzer_version, frames)
                 
-            # Simple keyword matching for routing queries
-            if 'update' in user_input or 'summary' in user_input or 'report' in user_input:
-                print("\nGenerating Leadership Update...\n")
-                print(analyzer.generate_leadership_update())
-                
-            elif 'pipeline' in user_input or 'sales' in user_input or 'deal' in user_input:
-                print("\nAnalyzing Pipeline...\n")
-                print(analyzer.get_pipeline_benth())
-                
-            elif 'operation' in user_input or 'work' in user_input or 'order' in user_input or 'status' in user_input:
-                print("\nAnalyzing Operations...\n")
-                print(analyzer.get_operational_status())
-                
+            route = router.route(query)
+            if route is None:
+                print(FALLBACK_ANSWER)
+            elif report is not None and route.intent == 'leadership_update' and not route.params:
+                # The prerendered update, with its changes since the last one
+                print(f"\n{route.title}\n")
+                print(report.current()['text'])
             else:
-                print("I'm not sure how to answer that yet. Try asking about 'pipeline', 'operations', or 'update'.")
+                print(f"\n{route.title}\n")
+                print(query_cache.get_or_compute(route.intent, route.params, analyzer_version,
+                                                 lambda: route.run(analyzer)))
+
+            if args.profile:
+                print_profile(user_input)
+                print(f"query cache: {query_cache.stats()}")
                 
         except KeyboardInterrupt:
             print("\nGoodbye!")
@@ -102,5 +198,7 @@ def main():
         except Exception as e:
             print(f"An error occurred during analysis: {e}")
 
+    tracer.export()
+
 if __name__ == "__main__":
     main()
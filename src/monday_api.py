@@ -1,132 +1,766 @@
 import requests
 import os
 import json
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from src.tracing import tracer
 
 load_dotenv()
 
-class MondayClient:
-    def __init__(self):
-        self.api_key = os.getenv("MONDAY_API_KEY")
-        self.api_url = "https://api.monday.com/v2"
+DEFAULT_API_URL = "https://api.monday.com/v2"
+
+# Status codes worth another attempt: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Monday rejects single queries costing more complexity points than this
+MAX_QUERY_COMPLEXITY = 5_000_000
+
+# Boards (or pages) asked for in one batched query at most
+DEFAULT_BATCH_BOARDS = 10
+
+# Complexity budget errors carry their reset window either in the extensions
+# (newer API versions) or only in the message text (2023-10)
+COMPLEXITY_RESET_RE = re.compile(r"reset in (\d+) seconds?", re.IGNORECASE)
+
+
+ITEM_FIELDS = """
+    id
+    name
+    updated_at
+    column_values {
+        id
+        text
+        value
+        type
+    }
+"""
+
+
+# Projected items: only the requested column IDs, and only the cell
+# fields normalization reads (no JSON value)
+PROJECTED_ITEM_FIELDS = """
+    id
+    name
+    updated_at
+    column_values (ids: $column_ids) {
+        id
+        text
+        type
+    }
+"""
+
+# Item fields when no column is needed at all
+BARE_ITEM_FIELDS = """
+    id
+    name
+    updated_at
+"""
+
+
+def build_items_query(item_fields=ITEM_FIELDS, cursor=False, query_params=False, column_ids=False):
+    """
+    Builds the items_page query for one board. The first page may carry
+    query_params filters; later pages only need the cursor. column_ids
+    declares the $column_ids variable used by PROJECTED_ITEM_FIELDS.
+    """
+    arguments = ["limit: 500"]
+    declarations = ["$board_id: [ID!]"]
+    if column_ids:
+        declarations.append("$column_ids: [String!]")
+    if cursor:
+        arguments.insert(0, "cursor: $cursor")
+        declarations.append("$cursor: String")
+    elif query_params:
+        arguments.insert(0, "query_params: $query_params")
+        declarations.append("$query_params: ItemsQuery")
+
+    return f"""
+    query ({', '.join(declarations)}) {{
+        complexity {{
+            query
+            after
+        }}
+        boards (ids: $board_id) {{
+            items_page ({', '.join(arguments)}) {{
+                cursor
+                items {{
+                    {item_fields.strip()}
+                }}
+            }}
+        }}
+    }}
+    """
+
+
+def item_fields_for(column_ids):
+    """
+    Item fields for all columns (None), only column_ids, or no column at all ([]).
+    """
+    if column_ids is None:
+        return ITEM_FIELDS
+    return PROJECTED_ITEM_FIELDS if column_ids else BARE_ITEM_FIELDS
+
+
+class BoardRequest:
+    """
+    What a batched query asks about one board: its schema, its
+    items_count and/or its items (only those updated after updated_since,
+    only the column_ids columns).
+    """
+    def __init__(self, board_id, schema=True, items=True, items_count=False, updated_since=None, column_ids=None):
+        self.board_id = board_id
+        self.schema = schema
+        self.items = items
+        self.items_count = items_count
+        self.updated_since = updated_since
+        self.column_ids = column_ids
+
+
+def _page_fields(column_ids, index):
+    # Projected fields declare their own column list per alias
+    fields = item_fields_for(column_ids).strip()
+    return fields.replace("$column_ids", f"$columns_{index}") if column_ids else fields
+
+
+def build_boards_query(board_requests):
+    """
+    Builds one query asking several boards at once, each under its own
+    alias (b0, b1, ...) with its own variables. Returns (query, variables).
+    """
+    declarations = []
+    aliases = []
+    variables = {}
+    for index, request in enumerate(board_requests):
+        declarations.append(f"$board_{index}: [ID!]")
+        variables[f"board_{index}"] = [request.board_id]
+        fields = ["id"]
+        if request.items_count:
+            fields.append("items_count")
+        if request.schema:
+            fields.append("columns { id title type }")
+        if request.items:
+            arguments = ["limit: 500"]
+            query_params = MondayClient._updated_since_params(request.updated_since)
+            if query_params:
+                arguments.insert(0, f"query_params: $params_{index}")
+                declarations.append(f"$params_{index}: ItemsQuery")
+                variables[f"params_{index}"] = query_params
+            if request.column_ids:
+                declarations.append(f"$columns_{index}: [String!]")
+                variables[f"columns_{index}"] = list(request.column_ids)
+            fields.append(f"items_page ({', '.join(arguments)}) {{ cursor items {{ "
+                          f"{_page_fields(request.column_ids, index)} }} }}")
+        aliases.append(f"b{index}: boards (ids: $board_{index}) {{ {' '.join(fields)} }}")
+
+    query = f"query ({', '.join(declarations)}) {{ complexity {{ query after }} {' '.join(aliases)} }}"
+    return query, variables
+
+
+def build_next_pages_query(cursors):
+    """
+    Builds one query following several items_page cursors with aliased
+    next_items_page calls (p0, p1, ...). cursors is a list of
+    (cursor, column_ids). Returns (query, variables).
+    """
+    declarations = []
+    aliases = []
+    variables = {}
+    for index, (cursor, column_ids) in enumerate(cursors):
+        declarations.append(f"$cursor_{index}: String!")
+        variables[f"cursor_{index}"] = cursor
+        if column_ids:
+            declarations.append(f"$columns_{index}: [String!]")
+            variables[f"columns_{index}"] = list(column_ids)
+        aliases.append(f"p{index}: next_items_page (limit: 500, cursor: $cursor_{index}) {{ cursor items {{ "
+                       f"{_page_fields(column_ids, index)} }} }}")
+
+    query = f"query ({', '.join(declarations)}) {{ complexity {{ query after }} {' '.join(aliases)} }}"
+    return query, variables
+
+
+def build_page_request(board_id, item_fields, cursor=None, query_params=None, column_ids=None):
+    """
+    (query, variables) asking for one items page of a board: the first one
+    (filtered by query_params) or the one cursor points to.
+    """
+    query = build_items_query(item_fields, cursor=bool(cursor), query_params=bool(query_params) and not cursor,
+                              column_ids=column_ids is not None)
+    variables = {"board_id": [board_id]}
+    if column_ids is not None:
+        variables["column_ids"] = column_ids
+    if cursor:
+        variables["cursor"] = cursor
+    elif query_params:
+        variables["query_params"] = query_params
+    return query, variables
+
+
+def items_page_of(response):
+    """
+    The items_page of a single-board items query ({'cursor', 'items'}),
+    counted in the tracer, or None when the board can't be read.
+    """
+    try:
+        boards = response["data"]["boards"]
+        if not boards:
+            return None
+        items_page = boards[0]["items_page"]
+        tracer.count("monday.pages")
+        tracer.count("monday.items", len(items_page["items"]))
+        return items_page
+    except (KeyError, IndexError, TypeError) as e:
+        print(f"Error parsing response: {e}")
+        return None
+
+
+ITEMS_BY_ID_QUERY = f"""
+query ($item_ids: [ID!]) {{
+    items (ids: $item_ids) {{
+        {ITEM_FIELDS.strip()}
+    }}
+}}
+"""
+
+ITEMS_COUNT_QUERY = """
+query ($board_id: [ID!]) {
+    boards (ids: $board_id) {
+        items_count
+    }
+}
+"""
+
+BOARD_COLUMNS_QUERY = """
+query ($board_id: [ID!]) {
+    boards (ids: $board_id) {
+        columns {
+            id
+            title
+            type
+        }
+    }
+}
+"""
+
+
+def parse_items(response):
+    try:
+        return list(response["data"]["items"])
+    except (KeyError, TypeError) as e:
+        print(f"Error parsing items response: {e}")
+        return []
+
+
+def parse_items_count(response):
+    try:
+        return response["data"]["boards"][0]["items_count"]
+    except (KeyError, IndexError, TypeError) as e:
+        print(f"Error parsing items count response: {e}")
+        return None
+
+
+def parse_board_columns(response):
+    try:
+        return list(response["data"]["boards"][0]["columns"])
+    except (KeyError, IndexError, TypeError) as e:
+        print(f"Error parsing columns response: {e}")
+        return []
+
+
+def prefetch_pages(pages):
+    """
+    Runs a page generator one page ahead on a helper thread, so the next
+    request overlaps with whatever the consumer does with the current page.
+    At most one page waits in the hand-off queue. Errors are re-raised in
+    the consumer.
+    """
+    handoff = queue.Queue(maxsize=1)
+    stop = threading.Event()
+    done = object()
+
+    def offer(entry):
+        while not stop.is_set():
+            try:
+                handoff.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for page in pages:
+                if not offer((page, None)):
+                    return
+            offer((done, None))
+        except Exception as e:
+            offer((done, e))
+
+    producer = threading.Thread(target=produce, name="monday-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            page, error = handoff.get()
+            if page is done:
+                if error is not None:
+                    raise error
+                return
+            yield page
+    finally:
+        # Unblocks the producer if the consumer stops early
+        stop.set()
+
+
+class RequestStats:
+    """
+    Per-client transport counters: request count, retries, failures,
+    latencies of individual HTTP attempts and the last complexity reading.
+    """
+    def __init__(self, max_samples=1000):
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.bytes_received = 0
+        self.latencies = deque(maxlen=max_samples)
+        self.last_complexity = None
+
+    def record(self, latency, size=0):
+        self.requests += 1
+        self.bytes_received += size
+        self.latencies.append(latency)
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+
+        def percentile(p):
+            if not count:
+                return 0.0
+            return latencies[min(count - 1, int(round(p * (count - 1))))]
+
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "bytes_received": self.bytes_received,
+            "latency_total": sum(latencies),
+            "latency_mean": sum(latencies) / count if count else 0.0,
+            "latency_p50": percentile(0.50),
+            "latency_p95": percentile(0.95),
+            "latency_max": latencies[-1] if count else 0.0,
+            "last_complexity": self.last_complexity,
+        }
+
+
+class BoardBatch:
+    """
+    Schemas, item counts and items of several boards, fetched with aliased
+    multi-board queries instead of separate requests per board and page.
+
+    pages() first asks up to max_boards boards per request for everything
+    their BoardRequest wants, first items page included, then follows the
+    open cursors of all boards together with next_items_page. How many
+    pages go into one request is set from the complexity the pages so far
+    cost: within Monday's per-query limit and whatever the client's
+    ComplexityBudget has left. schemas and items_counts fill in as the
+    responses arrive, before the board's pages are yielded.
+    """
+    def __init__(self, client, board_requests, max_boards=DEFAULT_BATCH_BOARDS):
+        self.client = client
+        self.board_requests = list(board_requests)
+        self.max_boards = max_boards
+        self.schemas = {}
+        self.items_counts = {}
+        self.requests_sent = 0
+        self._page_cost = None
+
+    def _pages_per_request(self):
+        if not self._page_cost:
+            return self.max_boards
+        limit = MAX_QUERY_COMPLEXITY
+        budget = self.client.budget
+        if budget is not None:
+            limit = min(limit, max(budget.tokens, self._page_cost))
+        return max(1, min(self.max_boards, int(limit // self._page_cost)))
+
+    def _execute(self, query, variables, pages):
+        response = self.client.execute_query(query, variables)
+        self.requests_sent += 1
+        data = response.get("data") or {}
+        cost = (data.get("complexity") or {}).get("query")
+        if pages and isinstance(cost, (int, float)):
+            # The priciest page seen so far, so batches stay under the limit
+            self._page_cost = max(self._page_cost or 0, cost / pages)
+        return data
+
+    def _page(self, board_id, column_ids, page, cursors):
+        items = page.get("items") or []
+        tracer.count("monday.pages")
+        tracer.count("monday.items", len(items))
+        if page.get("cursor"):
+            cursors.append((board_id, column_ids, page["cursor"]))
+        return board_id, items
+
+    def pages(self):
+        """
+        Yields (board_id, items) for every page of every board, boards interleaved.
+        """
+        cursors = []
+        pending = list(self.board_requests)
+        while pending:
+            size = self._pages_per_request()
+            chunk, pending = pending[:size], pending[size:]
+            query, variables = build_boards_query(chunk)
+            data = self._execute(query, variables, sum(1 for request in chunk if request.items))
+            for index, request in enumerate(chunk):
+                boards = data.get(f"b{index}") or []
+                if not boards:
+                    continue
+                if request.schema:
+                    self.schemas[request.board_id] = list(boards[0].get("columns") or [])
+                if request.items_count:
+                    self.items_counts[request.board_id] = boards[0].get("items_count")
+                if request.items:
+                    yield self._page(request.board_id, request.column_ids, boards[0].get("items_page") or {}, cursors)
+
+        while cursors:
+            size = self._pages_per_request()
+            chunk, cursors = cursors[:size], cursors[size:]
+            query, variables = build_next_pages_query([(cursor, column_ids) for _, column_ids, cursor in chunk])
+            data = self._execute(query, variables, len(chunk))
+            for index, (board_id, column_ids, _) in enumerate(chunk):
+                yield self._page(board_id, column_ids, data.get(f"p{index}") or {}, cursors)
+
+
+class ComplexityBudget:
+    """
+    Token bucket of Monday complexity points, refilled at points_per_minute.
+
+    Requests wait while the bucket is empty and are charged the complexity
+    Monday reports for them afterwards, so the spend stays within budget
+    over any minute give or take the requests already in flight. When
+    Monday reports fewer points left on the account than the bucket holds
+    (other clients share it), the bucket drops to that.
+    """
+    def __init__(self, points_per_minute):
+        self.points_per_minute = points_per_minute
+        self.tokens = float(points_per_minute)
+        self.waited = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.points_per_minute, self.tokens + (now - self._updated) * self.points_per_minute / 60)
+        self._updated = now
+
+    def delay(self):
+        """
+        Seconds until the bucket holds points again, 0 if it does now.
+        """
+        with self._lock:
+            self._refill()
+            if self.tokens > 0:
+                return 0.0
+            return -self.tokens * 60 / self.points_per_minute + 0.01
+
+    def wait(self):
+        while True:
+            delay = self.delay()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+            self.waited += delay
+
+    def spend(self, points, remaining=None):
+        with self._lock:
+            self._refill()
+            self.tokens -= points
+            if remaining is not None:
+                self.tokens = min(self.tokens, remaining)
+
+
+def batch_queries_enabled(client):
+    """
+    Whether client can batch multi-board queries and MONDAY_BATCH_QUERIES isn't off.
+    """
+    if not hasattr(client, "batch_boards"):
+        return False
+    return os.getenv("MONDAY_BATCH_QUERIES", "on").lower() not in ("off", "0", "false")
+
+
+class BaseMondayClient:
+    """
+    Configuration, retry policy and response handling shared by
+    MondayClient and AsyncMondayClient, which only differ in how requests
+    are sent and waited for.
+    """
+    def __init__(self, api_key=None, api_url=None, timeout=None, max_retries=None,
+                 backoff_base=1.0, backoff_max=60.0, pool_size=10, budget=None):
+        self.api_key = api_key or os.getenv("MONDAY_API_KEY")
+        self.api_url = api_url or os.getenv("MONDAY_API_URL", DEFAULT_API_URL)
         self.headers = {
             "Authorization": self.api_key,
             "API-Version": "2023-10"
         }
+        # (connect, read) timeout in seconds
+        self.timeout = timeout or (
+            float(os.getenv("MONDAY_CONNECT_TIMEOUT", "10")),
+            float(os.getenv("MONDAY_READ_TIMEOUT", "60")),
+        )
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("MONDAY_MAX_RETRIES", "5"))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self.stats = RequestStats()
+        # Optional ComplexityBudget, shared by every client of one account in this process
+        self.budget = budget
 
-    def execute_query(self, query, variables=None):
+    def _check_api_key(self):
         if not self.api_key:
             raise ValueError("Monday API Key not found. Please set MONDAY_API_KEY in .env file.")
 
+    def _backoff_delay(self, attempt, retry_after=None):
+        """
+        Exponential backoff with full jitter. A server-provided wait
+        (Retry-After or complexity reset) is used as the lower bound.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _retry_delay(self, attempt, error, retry_after=None):
+        """
+        Seconds to wait before attempt + 1, or raises error once the retries are used up.
+        """
+        if attempt >= self.max_retries:
+            self.stats.failures += 1
+            raise Exception(error)
+        self.stats.retries += 1
+        return self._backoff_delay(attempt, retry_after)
+
+    @staticmethod
+    def _retry_after_header(headers):
+        value = headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _complexity_retry_after(errors):
+        """
+        Returns the seconds to wait if the GraphQL errors include a
+        complexity budget exhaustion, otherwise None.
+        """
+        for error in errors or []:
+            if not isinstance(error, dict):
+                continue
+            extensions = error.get("extensions") or {}
+            code = str(extensions.get("code", ""))
+            message = str(error.get("message", ""))
+            if "complexity" not in code.lower() and "complexity" not in message.lower():
+                continue
+            if "retry_in_seconds" in extensions:
+                return float(extensions["retry_in_seconds"])
+            match = COMPLEXITY_RESET_RE.search(message)
+            return float(match.group(1)) if match else 0.0
+        return None
+
+    def _check_response(self, status_code, headers, size, text, decode, span, attempt):
+        """
+        Handles one HTTP response to a query. Returns (json_response, None,
+        None) on success and (None, error, retry_after) when the request is
+        worth another attempt; raises on any other error. text and decode
+        are called for the body only when it is needed.
+        """
+        span.set(bytes=span.attrs.get("bytes", 0) + size, retries=attempt)
+
+        if status_code in RETRYABLE_STATUS_CODES:
+            return None, f"Monday API Error: {text()}", self._retry_after_header(headers)
+        if status_code != 200:
+            self.stats.failures += 1
+            raise Exception(f"Monday API Error: {text()}")
+
+        with tracer.span("monday.decode_json"):
+            json_response = decode()
+        errors = json_response.get("errors")
+        if errors:
+            retry_after = self._complexity_retry_after(errors)
+            if retry_after is None:
+                self.stats.failures += 1
+                raise Exception(f"GraphQL Errors: {errors}")
+            return None, f"GraphQL Errors: {errors}", retry_after
+
+        complexity = (json_response.get("data") or {}).get("complexity")
+        if complexity:
+            self.stats.last_complexity = complexity
+            if isinstance(complexity.get("query"), (int, float)):
+                span.set(complexity=complexity["query"])
+                if self.budget is not None:
+                    self.budget.spend(complexity["query"], complexity.get("after"))
+        return json_response, None, None
+
+    @staticmethod
+    def _updated_since_params(updated_since):
+        if updated_since is None:
+            return None
+        return {
+            "rules": [{
+                "column_id": "__last_updated__",
+                "compare_value": ["EXACT", updated_since.strftime("%Y-%m-%dT%H:%M:%SZ")],
+                "compare_attribute": "UPDATED_AT",
+                "operator": "greater_than",
+            }]
+        }
+
+
+class MondayClient(BaseMondayClient):
+    def __init__(self, api_key=None, api_url=None, timeout=None, max_retries=None,
+                 backoff_base=1.0, backoff_max=60.0, pool_size=10, budget=None):
+        super().__init__(api_key, api_url, timeout, max_retries, backoff_base, backoff_max, pool_size, budget)
+
+        # One keep-alive session per client so pages reuse the same TCP/TLS connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(self.headers)
+
+    def close(self):
+        self.session.close()
+
+    def execute_query(self, query, variables=None):
+        self._check_api_key()
+        with tracer.span("monday.execute_query") as span:
+            return self._execute_query(query, variables, span)
+
+    def _execute_query(self, query, variables, span):
         data = {"query": query, "variables": variables}
-        response = requests.post(self.api_url, json=data, headers=self.headers)
-        
-        if response.status_code != 200:
-            raise Exception(f"Monday API Error: {response.text}")
-            
-        json_response = response.json()
-        
-        if "errors" in json_response:
-             raise Exception(f"GraphQL Errors: {json_response['errors']}")
-             
-        return json_response
-
-    def get_board_items(self, board_id):
+        attempt = 0
+
+        while True:
+            retry_after = None
+            if self.budget is not None:
+                self.budget.wait()
+            start = time.perf_counter()
+            try:
+                with tracer.span("monday.http"):
+                    response = self.session.post(self.api_url, json=data, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.stats.record(time.perf_counter() - start)
+                error = f"Monday API Error: {e}"
+            else:
+                self.stats.record(time.perf_counter() - start, len(response.content))
+                json_response, error, retry_after = self._check_response(
+                    response.status_code, response.headers, len(response.content), lambda: response.text,
+                    response.json, span, attempt)
+                if json_response is not None:
+                    return json_response
+
+            time.sleep(self._retry_delay(attempt, error, retry_after))
+            attempt += 1
+
+    def _paginate_items(self, board_id, item_fields, query_params=None, column_ids=None):
         """
-        Fetches all items from a board using cursor-based pagination.
+        Yields the items of every page of a board, following the cursor.
         """
-        all_items = []
         cursor = None
-        
+
         while True:
-            if cursor:
-                query = """
-                query ($board_id: [ID!], $cursor: String) {
-                    boards (ids: $board_id) {
-                        items_page (cursor: $cursor, limit: 500) {
-                            cursor
-                            items {
-                                id
-                                name
-                                column_values {
-                                    id
-                                    text
-                                    value
-                                    type
-                                }
-                            }
-                        }
-                    }
-                }
-                """
-                variables = {"board_id": [board_id], "cursor": cursor}
-            else:
-                query = """
-                query ($board_id: [ID!]) {
-                    boards (ids: $board_id) {
-                        items_page (limit: 500) {
-                            cursor
-                            items {
-                                id
-                                name
-                                column_values {
-                                    id
-                                    text
-                                    value
-                                    type
-                                }
-                            }
-                        }
-                    }
-                }
-                """
-                variables = {"board_id": [board_id]}
-
-            response = self.execute_query(query, variables)
-            
-            # Navigate the nested response structure safely
-            try:
-                boards = response["data"]["boards"]
-                if not boards:
-                    break
-                
-                items_page = boards[0]["items_page"]
-                all_items.extend(items_page["items"])
-                cursor = items_page["cursor"]
-                
-                if not cursor:
-                    break
-            except (KeyError, IndexError, TypeError) as e:
-                print(f"Error parsing response: {e}")
+            response = self.execute_query(*build_page_request(board_id, item_fields, cursor, query_params, column_ids))
+            items_page = items_page_of(response)
+            if items_page is None:
                 break
-                
+            yield items_page["items"]
+            cursor = items_page["cursor"]
+            if not cursor:
+                break
+
+    def iter_board_pages(self, board_id, updated_since=None, prefetch=True, column_ids=None):
+        """
+        Yields the items of a board one items_page (up to 500 items) at a time.
+        If updated_since (a UTC datetime) is given, only items updated after it are returned.
+        If column_ids is given, only those columns are fetched, without their JSON value.
+
+        With prefetch the request for the next page is already in flight
+        while the caller processes the current one.
+        """
+        query_params = self._updated_since_params(updated_since)
+        pages = self._paginate_items(board_id, item_fields_for(column_ids), query_params,
+                                     list(column_ids) if column_ids else None)
+        return prefetch_pages(pages) if prefetch else pages
+
+    def batch_boards(self, board_requests, max_boards=None):
+        """
+        A BoardBatch fetching what the BoardRequests ask for with as few
+        requests as the complexity limits allow. Nothing is sent until its
+        pages() are read.
+        """
+        if max_boards is None:
+            max_boards = int(os.getenv("MONDAY_BATCH_BOARDS", DEFAULT_BATCH_BOARDS))
+        return BoardBatch(self, board_requests, max_boards)
+
+    def get_board_schemas(self, board_ids):
+        """
+        Column definitions of several boards from batched queries:
+        {board_id: [{'id', 'title', 'type'}]}, leaving out boards that can't be read.
+        """
+        batch = self.batch_boards([BoardRequest(board_id, items=False) for board_id in board_ids])
+        for _ in batch.pages():
+            pass
+        return batch.schemas
+
+    def get_board_items(self, board_id, updated_since=None, column_ids=None):
+        """
+        Fetches all items from a board using cursor-based pagination.
+        If updated_since (a UTC datetime) is given, only items updated after it are returned.
+        """
+        all_items = []
+        for items in self.iter_board_pages(board_id, updated_since, prefetch=False, column_ids=column_ids):
+            all_items.extend(items)
         return all_items
 
+    def get_items(self, item_ids):
+        """
+        Fetches specific items by ID, with all their column values.
+        """
+        return parse_items(self.execute_query(ITEMS_BY_ID_QUERY, {"item_ids": list(item_ids)}))
+
+    def get_board_item_ids(self, board_id):
+        """
+        Fetches only the IDs of all items on a board. Used to reconcile
+        deletions without downloading column values.
+        """
+        item_ids = []
+        for items in self._paginate_items(board_id, "id"):
+            item_ids.extend(item["id"] for item in items)
+        return item_ids
+
+    def get_board_items_count(self, board_id):
+        """
+        Returns the number of items on a board, or None if it cannot be read.
+        """
+        return parse_items_count(self.execute_query(ITEMS_COUNT_QUERY, {"board_id": [board_id]}))
+
+    def get_board_schema(self, board_id):
+        """
+        Fetches column definitions for a board.
+        Returns a list of {'id', 'title', 'type'} dicts in board order.
+        """
+        return parse_board_columns(self.execute_query(BOARD_COLUMNS_QUERY, {"board_id": [board_id]}))
+
     def get_board_columns(self, board_id):
         """
         Fetches column definitions for a board.
         Returns a dictionary mapping column ID to column Title.
         """
-        query = """
-        query ($board_id: [ID!]) {
-            boards (ids: $board_id) {
-                columns {
-                    id
-                    title
-                    type
-                }
-            }
-        }
-        """
-        variables = {"board_id": [board_id]}
-        response = self.execute_query(query, variables)
-        
-        columns_map = {}
-        try:
-            columns = response["data"]["boards"][0]["columns"]
-            for col in columns:
-                columns_map[col["id"]] = col["title"]
-        except (KeyError, IndexError, TypeError) as e:
-            print(f"Error parsing columns response: {e}")
-            
-        return columns_map
+        return {col["id"]: col["title"] for col in self.get_board_schema(board_id)}
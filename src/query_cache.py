@@ -0,0 +1,83 @@
+import os
+import threading
+from collections import OrderedDict
+from src.tracing import tracer
+
+DEFAULT_QUERY_CACHE_SIZE = 128
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of agent answers, keyed by the resolved intent, its
+    parameters and the version of the data the answer was computed from.
+
+    Versions only move forward: the first lookup with a newer version
+    drops every entry of the older ones, and answers computed from data
+    older than the current version are returned but not stored. Thread
+    safe, so one instance can serve every session of a server.
+    """
+    def __init__(self, max_entries=DEFAULT_QUERY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(intent, params, version):
+        return intent, tuple(sorted((params or {}).items())), version
+
+    def _advance(self, version):
+        if self.version is None or version > self.version:
+            self._entries.clear()
+            self.version = version
+
+    def get_or_compute(self, intent, params, version, compute):
+        """
+        Returns the cached answer for (intent, params) at version, or
+        compute() stored under that key.
+        """
+        key = self._key(intent, params, version)
+        with self._lock:
+            self._advance(version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                tracer.count("query_cache.hits")
+                return self._entries[key]
+            self.misses += 1
+            tracer.count("query_cache.misses")
+
+        # Computed outside the lock so other questions aren't held up
+        value = compute()
+        with self._lock:
+            if version == self.version and self.max_entries > 0:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def create_query_cache():
+    """
+    Returns a QueryCache holding up to MONDAY_QUERY_CACHE_SIZE answers
+    (default 128, 0 to store none).
+    """
+    return QueryCache(int(os.getenv("MONDAY_QUERY_CACHE_SIZE", DEFAULT_QUERY_CACHE_SIZE)))
@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+
+DEFAULT_REFRESH_INTERVAL = 300
+
+
+class AutoRefresher:
+    """
+    Keeps a BoardFrames fresh from one background thread per process.
+
+    Every interval seconds (counted from when the published data was
+    fetched, so a stale warm cache is refreshed right away) the boards are
+    re-synced and the new frames are swapped in by BoardFrames. Readers
+    keep getting the last good frames meanwhile, and a failed refresh
+    leaves them in place until the next attempt. trigger() asks for a
+    refresh now without waiting for it.
+    """
+    def __init__(self, board_frames, interval=DEFAULT_REFRESH_INTERVAL):
+        self.board_frames = board_frames
+        self.interval = interval
+        self.next_refresh_at = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="monday-auto-refresh", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def trigger(self):
+        self._wake.set()
+
+    def _delay(self):
+        age = self.board_frames.age
+        if age is None:
+            return self.interval
+        return max(0.0, self.interval - age)
+
+    def _run(self):
+        while not self._stop.is_set():
+            delay = self._delay()
+            self.next_refresh_at = time.time() + delay
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+
+            try:
+                self.board_frames.refresh()
+            except Exception as e:
+                # Keep serving the last good frames; the next run tries again
+                self.board_frames.error = str(e)
+                print(f"Scheduled refresh failed, serving the last good data: {e}")
+                # Don't retry in a tight loop when the data is already old
+                self._wake.wait(min(self.interval, 60))
+                self._wake.clear()
+
+
+def create_refresher(board_frames):
+    """
+    Returns a started AutoRefresher re-syncing every MONDAY_REFRESH_INTERVAL
+    seconds (default 300), or None when the interval is 0.
+    """
+    interval = float(os.getenv("MONDAY_REFRESH_INTERVAL", DEFAULT_REFRESH_INTERVAL))
+    if interval <= 0:
+        return None
+    return AutoRefresher(board_frames, interval).start()
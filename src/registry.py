@@ -0,0 +1,127 @@
+import json
+import os
+from src.fetcher import load_board_config
+
+DEFAULT_TENANT = "default"
+
+
+class Tenant:
+    """
+    One Monday.com account: where its API key comes from and the share of
+    its rate limits ingestion may use. complexity_per_minute caps the
+    query complexity points spent per minute across all of the tenant's
+    workers (None for no cap); max_concurrency caps its in-flight requests.
+    """
+    def __init__(self, name, api_key_env="MONDAY_API_KEY", api_url=None, complexity_per_minute=None,
+                 max_concurrency=None):
+        self.name = name
+        self.api_key_env = api_key_env
+        self.api_url = api_url
+        self.complexity_per_minute = complexity_per_minute
+        self.max_concurrency = max_concurrency
+
+    @property
+    def api_key(self):
+        return os.getenv(self.api_key_env)
+
+    def __repr__(self):
+        return f"Tenant({self.name!r})"
+
+
+class BoardSpec:
+    """
+    A registered board: its ID, the role its items play in the analytics,
+    the tenant it belongs to and the label its rows carry in the source
+    column of the role frame.
+    """
+    def __init__(self, board_id, role, tenant=DEFAULT_TENANT, source=None):
+        self.board_id = board_id
+        self.role = role
+        self.tenant = tenant
+        self.source = source or f"{tenant}:{board_id}"
+
+    def __repr__(self):
+        return f"BoardSpec({self.board_id!r}, {self.role!r}, tenant={self.tenant!r})"
+
+
+class BoardRegistry:
+    """
+    The boards to ingest, mapped to roles and tenants.
+
+    boards gives the (role, board_id) pairs the rest of the app works with,
+    so boards of every region and account sharing a role end up in one
+    frame; sources() tells their rows apart. path is the file it was read
+    from, if any.
+    """
+    def __init__(self, specs, tenants=None, path=None):
+        self.specs = list(specs)
+        self.path = path
+        self.tenants = dict(tenants or {})
+        for spec in self.specs:
+            if spec.tenant not in self.tenants:
+                if spec.tenant != DEFAULT_TENANT:
+                    raise ValueError(f"Board {spec.board_id} names unknown tenant '{spec.tenant}'")
+                self.tenants[DEFAULT_TENANT] = Tenant(DEFAULT_TENANT)
+
+    @property
+    def boards(self):
+        return [(spec.role, spec.board_id) for spec in self.specs]
+
+    @property
+    def multi_tenant(self):
+        return len(self.by_tenant()) > 1
+
+    def by_tenant(self):
+        """
+        {tenant name: [BoardSpec]}, in registry order.
+        """
+        groups = {}
+        for spec in self.specs:
+            groups.setdefault(spec.tenant, []).append(spec)
+        return groups
+
+    def sources(self):
+        return {spec.board_id: spec.source for spec in self.specs}
+
+
+def load_registry(path):
+    """
+    Reads a registry file:
+
+        {"tenants": {"emea": {"api_key_env": "MONDAY_API_KEY_EMEA",
+                              "complexity_per_minute": 2000000, "max_concurrency": 4}},
+         "boards": [{"id": 123, "role": "deals", "tenant": "emea", "source": "EMEA"}]}
+
+    Boards without a tenant belong to the default one, which reads
+    MONDAY_API_KEY unless the file defines it.
+    """
+    with open(path) as f:
+        config = json.load(f)
+
+    tenants = {}
+    for name, options in (config.get("tenants") or {}).items():
+        options = dict(options)
+        unknown = set(options) - {"api_key_env", "api_url", "complexity_per_minute", "max_concurrency"}
+        if unknown:
+            raise ValueError(f"Unknown option(s) {sorted(unknown)} for tenant '{name}'")
+        tenants[name] = Tenant(name, **options)
+
+    specs = []
+    for entry in config.get("boards") or []:
+        if "id" not in entry or "role" not in entry:
+            raise ValueError(f"Invalid registry board {entry}, expected an id and a role")
+        specs.append(BoardSpec(int(entry["id"]), entry["role"], entry.get("tenant", DEFAULT_TENANT),
+                               entry.get("source")))
+    return BoardRegistry(specs, tenants, path)
+
+
+def create_registry():
+    """
+    Returns the registry in the file MONDAY_BOARD_REGISTRY points to, or
+    one built from MONDAY_BOARDS / the legacy board variables, all on the
+    default tenant.
+    """
+    path = os.getenv("MONDAY_BOARD_REGISTRY")
+    if path:
+        return load_registry(path)
+    return BoardRegistry([BoardSpec(board_id, role) for role, board_id in load_board_config()])
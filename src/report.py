@@ -0,0 +1,483 @@
+import hashlib
+import html
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from src.analyzer import AnalyzerVersions
+from src.cache import list_columns
+from src.tracing import tracer
+
+DEFAULT_REPORT_DIR = ".monday_reports"
+DEFAULT_REPORT_POLL = 5.0
+REPORT_NAME = "leadership"
+# Bumped when stored snapshots change shape; older ones are not reused
+REPORT_FORMAT = 1
+ARTIFACTS = {"md": "text/markdown; charset=utf-8", "html": "text/html; charset=utf-8", "json": "application/json"}
+
+
+def frame_fingerprint(df):
+    """
+    Short hash of a frame's columns and values that is the same in every
+    process, so a re-fetched board whose items did not change keeps its
+    report sections, even across restarts.
+    """
+    if df is None:
+        return None
+    digest = hashlib.sha1(json.dumps([str(col) for col in df.columns]).encode())
+    if len(df):
+        values = df
+        lists = list_columns(df)
+        if lists:
+            values = df.assign(**{col: df[col].map(lambda v: tuple(v) if isinstance(v, list) else v)
+                                  for col in lists})
+        digest.update(pd.util.hash_pandas_object(values, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _number(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    return None if value is None or value != value else value
+
+
+def _pipeline(analyzer):
+    metrics = analyzer.pipeline_metrics()
+    figures = []
+    if metrics is not None:
+        figures.append(("Total Deals", metrics['total_deals'], 'count'))
+        if metrics['value_col']:
+            figures.append(("Total Pipeline Value", metrics['total_value'], 'money'))
+            figures.append(("Average Deal Size", metrics['avg_value'], 'money'))
+        if metrics['stage_col']:
+            figures += [(f"Deals: {stage}", count, 'count') for stage, count in metrics['stage_counts'].items()]
+    return analyzer.get_pipeline_benth(), figures
+
+
+def _operations(analyzer):
+    metrics = analyzer.operations_metrics()
+    figures = []
+    if metrics is not None:
+        figures.append(("Total Work Orders", metrics['total'], 'count'))
+        if metrics['status_col']:
+            figures += [(f"Work Orders: {status}", count, 'count') for status, count in metrics['status_counts'].items()]
+    return analyzer.get_operational_status(), figures
+
+
+def _cross_board(analyzer):
+    metrics = analyzer.cross_board_metrics()
+    # Only reported when the boards are linked
+    if metrics is None:
+        return None, []
+    figures = [("Revenue at Risk", metrics['revenue_at_risk'], 'money'),
+               ("Deals with Work Orders", metrics['linked_deals'], 'count')]
+    if metrics['won_deals']:
+        figures.append(("Won Deals with Work Orders", metrics['conversion_rate'], 'percent'))
+        figures.append(("Won Deals Delivered", metrics['delivery_rate'], 'percent'))
+    return analyzer.get_cross_board_status(), figures
+
+
+# Sections of the leadership update, in order: key, heading, the role
+# frames it reads and the function rendering (text, headline figures)
+SECTIONS = (
+    ('pipeline', "SALES & PIPELINE", ('deals',), _pipeline),
+    ('operations', "OPERATIONS & EXECUTION", ('work_orders',), _operations),
+    ('cross_board', "DEALS TO DELIVERY", ('deals', 'work_orders'), _cross_board),
+)
+
+
+def format_figure(value, kind):
+    if value is None:
+        return "n/a"
+    if kind == 'money':
+        return f"${value:,.2f}"
+    if kind == 'percent':
+        return f"{value:.0%}"
+    return f"{value:,}"
+
+
+def format_change(change, kind):
+    sign = "+" if change >= 0 else "-"
+    if kind == 'money':
+        return f"{sign}${abs(change):,.2f}"
+    if kind == 'percent':
+        return f"{sign}{abs(change) * 100:.0f} pts"
+    return f"{sign}{abs(change):,}"
+
+
+def report_deltas(sections, previous_sections):
+    """
+    Headline figures that differ from the previous snapshot's. A stage or
+    status missing on one side counts as zero.
+    """
+    deltas = []
+    for section in sections:
+        before = {figure['label']: figure for figure in previous_sections.get(section['key'], {}).get('figures', [])}
+        after = {figure['label']: figure for figure in section['figures']}
+        for label in list(after) + [label for label in before if label not in after]:
+            kind = (after.get(label) or before[label])['kind']
+            empty = None if kind == 'percent' else 0
+            previous = before[label]['value'] if label in before else empty
+            current = after[label]['value'] if label in after else empty
+            if previous == current:
+                continue
+            change = None if previous is None or current is None else current - previous
+            deltas.append({'section': section['key'], 'label': label, 'kind': kind,
+                           'previous': previous, 'current': current, 'change': change})
+    return deltas
+
+
+def _format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+
+def _delta_line(delta):
+    line = (f"{delta['label']}: {format_figure(delta['previous'], delta['kind'])} -> "
+            f"{format_figure(delta['current'], delta['kind'])}")
+    if delta['change'] is not None:
+        line += f" ({format_change(delta['change'], delta['kind'])})"
+    return line
+
+
+def report_text(sections, deltas, previous_rendered_at):
+    """
+    The plain-text update: the same text generate_leadership_update
+    returns, followed by the changes since the previous snapshot.
+    """
+    summary = ["*** EXECUTIVE LEADERSHIP UPDATE ***\n"]
+    for section in [section for section in sections if section['text'] is not None]:
+        if len(summary) > 1:
+            summary.append("\n" + "-"*30 + "\n")
+        summary.append(section['title'])
+        summary.append(section['text'])
+    if deltas:
+        summary.append("\n" + "-"*30 + "\n")
+        summary.append(f"CHANGES SINCE {_format_time(previous_rendered_at)}")
+        summary += [f"  - {_delta_line(delta)}" for delta in deltas]
+    return "\n".join(summary)
+
+
+def to_markdown(snapshot):
+    lines = ["# Executive Leadership Update", "",
+             f"_Rendered {_format_time(snapshot['rendered_at'])} from data version {snapshot['version']}_"]
+    for section in [section for section in snapshot['sections'] if section['text'] is not None]:
+        lines += ["", f"## {section['title'].capitalize()}", ""]
+        for line in section['text'].split("\n"):
+            # Indented items become list items, other lines keep their breaks
+            lines.append("- " + line[4:] if line.startswith("  - ") else line + "  " if line else line)
+    if snapshot['deltas']:
+        lines += ["", f"## Changes since {_format_time(snapshot['previous_rendered_at'])}", "",
+                  "| Metric | Previous | Current | Change |", "|---|---:|---:|---:|"]
+        for delta in snapshot['deltas']:
+            change = format_change(delta['change'], delta['kind']) if delta['change'] is not None else ""
+            lines.append(f"| {delta['label']} | {format_figure(delta['previous'], delta['kind'])} | "
+                         f"{format_figure(delta['current'], delta['kind'])} | {change} |")
+    lines += ["", "## Render timings", "", "| Section | ms | Rendered |", "|---|---:|---|"]
+    for section in snapshot['sections']:
+        lines.append(f"| {section['key']} | {section['render_ms']:.2f} | {'no, unchanged' if section['reused'] else 'yes'} |")
+    return "\n".join(lines) + "\n"
+
+
+def to_html(snapshot):
+    escape = html.escape
+    parts = ["<!DOCTYPE html>", "<html><head><meta charset=\"utf-8\"><title>Executive Leadership Update</title></head>",
+             "<body>", "<h1>Executive Leadership Update</h1>",
+             f"<p><em>Rendered {_format_time(snapshot['rendered_at'])} from data version {snapshot['version']}</em></p>"]
+    for section in [section for section in snapshot['sections'] if section['text'] is not None]:
+        parts.append(f"<h2>{escape(section['title'].capitalize())}</h2>")
+        parts.append(f"<pre>{escape(section['text'])}</pre>")
+    if snapshot['deltas']:
+        parts.append(f"<h2>Changes since {_format_time(snapshot['previous_rendered_at'])}</h2>")
+        parts.append("<table><tr><th>Metric</th><th>Previous</th><th>Current</th><th>Change</th></tr>")
+        for delta in snapshot['deltas']:
+            change = format_change(delta['change'], delta['kind']) if delta['change'] is not None else ""
+            parts.append(f"<tr><td>{escape(delta['label'])}</td>"
+                         f"<td>{escape(format_figure(delta['previous'], delta['kind']))}</td>"
+                         f"<td>{escape(format_figure(delta['current'], delta['kind']))}</td>"
+                         f"<td>{escape(change)}</td></tr>")
+        parts.append("</table>")
+    parts.append("<h2>Render timings</h2>")
+    parts.append("<table><tr><th>Section</th><th>ms</th><th>Rendered</th></tr>")
+    for section in snapshot['sections']:
+        parts.append(f"<tr><td>{section['key']}</td><td>{section['render_ms']:.2f}</td>"
+                     f"<td>{'no, unchanged' if section['reused'] else 'yes'}</td></tr>")
+    parts += ["</table>", "</body></html>"]
+    return "\n".join(parts) + "\n"
+
+
+class LeadershipReport:
+    """
+    The leadership update, rendered ahead of requests into Markdown, HTML
+    and JSON artifacts in directory.
+
+    render() fingerprints each role frame and only re-renders the
+    sections whose frames changed since the last snapshot; the others are
+    carried over as they were. A new snapshot, with the headline figures
+    that moved since the previous one and the time each section took, is
+    written only when some section changed. current() serves the latest
+    snapshot without touching the data, so it is as fresh as the last
+    render (see ReportScheduler).
+
+    The last snapshot is read back on start, so a restarted process serves
+    it at once and keeps the sections of boards that did not change.
+    Sections are computed by the Analyzer of their data version from
+    analyzers, which the app or service answering questions passes in so
+    both share its aggregates.
+    """
+    def __init__(self, board_frames, directory=DEFAULT_REPORT_DIR, analyzers=None):
+        self.board_frames = board_frames
+        self.directory = directory
+        self.analyzers = analyzers if analyzers is not None else AnalyzerVersions()
+        self.latest = None
+        # Data version the latest snapshot was last checked against; None
+        # for a snapshot read back from disk, whose version is another process's
+        self.version = None
+        self.etag = None
+        self.scheduler = None
+        self._fingerprints = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def path(self, fmt):
+        return os.path.join(self.directory, f"{REPORT_NAME}.{fmt}")
+
+    def _load(self):
+        try:
+            with open(self.path("json")) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+        if snapshot.get('format') == REPORT_FORMAT:
+            self.latest = snapshot
+            self.etag = self._etag(snapshot)
+
+    @staticmethod
+    def _etag(snapshot):
+        payload = json.dumps(snapshot, sort_keys=True).encode()
+        return f'"report-{hashlib.sha1(payload).hexdigest()[:16]}"'
+
+    def _fingerprint(self, role, df):
+        # A frame object that was published before keeps its fingerprint
+        cached = self._fingerprints.get(role)
+        if cached is not None and cached[0] is df:
+            return cached[1]
+        fingerprint = frame_fingerprint(df)
+        self._fingerprints[role] = (df, fingerprint)
+        return fingerprint
+
+    def current(self):
+        """
+        The latest snapshot, rendering the first one if there is none yet.
+        """
+        return self.latest if self.latest is not None else self.render()
+
+    def artifact(self, fmt):
+        """
+        The latest artifact in fmt ('md', 'html' or 'json') as bytes.
+        """
+        self.current()
+        with open(self.path(fmt), "rb") as f:
+            return f.read()
+
+    def render(self):
+        """
+        Renders the sections whose inputs changed and returns the latest snapshot.
+        """
+        with self._lock, tracer.span('report.render') as span:
+            version, frames = self.board_frames.snapshot()
+            frames = frames or {}
+            analyzer = self.analyzers.get(version, frames)
+            started = time.perf_counter()
+            inputs = {role: self._fingerprint(role, frames.get(role)) for _, _, roles, _ in SECTIONS for role in roles}
+            inputs_ms = (time.perf_counter() - started) * 1000
+
+            previous = self.latest
+            previous_sections = {section['key']: section for section in (previous or {}).get('sections', [])}
+
+            sections = []
+            for key, title, roles, render in SECTIONS:
+                section_inputs = {role: inputs[role] for role in roles}
+                old = previous_sections.get(key)
+                if old is not None and old['inputs'] == section_inputs:
+                    tracer.count('report.sections.reused')
+                    sections.append(dict(old, render_ms=0.0, reused=True))
+                    continue
+                with tracer.span(f'report.{key}'):
+                    section_started = time.perf_counter()
+                    text, figures = render(analyzer)
+                    render_ms = (time.perf_counter() - section_started) * 1000
+                tracer.count('report.sections.rendered')
+                sections.append({
+                    'key': key, 'title': title, 'inputs': section_inputs, 'text': text,
+                    'figures': [{'label': label, 'value': _number(value), 'kind': kind} for label, value, kind in figures],
+                    'render_ms': render_ms, 'reused': False,
+                })
+
+            self.version = version
+            if previous is not None and all(section['reused'] for section in sections):
+                span.set(reused=1)
+                return previous
+
+            deltas = report_deltas(sections, previous_sections) if previous is not None else []
+            rendered_at = time.time()
+            previous_rendered_at = previous['rendered_at'] if previous is not None else None
+            snapshot = {
+                'format': REPORT_FORMAT,
+                'version': version,
+                'rendered_at': rendered_at,
+                'previous_rendered_at': previous_rendered_at,
+                'sections': sections,
+                'deltas': deltas,
+                'text': report_text(sections, deltas, previous_rendered_at),
+                'timings': {'inputs_ms': inputs_ms, 'total_ms': (time.perf_counter() - started) * 1000},
+            }
+            self._write(snapshot)
+            self.latest = snapshot
+            self.etag = self._etag(snapshot)
+            return snapshot
+
+    def _write(self, snapshot):
+        os.makedirs(self.directory, exist_ok=True)
+        contents = {"md": to_markdown(snapshot), "html": to_html(snapshot), "json": json.dumps(snapshot, indent=2)}
+        # JSON last: it is what a restart reads back
+        for fmt in ("md", "html", "json"):
+            with open(self.path(fmt) + ".tmp", "w") as f:
+                f.write(contents[fmt])
+            os.replace(self.path(fmt) + ".tmp", self.path(fmt))
+
+
+def parse_schedule(schedule):
+    """
+    Daily render times [(hour, minute), ...] of a schedule such as
+    '07:30,13:00'; [] for 'change', which renders on every data change.
+    """
+    if schedule.strip().lower() == 'change':
+        return []
+    times = []
+    for part in schedule.split(','):
+        try:
+            hour, minute = (int(value) for value in part.strip().split(':'))
+        except ValueError:
+            raise ValueError(f"Invalid report time '{part.strip()}', expected HH:MM or 'change'")
+        if not (0 <= hour < 24 and 0 <= minute < 60):
+            raise ValueError(f"Invalid report time '{part.strip()}', expected HH:MM or 'change'")
+        times.append((hour, minute))
+    return sorted(times)
+
+
+class ReportScheduler:
+    """
+    Renders a LeadershipReport from one background thread: at each daily
+    time of times, or, without times, whenever the board frames publish a
+    new version (checked every poll seconds). On start it renders right
+    away, so a snapshot stored by an earlier process is not served until
+    the next scheduled time; sections whose boards did not change are
+    carried over.
+    """
+    def __init__(self, report, times=None, poll=DEFAULT_REPORT_POLL):
+        self.report = report
+        self.times = times or []
+        self.poll = poll
+        self.next_render_at = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="leadership-report", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def trigger(self):
+        self._wake.set()
+
+    def _delay(self):
+        # A snapshot not yet checked against this process's data, e.g. one
+        # read back on restart, is brought up to date right away
+        if self.report.latest is None or self.report.version is None:
+            return 0.0
+        if not self.times:
+            return self.poll
+        now = datetime.now()
+        upcoming = []
+        for hour, minute in self.times:
+            at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            upcoming.append(at if at > now else at + timedelta(days=1))
+        return (min(upcoming) - now).total_seconds()
+
+    def _due(self):
+        # Scheduled times always render; otherwise only a new data version does
+        return bool(self.times) or self.report.latest is None or \
+            self.report.version != self.report.board_frames.version
+
+    def _run(self):
+        while not self._stop.is_set():
+            delay = self._delay()
+            self.next_render_at = time.time() + delay
+            triggered = self._wake.wait(delay)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            if not (triggered or self._due()):
+                continue
+
+            try:
+                self.report.render()
+            except Exception as e:
+                # Keep serving the last snapshot; the next run tries again
+                print(f"Rendering the leadership report failed, serving the last one: {e}")
+                self._wake.wait(min(self.poll * 12, 60))
+                self._wake.clear()
+
+
+def create_leadership_report(board_frames, analyzers=None):
+    """
+    Returns a LeadershipReport in MONDAY_REPORT_DIR (default .monday_reports)
+    with a started ReportScheduler, when MONDAY_REPORT_SCHEDULE is set to
+    'change' or daily times such as '07:30'; otherwise None. analyzers is
+    the AnalyzerVersions answering questions in this process.
+    """
+    schedule = os.getenv("MONDAY_REPORT_SCHEDULE")
+    if not schedule or schedule.strip().lower() == 'off':
+        return None
+    report = LeadershipReport(board_frames, os.getenv("MONDAY_REPORT_DIR", DEFAULT_REPORT_DIR), analyzers)
+    report.scheduler = ReportScheduler(report, parse_schedule(schedule),
+                                       float(os.getenv("MONDAY_REPORT_POLL", DEFAULT_REPORT_POLL))).start()
+    return report
+
+
+def main():
+    """
+    Renders the leadership report once and exits: python -m src.report,
+    e.g. from cron before the morning send.
+    """
+    from src.async_monday_api import create_client
+    from src.ingest import create_board_frames
+
+    load_dotenv()
+    board_frames = create_board_frames(create_client())
+    report = LeadershipReport(board_frames, os.getenv("MONDAY_REPORT_DIR", DEFAULT_REPORT_DIR))
+    snapshot = report.render()
+    for section in snapshot['sections']:
+        state = "unchanged" if section['reused'] else f"{section['render_ms']:.1f} ms"
+        print(f"  - {section['key']}: {state}")
+    for fmt in ARTIFACTS:
+        print(f"Wrote {report.path(fmt)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import re
+from datetime import date
+
+# Intents in order of precedence: when a question matches several, the
+# first one listed wins ("update on stuck deals" is a leadership update).
+# Keywords match at the start of a word, so 'deal' also covers 'deals'.
+INTENTS = [
+    ('leadership_update', 'generate_leadership_update', "Generating Leadership Update...",
+     ['update', 'summary', 'summarise', 'summarize', 'report', 'brief', 'overview', 'leadership', 'executive', 'board meeting']),
+    ('cross_board', 'get_cross_board_status', "Linking Deals and Work Orders...",
+     ['risk', 'deliver', 'conversion', 'convert', 'stuck', 'blocked', 'on hold', 'fulfil']),
+    ('pipeline', 'get_pipeline_benth', "Analyzing Pipeline...",
+     ['pipeline', 'sales', 'deal', 'revenue', 'forecast', 'booking', 'funnel', 'win rate', 'closing']),
+    ('operations', 'get_operational_status', "Analyzing Operations...",
+     ['operation', 'work', 'order', 'status', 'backlog', 'execution', 'project', 'priorit']),
+]
+
+FALLBACK_ANSWER = ("I'm not sure how to answer that yet. "
+                   "Try asking about 'pipeline', 'operations', 'risk' or 'update'.")
+
+DEFAULT_SECTORS = ['mining', 'energy', 'renewables', 'agriculture', 'infrastructure', 'defence', 'defense',
+                   'manufacturing', 'healthcare', 'logistics', 'construction', 'utilities']
+
+RELATIVE_QUARTERS = {'this': 0, 'current': 0, 'next': 1, 'last': -1, 'previous': -1}
+
+QUARTER_RE = r"q[1-4](?:\s*(?:fy\s*)?20\d\d)?\b|(?:this|current|next|last|previous) quarter\b"
+QUARTER_PARTS_RE = re.compile(r"q(?P<quarter>[1-4])(?:\s*(?:fy\s*)?(?P<year>20\d\d))?|(?P<relative>\w+) quarter")
+OWNER_RE = r"\b(?P<trigger>owned by|assigned to|owner|for)\s+(?P<owner>[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)"
+
+
+def trie_pattern(words):
+    """
+    Regex matching any of words, factored into a character trie
+    ('deal|deliver' becomes 'de(?:al|liver)') so the engine tries each
+    character once instead of each word in turn. Longer words win.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class Route:
+    """
+    A resolved question: the intent, the Analyzer method answering it,
+    the progress title and the extracted parameters.
+    """
+    def __init__(self, intent, method, title, params):
+        self.intent = intent
+        self.method = method
+        self.title = title
+        self.params = params
+
+    def run(self, analyzer):
+        if self.params:
+            analyzer = analyzer.scoped(**self.params)
+        return getattr(analyzer, self.method)()
+
+    def __repr__(self):
+        return f"Route({self.intent!r}, {self.params!r})"
+
+
+class Router:
+    """
+    Maps a free-text question to a Route in a single pass.
+
+    Keywords, known sectors and quarters are compiled into one pattern
+    (keywords and sectors as a trie), so a question is scanned once and
+    each hit is resolved with a dict lookup; owners come from a second
+    pattern, only tried when the question has an owner-like phrase.
+    "owned by", "assigned to" and "owner" always name an owner; a name
+    after a bare "for" only counts when it is one of owners ("for Asha",
+    but not "for Acme Corp" or "for Monday"). today anchors relative
+    quarters ("next quarter") and defaults the year.
+    """
+    def __init__(self, intents=INTENTS, sectors=DEFAULT_SECTORS, owners=(), today=None):
+        self.today = today
+        self._owners = [owner.lower() for owner in owners if owner]
+        # keyword -> (rank, intent, method, title); sector -> sector
+        self._keywords = {}
+        self._sectors = {}
+        for rank, (intent, method, title, keywords) in enumerate(intents):
+            for keyword in keywords:
+                self._keywords.setdefault(keyword, (rank, intent, method, title))
+        for sector in sectors:
+            if sector and sector.lower() not in self._keywords:
+                self._sectors[sector.lower()] = sector.lower()
+
+        words = trie_pattern(list(self._keywords) + list(self._sectors))
+        self._pattern = re.compile(rf"\b(?:(?P<quarter>{QUARTER_RE})|(?P<word>{words}))")
+        self._owner = re.compile(OWNER_RE)
+
+    def route(self, query):
+        """
+        Returns the Route for query, or None if no intent matches.
+        """
+        lowered = query.lower()
+        best = None
+        params = {}
+        # Spans of quarters and sectors, which are never read as owners
+        matched = []
+        for match in self._pattern.finditer(lowered):
+            word = match.group('word')
+            if word is None:
+                params.setdefault('quarter', self._resolve_quarter(QUARTER_PARTS_RE.match(match.group('quarter'))))
+                matched.append(match.span())
+            elif word in self._keywords:
+                if best is None or self._keywords[word][0] < best[0]:
+                    best = self._keywords[word]
+            # Sectors must be whole words ('mining' but not 'miningco')
+            elif match.end() == len(lowered) or not lowered[match.end()].isalnum():
+                params.setdefault('sector', self._sectors[word])
+                matched.append(match.span())
+        if best is None:
+            return None
+
+        if 'for ' in lowered or ' by ' in lowered or ' to ' in lowered or 'owner' in lowered:
+            owner = self._find_owner(query, matched)
+            if owner:
+                params['owner'] = owner
+        _, intent, method, title = best
+        return Route(intent, method, title, params)
+
+    def _find_owner(self, query, matched):
+        for match in self._owner.finditer(query):
+            start, end = match.span('owner')
+            # "for This Quarter" and "for Mining" were already read as a quarter or sector
+            if any(start < span_end and span_start < end for span_start, span_end in matched):
+                continue
+            name = match.group('owner')
+            if match.group('trigger') != 'for':
+                return name
+            # A bare "for" may name a client, day or anything else
+            for candidate in (name, name.split()[0]):
+                if any(candidate.lower() == owner or candidate.lower() in owner.split() for owner in self._owners):
+                    return candidate
+        return None
+
+    def _resolve_quarter(self, match):
+        today = self.today or date.today()
+        current = (today.month - 1) // 3
+        if match.group('relative'):
+            index = today.year * 4 + current + RELATIVE_QUARTERS[match.group('relative')]
+            return f"{index // 4}-Q{index % 4 + 1}"
+        year = int(match.group('year')) if match.group('year') else today.year
+        return f"{year}-Q{match.group('quarter')}"
+
+
+def create_router(analyzer=None):
+    """
+    A Router knowing the default sectors plus the sectors and owners in
+    the analyzer's deals.
+    """
+    sectors = list(DEFAULT_SECTORS)
+    owners = []
+    if analyzer is not None:
+        sectors.extend(analyzer.sectors())
+        owners = analyzer.owners()
+    return Router(sectors=sectors, owners=owners)
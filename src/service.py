@@ -0,0 +1,401 @@
+import hmac
+import json
+import os
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from src.analyzer import PERIODS, ROLLING_PERIODS, AnalyzerVersions
+from src.query_cache import create_query_cache
+from src.report import ARTIFACTS, REPORT_NAME, create_leadership_report
+from src.router import FALLBACK_ANSWER, create_router
+from src.tracing import tracer
+from src.webhooks import is_loopback
+
+DEFAULT_SERVICE_PORT = 8765
+
+# Query parameters narrowing an answer to some deals and work orders (see Analyzer.scoped)
+SCOPE_PARAMS = ('owner', 'sector', 'quarter')
+
+
+def to_json(value):
+    """
+    value with pandas and numpy objects made JSON serializable. Frames and
+    series use pandas' 'split' layout ({'index', 'columns', 'data'} or
+    {'name', 'index', 'data'}), which pd.DataFrame(**payload) reads back.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return json.loads(value.to_json(orient='split', date_format='iso', default_handler=str))
+    if isinstance(value, dict):
+        return {str(key): to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+class AnalyticsService:
+    """
+    One warm copy of the boards and their Analyzer aggregates, answering
+    read-only requests for any number of dashboards, bots and thin
+    clients.
+
+    The frames come from a BoardFrames kept fresh by its refresher and
+    webhooks. Each data version is answered by its own Analyzer from
+    analyzers (see AnalyzerVersions), which recomputes only the
+    aggregates of the frames that changed. Answers
+    are cached per endpoint, scope and data version. Every answer carries
+    an ETag naming this process and the data version, so a client sending
+    it back in If-None-Match gets a 304 until the data changes.
+
+    With a LeadershipReport, the unscoped leadership update is its latest
+    prerendered snapshot instead.
+    """
+    def __init__(self, board_frames, query_cache=None, report=None, analyzers=None):
+        self.board_frames = board_frames
+        self.report = report
+        if analyzers is None:
+            analyzers = report.analyzers if report is not None else AnalyzerVersions()
+        self.analyzers = analyzers
+        self.query_cache = query_cache if query_cache is not None else create_query_cache()
+        self.router = None
+        # Versions restart at 0 with the process, so ETags name it too
+        self.instance = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+
+    def etag(self, version):
+        return f'"{self.instance}-{version}"'
+
+    def _sync(self):
+        """
+        (version, Analyzer) of the published frames, loading them on the
+        first request.
+        """
+        version, frames = self.board_frames.snapshot()
+        analyzer = self.analyzers.get(version, frames)
+        if self.router is None:
+            with self._lock:
+                if self.router is None:
+                    self.router = create_router(analyzer)
+        return version, analyzer
+
+    def current_version(self):
+        """
+        The data version requests would be answered from, without computing anything.
+        """
+        return self.board_frames.snapshot()[0]
+
+    def answer(self, endpoint, params, compute):
+        """
+        (version, payload) of compute(analyzer) at the current data version,
+        from the query cache when it was answered before.
+        """
+        version, analyzer = self._sync()
+        payload = self.query_cache.get_or_compute(f"service.{endpoint}", params, version,
+                                                  lambda: to_json(compute(analyzer)))
+        return version, payload
+
+    def health(self):
+        board_frames = self.board_frames
+        frames = board_frames.frames or {}
+        return {
+            'status': 'ok' if frames else 'loading',
+            'version': board_frames.version,
+            'age': board_frames.age,
+            'refreshing': board_frames.refreshing,
+            'error': board_frames.error,
+            'boards': [{'role': role, 'board_id': board_id, 'source': (board_frames.sources or {}).get(board_id)}
+                       for role, board_id in board_frames.boards],
+            'rows': {role: len(df) for role, df in frames.items()},
+            'answers': self.query_cache.stats(),
+        }
+
+
+def _scoped(analyzer, scope):
+    return analyzer.scoped(**scope) if scope else analyzer
+
+
+def _pipeline(analyzer, scope):
+    analyzer = _scoped(analyzer, scope)
+    return {'text': analyzer.get_pipeline_benth(), 'metrics': analyzer.pipeline_metrics()}
+
+
+def _operations(analyzer, scope):
+    analyzer = _scoped(analyzer, scope)
+    return {'text': analyzer.get_operational_status(), 'metrics': analyzer.operations_metrics()}
+
+
+def _cross_board(analyzer, scope):
+    analyzer = _scoped(analyzer, scope)
+    return {'text': analyzer.get_cross_board_status(), 'metrics': analyzer.cross_board_metrics()}
+
+
+def _leadership(analyzer, scope):
+    return {'text': _scoped(analyzer, scope).generate_leadership_update()}
+
+
+# Analyzer frames served by /frames/<role>
+ROLES = {'deals': 'deals_df', 'work_orders': 'work_orders_df'}
+
+# Scopable endpoints and the Analyzer answers they return
+ENDPOINTS = {
+    '/pipeline': _pipeline,
+    '/operations': _operations,
+    '/cross-board': _cross_board,
+    '/leadership': _leadership,
+}
+
+
+class AnalyticsServer:
+    """
+    Read-only HTTP/JSON front of an AnalyticsService:
+
+        GET /health                      status, data version and age, boards, row counts
+        GET /pipeline, /operations,      text answer and metrics, optionally scoped
+            /cross-board, /leadership    with ?owner=, ?sector= and ?quarter=2026-Q3
+        GET /trends?period=quarter       pipeline and throughput trend tables
+        GET /ask?q=<question>            the answer the CLI gives to the question
+        GET /frames/<role>               the normalized frame of a role
+        GET /reports/leadership.md       the latest prerendered leadership report
+            (.html, .json)               (when the service has a LeadershipReport)
+
+    Everything but /health answers with an ETag and honours If-None-Match.
+    With a token, every request must carry it as 'Authorization: Bearer
+    <token>'.
+    """
+    def __init__(self, service, host="127.0.0.1", port=0, token=None):
+        self.service = service
+        self.token = token
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name="analytics-service", daemon=True).start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _authorized(self, authorization):
+        if not self.token:
+            return True
+        return hmac.compare_digest(authorization or "", f"Bearer {self.token}")
+
+    def handle(self, target, if_none_match=None, authorization=None):
+        """
+        Answers one GET. Returns (status, payload, headers); payload is None for a 304.
+        """
+        if not self._authorized(authorization):
+            tracer.count("service.unauthorized")
+            return 401, {'error': 'Invalid token'}, {'WWW-Authenticate': 'Bearer'}
+        url = urlparse(target)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        path = url.path.rstrip('/') or '/'
+        if path == '/health':
+            return 200, to_json(self.service.health()), {}
+        report = self.service.report
+        if report is not None and (path.startswith('/reports/') or
+                                   (path == '/leadership' and not any(query.get(key) for key in SCOPE_PARAMS))):
+            return self._report(report, path, if_none_match)
+
+        try:
+            route = self._route(path, query)
+        except ValueError as e:
+            return 400, {'error': str(e)}, {}
+        if route is None:
+            return 404, {'error': 'Not found'}, {}
+        endpoint, params, compute = route
+
+        try:
+            # Unchanged data is answered without touching the Analyzer
+            etag = self.service.etag(self.service.current_version())
+            if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+                tracer.count("service.not_modified")
+                return 304, None, {'ETag': etag}
+            version, payload = self.service.answer(endpoint, params, compute)
+        except ValueError as e:
+            return 400, {'error': str(e)}, {}
+        except Exception as e:
+            print(f"Error answering {target}: {e}")
+            return 500, {'error': str(e)}, {}
+        tracer.count("service.answers")
+        return 200, dict(payload, version=version), {'ETag': self.service.etag(version)}
+
+    def _report(self, report, path, if_none_match):
+        """
+        Answers from the latest snapshot of the leadership report, as JSON
+        for /leadership and as the stored artifact for /reports/<name>.<fmt>.
+        """
+        if path.startswith('/reports/'):
+            name, _, fmt = path[len('/reports/'):].partition('.')
+            if name != REPORT_NAME or fmt not in ARTIFACTS:
+                return 404, {'error': 'Not found'}, {}
+        try:
+            snapshot = report.current()
+        except Exception as e:
+            print(f"Error rendering the leadership report: {e}")
+            return 500, {'error': str(e)}, {}
+        # Content-addressed, so unchanged reports stay 304 across data versions
+        etag = report.etag
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+            tracer.count("service.not_modified")
+            return 304, None, {'ETag': etag}
+        tracer.count("service.reports")
+        if path == '/leadership':
+            return 200, {'text': snapshot['text'], 'report': snapshot, 'version': snapshot['version']}, {'ETag': etag}
+        return 200, report.artifact(fmt), {'ETag': etag, 'Content-Type': ARTIFACTS[fmt]}
+
+    def _route(self, path, query):
+        """
+        (endpoint, params, compute) for a path, or None if there is no such
+        endpoint. Raises ValueError for invalid parameters.
+        """
+        if path in ENDPOINTS:
+            scope = {key: query[key] for key in SCOPE_PARAMS if query.get(key)}
+            return path.strip('/'), scope, lambda analyzer: ENDPOINTS[path](analyzer, scope)
+        if path == '/trends':
+            period = query.get('period', 'quarter')
+            if period not in PERIODS and period not in ROLLING_PERIODS:
+                raise ValueError(f"Unknown period '{period}', expected one of {list(PERIODS) + list(ROLLING_PERIODS)}")
+            return 'trends', {'period': period}, lambda analyzer: {
+                'period': period, 'pipeline': analyzer.pipeline_trend(period),
+                'throughput': analyzer.throughput_trend(period)}
+        if path == '/ask':
+            question = query.get('q', '')
+            return 'ask', {'q': question}, lambda analyzer: _ask(self.service.router, analyzer, question)
+        if path.startswith('/frames/'):
+            role = path[len('/frames/'):]
+            if role not in ROLES:
+                raise ValueError(f"Unknown role '{role}', expected one of {list(ROLES)}")
+            return 'frames', {'role': role}, lambda analyzer: {'role': role, 'frame': getattr(analyzer, ROLES[role])}
+        return None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, payload, headers = server.handle(self.path, self.headers.get("If-None-Match"),
+                                                         self.headers.get("Authorization"))
+                # Report artifacts are served as stored
+                if isinstance(payload, bytes):
+                    data = payload
+                else:
+                    data = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", headers.pop("Content-Type", "application/json"))
+                self.send_header("Content-Length", str(len(data)))
+                # Cached copies must be revalidated, which the ETag makes cheap
+                self.send_header("Cache-Control", "no-cache")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_only(self):
+                self.send_response(405)
+                self.send_header("Allow", "GET")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            do_POST = do_PUT = do_PATCH = do_DELETE = _read_only
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _ask(router, analyzer, question):
+    route = router.route(question)
+    if route is None:
+        return {'intent': None, 'title': None, 'params': {}, 'text': FALLBACK_ANSWER}
+    return {'intent': route.intent, 'title': route.title, 'params': route.params, 'text': route.run(analyzer)}
+
+
+def _analytics_server(service, port):
+    """
+    An AnalyticsServer of service on MONDAY_SERVICE_HOST, or None when the
+    host is beyond this machine and MONDAY_SERVICE_TOKEN isn't set: the
+    service hands out every board's items.
+    """
+    host = os.getenv("MONDAY_SERVICE_HOST", "127.0.0.1")
+    token = os.getenv("MONDAY_SERVICE_TOKEN") or None
+    if not is_loopback(host) and not token:
+        print(f"Not serving analytics on {host}: set MONDAY_SERVICE_TOKEN to serve them beyond this machine.")
+        return None
+    return AnalyticsServer(service, host, port, token=token)
+
+
+def create_analytics_server(board_frames, query_cache=None, report=None, analyzers=None):
+    """
+    Returns a started AnalyticsServer over board_frames when
+    MONDAY_SERVICE_PORT is set, otherwise None.
+    """
+    port = os.getenv("MONDAY_SERVICE_PORT")
+    if not port:
+        return None
+    server = _analytics_server(AnalyticsService(board_frames, query_cache, report, analyzers), int(port))
+    return server.start() if server is not None else None
+
+
+def main():
+    """
+    Runs the service on its own: python -m src.service. It loads the
+    configured boards, keeps them fresh and serves them on
+    MONDAY_SERVICE_PORT (default 8765).
+    """
+    from src.async_monday_api import create_client
+    from src.ingest import create_board_frames
+    from src.refresher import create_refresher
+    from src.tracing import create_exporters
+    from src.webhooks import create_webhook_server
+
+    load_dotenv()
+    create_exporters()
+    board_frames = create_board_frames(create_client())
+    board_frames.load()
+    create_refresher(board_frames)
+    webhook_server = create_webhook_server(board_frames)
+    analyzers = AnalyzerVersions()
+    report = create_leadership_report(board_frames, analyzers)
+    service = AnalyticsService(board_frames, report=report, analyzers=analyzers)
+    server = _analytics_server(service, int(os.getenv("MONDAY_SERVICE_PORT", DEFAULT_SERVICE_PORT)))
+    if server is None:
+        return
+    print(f"Serving analytics at {server.url}")
+    if webhook_server is not None:
+        print(f"Receiving live updates at {webhook_server.url}")
+    if report is not None:
+        print(f"Prerendering the leadership report into {report.directory}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import os
+import threading
+import pandas as pd
+import requests
+
+
+def from_split(payload):
+    """
+    The DataFrame (or Series) of a 'split' payload from the analytics
+    service, None for None.
+    """
+    if payload is None:
+        return None
+    if 'columns' in payload:
+        return pd.DataFrame(payload['data'], index=payload['index'], columns=payload['columns'])
+    return pd.Series(payload['data'], index=payload['index'], name=payload.get('name'))
+
+
+class ServiceClient:
+    """
+    Thin client of the analytics service (see src.service): the CLI, the
+    Streamlit app, dashboards and bots read answers from one warm service
+    instead of fetching the boards themselves.
+
+    Answers are kept with their ETag and revalidated with If-None-Match,
+    so asking again before the data changes costs a 304 and no JSON.
+    A token is sent as a bearer token (see MONDAY_SERVICE_TOKEN).
+    """
+    def __init__(self, base_url, timeout=30.0, token=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        self.stats = {"requests": 0, "not_modified": 0}
+        self.version = None
+        self._answers = {}
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.session.close()
+
+    def get(self, path, **params):
+        """
+        The JSON answer of GET path?params.
+        """
+        params = {key: value for key, value in params.items() if value is not None}
+        key = (path, tuple(sorted(params.items())))
+        with self._lock:
+            cached = self._answers.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        try:
+            response = self.session.get(self.base_url + path, params=params, headers=headers, timeout=self.timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise Exception(f"Analytics service unreachable at {self.base_url}: {e}")
+        self.stats["requests"] += 1
+
+        if response.status_code == 304 and cached:
+            self.stats["not_modified"] += 1
+            return cached[1]
+        if response.status_code != 200:
+            raise Exception(f"Analytics service error: {response.text}")
+        payload = response.json()
+        self.version = payload.get("version", self.version)
+        if response.headers.get("ETag"):
+            with self._lock:
+                self._answers[key] = (response.headers["ETag"], payload)
+        return payload
+
+    def health(self):
+        return self.get("/health")
+
+    def pipeline(self, **scope):
+        return self.get("/pipeline", **scope)
+
+    def operations(self, **scope):
+        return self.get("/operations", **scope)
+
+    def cross_board(self, **scope):
+        return self.get("/cross-board", **scope)
+
+    def leadership(self, **scope):
+        return self.get("/leadership", **scope)
+
+    def trends(self, period="quarter"):
+        return self.get("/trends", period=period)
+
+    def ask(self, question):
+        """
+        {'intent', 'title', 'params', 'text'} answering question; intent is
+        None when the question matched nothing.
+        """
+        return self.get("/ask", q=question)
+
+    def frame(self, role):
+        return from_split(self.get(f"/frames/{role}")["frame"])
+
+
+class RemoteAnalyzer:
+    """
+    The metrics and trends of an Analyzer, read from the analytics
+    service, for the Streamlit dashboard in thin-client mode.
+    """
+    def __init__(self, client):
+        self.client = client
+
+    @staticmethod
+    def _metrics(metrics, series):
+        if metrics is None:
+            return None
+        return dict(metrics, **{key: from_split(metrics[key]) for key in series})
+
+    def pipeline_metrics(self):
+        return self._metrics(self.client.pipeline()["metrics"], ("stage_counts", "value_by_source"))
+
+    def operations_metrics(self):
+        return self._metrics(self.client.operations()["metrics"], ("status_counts", "priority_counts"))
+
+    def _trend(self, key, period):
+        table = from_split(self.client.trends(period)[key])
+        if table is not None:
+            table.index = pd.to_datetime(table.index)
+        return table
+
+    def pipeline_trend(self, period="quarter"):
+        return self._trend("pipeline", period)
+
+    def throughput_trend(self, period="quarter"):
+        return self._trend("throughput", period)
+
+
+def create_service_client():
+    """
+    A ServiceClient of the service at MONDAY_SERVICE_URL, or None when it isn't set.
+    """
+    url = os.getenv("MONDAY_SERVICE_URL")
+    if not url:
+        return None
+    return ServiceClient(url, float(os.getenv("MONDAY_SERVICE_TIMEOUT", "30")), os.getenv("MONDAY_SERVICE_TOKEN") or None)
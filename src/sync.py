@@ -0,0 +1,226 @@
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from src.cache import BoardCache, create_board_cache
+from src.data_processor import DataProcessor, align_dtypes, apply_column_titles, concat_frames, item_id_values
+from src.fetcher import projected_columns, stream_board_batch
+from src.monday_api import BoardRequest
+
+# Re-request a small window before the last sync so clock skew between us
+# and Monday can't lose an update. Re-fetched items are simply merged again.
+SYNC_OVERLAP = timedelta(minutes=2)
+
+
+class BoardSnapshot:
+    """
+    Last known state of one board: its normalized DataFrame, the column
+    map it was built with and when it was synced.
+    """
+    def __init__(self, board_id, df, columns_map, synced_at):
+        self.board_id = board_id
+        self.df = df
+        self.columns_map = columns_map
+        self.synced_at = synced_at
+
+
+def merge_items(df, changed_df):
+    """
+    Upserts changed rows into df by item id. Changed rows replace existing ones.
+    """
+    if changed_df.empty:
+        return df
+    if df.empty:
+        return changed_df.reset_index(drop=True)
+    changed_df = align_dtypes(changed_df, df)
+    kept = df[~df['id'].isin(changed_df['id'])]
+    return concat_frames([kept, changed_df]).reset_index(drop=True)
+
+
+class IncrementalSync:
+    """
+    Keeps one snapshot per board and refreshes it with only the items
+    updated since the previous sync.
+
+    A full download happens on the first sync of a board and whenever its
+    column schema changes. Deletions are reconciled by comparing the board's
+    items_count with the snapshot and, only if they differ, pulling the list
+    of live item IDs (no column values).
+    """
+    def __init__(self, client, snapshot_dir=None, cache=None, projection=None):
+        self.client = client
+        self.projection = projection
+        # Snapshots persist through the on-disk board cache
+        if cache is None and snapshot_dir:
+            cache = BoardCache(snapshot_dir)
+        self.cache = cache
+        self.snapshots = {}
+        self.stats = {"full_syncs": 0, "incremental_syncs": 0, "changed_items": 0, "deleted_items": 0}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, board_id):
+        with self._locks_guard:
+            return self._locks.setdefault(board_id, threading.Lock())
+
+    def sync(self, board_id):
+        """
+        Brings the snapshot of board_id up to date and returns its DataFrame.
+        """
+        with self._lock_for(board_id):
+            snapshot = self.snapshots.get(board_id) or self._load(board_id)
+            started = datetime.now(timezone.utc)
+            column_ids = None
+            if self.projection is None:
+                columns_map = self.client.get_board_columns(board_id)
+            else:
+                schema = self.client.get_board_schema(board_id)
+                columns_map = {col['id']: col['title'] for col in schema}
+                projected = self.projection.select(board_id, schema)
+                if projected is not None:
+                    # A changed projection counts as a schema change
+                    columns_map, column_ids = projected, list(projected)
+
+            if snapshot is None or snapshot.columns_map != columns_map:
+                snapshot = self._full_sync(board_id, columns_map, column_ids, started)
+            else:
+                snapshot = self._incremental_sync(snapshot, columns_map, column_ids, started)
+
+            self.snapshots[board_id] = snapshot
+            self._save(snapshot)
+            return snapshot.df
+
+    def _full_sync(self, board_id, columns_map, column_ids, started):
+        pages = self.client.iter_board_pages(board_id, column_ids=column_ids)
+        df = DataProcessor.from_pages(pages, columns_map).clean_data()
+        self.stats["full_syncs"] += 1
+        return BoardSnapshot(board_id, df, columns_map, started)
+
+    def _incremental_sync(self, snapshot, columns_map, column_ids, started):
+        board_id = snapshot.board_id
+        pages = self.client.iter_board_pages(board_id, updated_since=snapshot.synced_at - SYNC_OVERLAP,
+                                             column_ids=column_ids)
+        changed_df = DataProcessor.from_pages(pages, columns_map).clean_data()
+        return self._apply_changes(snapshot, changed_df, columns_map, started,
+                                   self.client.get_board_items_count(board_id))
+
+    def _apply_changes(self, snapshot, changed_df, columns_map, started, count):
+        """
+        Merges changed items into the snapshot, then drops deleted items
+        if the board's items count says there are any.
+        """
+        board_id = snapshot.board_id
+        df = merge_items(snapshot.df, changed_df)
+
+        if count is not None and count != len(df) and not df.empty:
+            live_ids = item_id_values(df['id'], self.client.get_board_item_ids(board_id))
+            before = len(df)
+            df = df[df['id'].isin(live_ids)].reset_index(drop=True)
+            self.stats["deleted_items"] += before - len(df)
+
+        self.stats["incremental_syncs"] += 1
+        self.stats["changed_items"] += len(changed_df)
+        return BoardSnapshot(board_id, df, columns_map, started)
+
+    def sync_many(self, board_ids):
+        """
+        sync() for several boards over batched queries (see BoardBatch):
+        the schemas, items counts and changed items of every board come
+        back together instead of three or more requests per board.
+
+        Changed items are asked for before knowing whether a board's schema
+        changed; the boards whose schema did are downloaded again in full
+        with a second batch. Returns {board_id: DataFrame}.
+        """
+        board_ids = list(dict.fromkeys(board_ids))
+        locks = [self._lock_for(board_id) for board_id in sorted(board_ids)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            started = datetime.now(timezone.utc)
+            snapshots = {board_id: self.snapshots.get(board_id) or self._load(board_id) for board_id in board_ids}
+            columns_maps, column_ids = {}, {}
+            if self.projection is not None:
+                columns_maps, column_ids = projected_columns(self.client, board_ids, self.projection)
+
+            changes = self._fetch_batch(board_ids, snapshots, columns_maps, column_ids)
+            results = {}
+            full = []
+            for board_id in board_ids:
+                snapshot = snapshots[board_id]
+                df, columns_map, count = changes[board_id]
+                if snapshot is None:
+                    results[board_id] = self._full_snapshot(board_id, df, columns_map, started)
+                elif snapshot.columns_map != columns_map:
+                    full.append(board_id)
+                else:
+                    results[board_id] = self._apply_changes(snapshot, df, columns_map, started, count)
+
+            if full:
+                changes = self._fetch_batch(full, {}, columns_maps, column_ids)
+                for board_id in full:
+                    df, columns_map, _ = changes[board_id]
+                    results[board_id] = self._full_snapshot(board_id, df, columns_map, started)
+
+            for board_id, snapshot in results.items():
+                self.snapshots[board_id] = snapshot
+                self._save(snapshot)
+            return {board_id: results[board_id].df for board_id in board_ids}
+        finally:
+            for lock in locks:
+                lock.release()
+
+    def _fetch_batch(self, board_ids, snapshots, columns_maps, column_ids):
+        """
+        {board_id: (DataFrame, columns_map, items_count)} of the items updated
+        since each board's snapshot (all items for boards without one).
+        """
+        requests = []
+        for board_id in board_ids:
+            snapshot = snapshots.get(board_id)
+            requests.append(BoardRequest(
+                board_id,
+                schema=self.projection is None,
+                items_count=snapshot is not None,
+                updated_since=snapshot.synced_at - SYNC_OVERLAP if snapshot is not None else None,
+                column_ids=column_ids.get(board_id),
+            ))
+        batch = self.client.batch_boards(requests)
+        frames = stream_board_batch(batch, board_ids)
+
+        changes = {}
+        for board_id in board_ids:
+            columns_map = columns_maps.get(board_id)
+            if self.projection is None:
+                columns_map = {col['id']: col['title'] for col in batch.schemas.get(board_id, [])}
+            changes[board_id] = (apply_column_titles(frames[board_id], columns_map), columns_map,
+                                 batch.items_counts.get(board_id))
+        return changes
+
+    def _full_snapshot(self, board_id, df, columns_map, started):
+        self.stats["full_syncs"] += 1
+        return BoardSnapshot(board_id, df, columns_map, started)
+
+    # --- persistence ---
+
+    def _load(self, board_id):
+        if self.cache is None:
+            return None
+        entry = self.cache.get(board_id)
+        if entry is None or entry.synced_at is None:
+            return None
+        return BoardSnapshot(board_id, entry.df, entry.columns_map, entry.synced_at)
+
+    def _save(self, snapshot):
+        if self.cache is None:
+            return
+        self.cache.put(snapshot.board_id, snapshot.df, snapshot.columns_map, snapshot.synced_at)
+
+
+def create_syncer(client, cache=None, projection=None):
+    """
+    Returns an IncrementalSync for the client, or None when MONDAY_SYNC_MODE=full.
+    Snapshots are kept in cache, or in the environment-configured board cache.
+    """
+    if os.getenv("MONDAY_SYNC_MODE", "incremental").lower() == "full":
+        return None
+    return IncrementalSync(client, cache=cache or create_board_cache(), projection=projection)
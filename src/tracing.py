@@ -0,0 +1,276 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PROMETHEUS_PORT = 9464
+
+
+class SpanStats:
+    """
+    Aggregated timings of one span name: count, total and recent durations
+    for percentiles, plus the summed numeric attributes (bytes, pages, ...).
+    """
+    def __init__(self, max_samples=1000):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.durations = deque(maxlen=max_samples)
+        self.attrs = {}
+
+    def record(self, duration, attrs):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.durations.append(duration)
+        for key, value in attrs.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.attrs[key] = self.attrs.get(key, 0) + value
+
+    def summary(self):
+        durations = sorted(self.durations)
+        count = len(durations)
+
+        def percentile(p):
+            if not count:
+                return 0.0
+            return durations[min(count - 1, int(round(p * (count - 1))))]
+
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": percentile(0.50) * 1000,
+            "p95_ms": percentile(0.95) * 1000,
+            "max_ms": self.max * 1000,
+            "attrs": dict(self.attrs),
+        }
+
+
+class Span:
+    """
+    An open span. Attributes set while it runs are summed into its SpanStats.
+    """
+    def __init__(self, attrs):
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """
+    Process-wide timing spans and counters for the fetch, normalize and
+    analyze hot paths. Thread safe; spans only aggregate, nothing is kept
+    per call beyond the last max_samples durations of each name.
+    """
+    def __init__(self, enabled=True, max_samples=1000):
+        self.enabled = enabled
+        self.max_samples = max_samples
+        self.exporters = []
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._spans = {}
+            self._counters = {}
+
+    @contextmanager
+    def span(self, name, **attrs):
+        span = Span(attrs)
+        if not self.enabled:
+            yield span
+            return
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                stats = self._spans.get(name)
+                if stats is None:
+                    stats = self._spans[name] = SpanStats(self.max_samples)
+                stats.record(duration, span.attrs)
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self):
+        """
+        {'spans': {name: SpanStats.summary()}, 'counters': {name: value}}
+        """
+        with self._lock:
+            return {
+                "spans": {name: stats.summary() for name, stats in self._spans.items()},
+                "counters": dict(self._counters),
+            }
+
+    def add_exporter(self, exporter):
+        self.exporters.append(exporter)
+        return exporter
+
+    def export(self):
+        snapshot = self.snapshot()
+        for exporter in self.exporters:
+            try:
+                exporter.export(snapshot)
+            except Exception as e:
+                print(f"Trace export with {type(exporter).__name__} failed: {e}")
+        return snapshot
+
+
+tracer = Tracer(enabled=os.getenv("MONDAY_TRACE", "on").lower() not in ("0", "off", "false", "no"))
+
+
+def traced(name):
+    """
+    Decorator timing every call of a function as span name on the global tracer.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def format_report(snapshot):
+    """
+    Human-readable breakdown of a snapshot, slowest spans first.
+    """
+    lines = [f"{'span':<40} {'calls':>7} {'total s':>9} {'mean ms':>9} {'p95 ms':>9}  attributes"]
+    spans = sorted(snapshot["spans"].items(), key=lambda item: item[1]["total_s"], reverse=True)
+    for name, stats in spans:
+        attrs = ", ".join(f"{key}={value:,.0f}" for key, value in sorted(stats["attrs"].items()))
+        lines.append(f"{name:<40} {stats['count']:>7} {stats['total_s']:>9.3f} "
+                     f"{stats['mean_ms']:>9.2f} {stats['p95_ms']:>9.2f}  {attrs}")
+    if snapshot["counters"]:
+        lines.append("")
+        lines.append("counters: " + ", ".join(f"{name}={value}" for name, value in sorted(snapshot["counters"].items())))
+    return "\n".join(lines)
+
+
+def _metric_name(name):
+    return "".join(char if char.isalnum() else "_" for char in name)
+
+
+def format_prometheus(snapshot):
+    """
+    Snapshot in the Prometheus text exposition format.
+    """
+    lines = [
+        "# TYPE bi_agent_span_seconds summary",
+    ]
+    for name, stats in sorted(snapshot["spans"].items()):
+        label = f'span="{name}"'
+        lines.append(f'bi_agent_span_seconds{{{label},quantile="0.5"}} {stats["p50_ms"] / 1000:.6f}')
+        lines.append(f'bi_agent_span_seconds{{{label},quantile="0.95"}} {stats["p95_ms"] / 1000:.6f}')
+        lines.append(f"bi_agent_span_seconds_sum{{{label}}} {stats['total_s']:.6f}")
+        lines.append(f"bi_agent_span_seconds_count{{{label}}} {stats['count']}")
+    for name, stats in sorted(snapshot["spans"].items()):
+        for key, value in sorted(stats["attrs"].items()):
+            metric = f"bi_agent_span_{_metric_name(key)}_total"
+            lines.append(f'{metric}{{span="{name}"}} {value}')
+    for name, value in sorted(snapshot["counters"].items()):
+        lines.append(f"bi_agent_{_metric_name(name)}_total {value}")
+    return "\n".join(lines) + "\n"
+
+
+class LogExporter:
+    """
+    Prints the report, one block per export.
+    """
+    def export(self, snapshot):
+        print(format_report(snapshot))
+
+
+class JsonExporter:
+    """
+    Writes the latest snapshot to a JSON file, replacing it atomically.
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def export(self, snapshot):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class PrometheusExporter:
+    """
+    Serves GET /metrics in the Prometheus text format. Scrapes read the
+    tracer live, so export() has nothing to do.
+    """
+    def __init__(self, tracer, port=DEFAULT_PROMETHEUS_PORT, host="127.0.0.1"):
+        self.tracer = tracer
+        self.host = host
+        self.port = port
+        self._server = None
+
+    def start(self):
+        if self._server is not None:
+            return self
+        tracer = self.tracer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                data = format_prometheus(tracer.snapshot()).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="trace-metrics", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def export(self, snapshot):
+        pass
+
+
+def create_exporters(tracer=tracer):
+    """
+    Registers the exporters listed in MONDAY_TRACE_EXPORT on the tracer,
+    e.g. "log", "json:trace.json" or "log,prometheus:9464". Returns them.
+    """
+    exporters = []
+    for spec in filter(None, (part.strip() for part in os.getenv("MONDAY_TRACE_EXPORT", "").split(","))):
+        kind, _, arg = spec.partition(":")
+        kind = kind.lower()
+        if kind == "log":
+            exporter = LogExporter()
+        elif kind == "json":
+            exporter = JsonExporter(arg or "trace.json")
+        elif kind == "prometheus":
+            exporter = PrometheusExporter(tracer, int(arg) if arg else DEFAULT_PROMETHEUS_PORT).start()
+        else:
+            print(f"Ignoring unknown trace exporter '{spec}'.")
+            continue
+        exporters.append(tracer.add_exporter(exporter))
+    return exporters
@@ -7,9 +7,17 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from dotenv import load_dotenv
-from src.monday_api import MondayClient
-from src.data_processor import DataProcessor
-from src.analyzer import Analyzer
+from src.async_monday_api import create_client
+from src.ingest import create_board_frames
+from src.refresher import create_refresher
+from src.webhooks import create_webhook_server
+from src.report import create_leadership_report
+from src.service import create_analytics_server
+from src.query_cache import create_query_cache
+from src.router import FALLBACK_ANSWER, create_router
+from src.analyzer import AnalyzerVersions
+from src.service_client import RemoteAnalyzer, create_service_client
+from src.tracing import create_exporters, tracer
 
 # Page Config
 st.set_page_config(page_title="AI BI Agent", layout="wide")
@@ -18,70 +26,195 @@ st.set_page_config(page_title="AI BI Agent", layout="wide")
 load_dotenv()
 
 @st.cache_resource
+def get_service_client():
+    """
+    Client of the analytics service at MONDAY_SERVICE_URL, if set. The app
+    is then a thin client: it holds no boards and fetches nothing itself.
+    """
+    return create_service_client()
+
+@st.cache_resource
+def get_board_frames():
+    """
+    One board store per server process. It starts from the on-disk cache
+    when warm and keeps the syncer's snapshots, so "Refresh Data" only
+    downloads changed items. With a board registry, its boards are
+    ingested by the sharded loader.
+    """
+    return create_board_frames(create_client())
+
+@st.cache_resource
+def get_refresher():
+    """
+    The one background refresher of this server process. It re-syncs the
+    boards on a schedule and swaps the frames in, so sessions never wait
+    on Monday.com and never fetch the same boards twice.
+    """
+    return create_refresher(get_board_frames())
+
+@st.cache_resource
+def get_webhook_server():
+    """
+    Webhook receiver patching the shared board frames, when MONDAY_WEBHOOK_PORT is set.
+    """
+    return create_webhook_server(get_board_frames())
+
+@st.cache_resource
+def get_leadership_report():
+    """
+    Prerendered leadership report over the shared board frames, when MONDAY_REPORT_SCHEDULE is set.
+    """
+    return create_leadership_report(get_board_frames(), get_analyzers())
+
+@st.cache_resource
+def get_analytics_server():
+    """
+    Analytics service over the shared board frames, when MONDAY_SERVICE_PORT is set.
+    """
+    return create_analytics_server(get_board_frames(), get_query_cache(), get_leadership_report(), get_analyzers())
+
+def format_age(seconds):
+    if seconds < 90:
+        return f"{seconds:.0f}s"
+    if seconds < 90 * 60:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds / 3600:.1f} h"
+
+@st.cache_resource
+def get_query_cache():
+    """
+    Answers shared by every session, keyed by intent and data version.
+    """
+    return create_query_cache()
+
+@st.cache_resource
+def get_router():
+    """
+    The compiled query router, built once with the sectors of the first data loaded.
+    """
+    version, frames = get_board_frames().snapshot()
+    return create_router(get_analyzers().get(version, frames))
+
+@st.cache_resource
+def get_trace_exporters():
+    """
+    Exporters from MONDAY_TRACE_EXPORT, registered once per server process
+    so a Prometheus endpoint isn't bound again on every rerun.
+    """
+    return create_exporters()
+
+@st.cache_resource
+def get_analyzers():
+    """
+    One Analyzer per data version, shared by every rerun and session of the
+    server process. A session never sees another session's frames swapped
+    in, and a new version only recomputes the aggregates of frames that changed.
+    """
+    return AnalyzerVersions()
+
 def get_monday_data():
     """
-    Fetches data from Monday.com and returns processed DataFrames.
-    Cached to prevent re-fetching on every interaction.
+    Returns the data version and the processed DataFrames published with
+    it. The last good frames are served while a background refresh runs;
+    new frames show up on the next rerun.
     """
     api_key = os.getenv("MONDAY_API_KEY")
-    wo_board_id = os.getenv("WORK_ORDERS_BOARD_ID")
-    deals_board_id = os.getenv("DEALS_BOARD_ID")
 
-    if not api_key:
-        return None, None, "Missing API Key"
+    if not api_key and not os.getenv("MONDAY_BOARD_REGISTRY"):
+        return None, None, None, "Missing API Key"
 
-    client = MondayClient()
+    board_frames = get_board_frames()
     
     deals_df = pd.DataFrame()
     wo_df = pd.DataFrame()
+    version = None
     error = None
 
     try:
-        if deals_board_id:
-            deals_items = client.get_board_items(int(deals_board_id))
-            deals_cols = client.get_board_columns(int(deals_board_id))
-            deals_processor = DataProcessor(deals_items, deals_cols)
-            deals_df = deals_processor.clean_data()
-            
-        if wo_board_id:
-            wo_items = client.get_board_items(int(wo_board_id))
-            wo_cols = client.get_board_columns(int(wo_board_id))
-            wo_processor = DataProcessor(wo_items, wo_cols)
-            wo_df = wo_processor.clean_data()
+        version, frames = board_frames.snapshot()
+        deals_df = frames.get('deals', deals_df)
+        wo_df = frames.get('work_orders', wo_df)
             
     except Exception as e:
         error = str(e)
         
-    return deals_df, wo_df, error
+    return version, deals_df, wo_df, error
 
 # --- UI ---
 
 st.title("🤖 AI Business Intelligence Agent")
 
+service = get_service_client()
+
 with st.sidebar:
     st.header("Status")
-    if st.button("Refresh Data"):
-        st.cache_resource.clear()
-        st.rerun()
-        
+    if service is not None:
+        health = service.health()
+        if st.button("Refresh Data"):
+            st.info("The analytics service refreshes the boards on its own schedule.")
+        if health['age'] is not None:
+            st.caption(f"Data updated {format_age(health['age'])} ago (analytics service)")
+        if health['refreshing']:
+            st.caption("The service is refreshing in the background; rerun to see the new data.")
+        elif health['error']:
+            st.caption(f"Last refresh failed, showing the last good data: {health['error']}")
+        boards = [(board['role'], board['board_id'], board['source']) for board in health['boards']]
+    else:
+        board_frames = get_board_frames()
+        refresher = get_refresher()
+        webhook_server = get_webhook_server()
+        analytics_server = get_analytics_server()
+        if st.button("Refresh Data"):
+            # Runs in the background on the shared worker and keeps the
+            # syncer's snapshots, so the refresh is incremental
+            if refresher is not None:
+                refresher.trigger()
+            else:
+                board_frames.refresh_async()
+        if board_frames.age is not None:
+            st.caption(f"Data updated {format_age(board_frames.age)} ago")
+        if board_frames.refreshing:
+            st.caption("Refreshing in the background; rerun to see the new data.")
+        elif board_frames.error:
+            st.caption(f"Last refresh failed, showing the last good data: {board_frames.error}")
+        if webhook_server is not None:
+            patched = sum(webhook_server.patcher.stats[key] for key in ('created', 'updated', 'deleted'))
+            st.caption(f"Live updates on: {patched:,} item changes applied")
+        if analytics_server is not None:
+            st.caption(f"Serving analytics at {analytics_server.url}")
+        boards = [(role, board_id, (board_frames.sources or {}).get(board_id)) for role, board_id in board_frames.boards]
+
     st.markdown("---")
     st.markdown("**Connected Boards**:")
-    st.markdown(f"- Deals Board ID: `{os.getenv('DEALS_BOARD_ID')}`")
-    st.markdown(f"- Work Orders Board ID: `{os.getenv('WORK_ORDERS_BOARD_ID')}`")
+    for role, board_id, source in boards:
+        source = f" ({source})" if source else ""
+        st.markdown(f"- {role.replace('_', ' ').title()} Board ID: `{board_id}`{source}")
 
-# Fetch Data
-deals_df, wo_df, error = get_monday_data()
+    with st.expander("Diagnostics"):
+        # Filled in at the end of the script, once this rerun's spans are recorded
+        diagnostics = st.empty()
 
-if error:
-    st.error(f"Error fetching data: {error}")
-    st.stop()
-    
-if deals_df.empty and wo_df.empty:
-    st.warning("No data found. Please check your Board IDs.")
-    st.stop()
+if service is not None:
+    # The service answers from its own warm copy; frames are only fetched for the Raw Data tab
+    if not any(health['rows'].values()):
+        st.warning("No data found. Please check your Board IDs.")
+        st.stop()
+    analyzer = RemoteAnalyzer(service)
+else:
+    # Frames and version are read together, and the Analyzer of that version
+    # only ever holds those frames, so answers are filed under the right version
+    data_version, deals_df, wo_df, error = get_monday_data()
+
+    if error:
+        st.error(f"Error fetching data: {error}")
+        st.stop()
+        
+    if deals_df.empty and wo_df.empty:
+        st.warning("No data found. Please check your Board IDs.")
+        st.stop()
 
-# Initialize Analyzer
-analyzer = Analyzer(deals_df, wo_df)
+    # Aggregates are only recomputed for frames that changed
+    analyzer = get_analyzers().get(data_version, {'deals': deals_df, 'work_orders': wo_df})
 
 # Create Tabs
 tab1, tab2, tab3 = st.tabs(["📊 Dashboard", "💬 Ask AI", "💾 Raw Data"])
@@ -89,17 +222,12 @@ tab1, tab2, tab3 = st.tabs(["📊 Dashboard", "💬 Ask AI", "💾 Raw Data"])
 with tab1:
     st.subheader("Pipeline Snapshot")
     
-    # Metrics Logic (Quick extraction for UI)
-    total_pipeline_val = 0
-    avg_deal_size = 0
-    total_deals = len(deals_df) if not deals_df.empty else 0
-    
-    # Try using Analyzer helper or reuse logic (replicating briefly for UI specific display)
-    value_col = analyzer._find_column_by_similarity(deals_df, ['deal value', 'amount', 'price', 'revenue', 'value'])
-    if value_col and not deals_df.empty:
-         numeric_values = pd.to_numeric(deals_df[value_col], errors='coerce').fillna(0)
-         total_pipeline_val = numeric_values.sum()
-         avg_deal_size = numeric_values.mean()
+    # Metrics come precomputed from the Analyzer
+    pipeline = analyzer.pipeline_metrics()
+    operations = analyzer.operations_metrics()
+    total_deals = pipeline['total_deals'] if pipeline else 0
+    total_pipeline_val = pipeline['total_value'] if pipeline and pipeline['value_col'] else 0
+    avg_deal_size = pipeline['avg_value'] if pipeline and pipeline['value_col'] else 0
 
     col1, col2, col3 = st.columns(3)
     col1.metric("Total Deals", total_deals)
@@ -112,22 +240,42 @@ with tab1:
     
     with col_chart1:
         st.markdown("#### Deal Stages")
-        stage_col = analyzer._find_column_by_similarity(deals_df, ['stage', 'status', 'phase'])
-        if stage_col and not deals_df.empty:
-            stage_counts = deals_df[stage_col].value_counts()
-            st.bar_chart(stage_counts)
+        if pipeline and pipeline['stage_col']:
+            st.bar_chart(pipeline['stage_counts'])
         else:
             st.info("No Stage column found.")
 
     with col_chart2:
         st.markdown("#### Work Order Status")
-        wo_status_col = analyzer._find_column_by_similarity(wo_df, ['status', 'state'])
-        if wo_status_col and not wo_df.empty:
-            status_counts = wo_df[wo_status_col].value_counts()
-            st.bar_chart(status_counts)
+        if operations and operations['status_col']:
+            st.bar_chart(operations['status_counts'])
         else:
             st.info("No Status column found.")
 
+    st.markdown("---")
+    st.markdown("#### Trends")
+    period_labels = {"Month": "month", "Quarter": "quarter", "Rolling 30 days": "rolling_30d",
+                     "Rolling 90 days": "rolling_90d"}
+    period = period_labels[st.selectbox("Period", list(period_labels), index=1)]
+    pipeline_trend = analyzer.pipeline_trend(period)
+    throughput_trend = analyzer.throughput_trend(period)
+
+    col_trend1, col_trend2 = st.columns(2)
+
+    with col_trend1:
+        st.markdown("##### Pipeline Value by Close Date")
+        if pipeline_trend is not None and not pipeline_trend.empty:
+            st.line_chart(pipeline_trend[['value', 'won_value']])
+        else:
+            st.info("No dated deals found.")
+
+    with col_trend2:
+        st.markdown("##### Work Orders by Due Date")
+        if throughput_trend is not None and not throughput_trend.empty:
+            st.line_chart(throughput_trend[['total', 'done', 'blocked']])
+        else:
+            st.info("No dated work orders found.")
+
 with tab2:
     st.subheader("Ask the Agent")
     
@@ -145,26 +293,55 @@ with tab2:
             st.markdown(prompt)
 
         with st.chat_message("assistant"):
-            response = ""
-            user_input = prompt.lower()
-            
-            # Simple routing logic (same as CLI)
-            if 'update' in user_input or 'summary' in user_input:
-                response = analyzer.generate_leadership_update()
-            elif 'pipeline' in user_input or 'sales' in user_input or 'deal' in user_input:
-                response = analyzer.get_pipeline_benth()
-            elif 'operation' in user_input or 'work' in user_input or 'status' in user_input:
-                response = analyzer.get_operational_status()
+            # Same router as the CLI
+            if service is not None:
+                response = service.ask(prompt)['text']
+            elif (route := get_router().route(prompt)) is None:
+                response = FALLBACK_ANSWER
+            elif route.intent == 'leadership_update' and not route.params and get_leadership_report() is not None:
+                response = get_leadership_report().current()['text']
             else:
-                 response = "I'm not sure how to answer that. Try asking about 'pipeline', 'sales', 'operations', or 'update'."
+                # analyzer holds exactly the frames of data_version
+                response = get_query_cache().get_or_compute(route.intent, route.params, data_version,
+                                                            lambda: route.run(analyzer))
             
             st.markdown(response)
             st.session_state.messages.append({"role": "assistant", "content": response})
 
 with tab3:
     st.subheader("Raw Data Inspector")
+    if service is not None:
+        deals_df, wo_df = service.frame('deals'), service.frame('work_orders')
     st.write("Deals Data")
     st.dataframe(deals_df)
     
     st.write("Work Orders Data")
     st.dataframe(wo_df)
+
+# Diagnostics cover everything the process has done so far, this rerun included
+get_trace_exporters()
+snapshot = tracer.export()
+with diagnostics.container():
+    if service is not None:
+        st.caption(f"Analytics service at {service.base_url}: {service.stats['requests']:,} requests, "
+                   f"{service.stats['not_modified']:,} answered unchanged (304), data version {service.version}")
+        answers = health['answers']
+        st.caption(f"Service answer cache: {answers['hit_rate']:.0%} hit rate over "
+                   f"{answers['hits'] + answers['misses']:,} questions")
+    else:
+        api_stats = get_board_frames().stats
+        if api_stats is not None:
+            api = api_stats.summary()
+            st.caption(f"Monday API: {api['requests']} requests, {api['retries']} retries, "
+                       f"{api['bytes_received'] / 1024:,.0f} KB, p95 {api['latency_p95'] * 1000:,.0f} ms")
+        if snapshot['spans']:
+            st.dataframe(pd.DataFrame([
+                {'span': name, 'calls': stats['count'], 'total s': round(stats['total_s'], 3),
+                 'mean ms': round(stats['mean_ms'], 2), 'p95 ms': round(stats['p95_ms'], 2)}
+                for name, stats in sorted(snapshot['spans'].items(), key=lambda item: -item[1]['total_s'])
+            ]), hide_index=True)
+        answers = get_query_cache().stats()
+        st.caption(f"Answer cache: {answers['hit_rate']:.0%} hit rate over {answers['hits'] + answers['misses']:,} "
+                   f"questions, {answers['entries']}/{answers['max_entries']} entries")
+        for name, value in sorted(snapshot['counters'].items()):
+            st.caption(f"{name}: {value:,}")
@@ -0,0 +1,389 @@
+import base64
+import hashlib
+import hmac
+import ipaddress
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from src.data_processor import LIST_TYPES, clean_frame, item_id_values, normalize_dataframe
+from src.fetcher import with_source
+from src.sync import merge_items
+from src.tracing import tracer
+
+DEFAULT_WEBHOOK_PATH = "/monday/webhook"
+
+# Monday webhook event types, by what they do to a row
+CREATE_EVENTS = {"create_pulse"}
+UPDATE_EVENTS = {"update_column_value", "update_name"}
+DELETE_EVENTS = {"delete_pulse", "archive_pulse"}
+
+# Returned by cell_text for values that only carry IDs (people, tags), whose
+# text needs the item itself
+UNKNOWN = object()
+
+
+def cell_text(col_type, value):
+    """
+    The text Monday shows for a column value as sent in webhook events,
+    None for an empty cell, or UNKNOWN if it can't be told from the value.
+    """
+    if value is None or value == {} or value == "":
+        return None
+    if not isinstance(value, dict):
+        return str(value)
+
+    if col_type in ("status", "color"):
+        label = value.get("label")
+        return (label.get("text") if isinstance(label, dict) else label) or None
+    if col_type == "dropdown":
+        if "chosenValues" not in value:
+            return UNKNOWN
+        return ", ".join(choice["name"] for choice in value["chosenValues"]) or None
+    if col_type == "date":
+        if not value.get("date"):
+            return None
+        return f"{value['date']} {value['time']}" if value.get("time") else value["date"]
+    if col_type in LIST_TYPES:
+        return UNKNOWN
+    if "text" in value:
+        return value["text"] or None
+    if "value" in value:
+        return None if value["value"] in (None, "") else str(value["value"])
+    return UNKNOWN
+
+
+class WebhookPatcher:
+    """
+    Applies Monday webhook events to the role frames of a BoardFrames as
+    row-level patches, instead of re-downloading the board.
+
+    Event values are turned into the cell text Monday would return, then
+    normalized and cleaned like fetched items, so patched rows get the
+    same dtypes and labels as fetched ones. Each patch publishes a new version of the frames in
+    which only the affected role's frame is replaced, so only the
+    aggregates built from it are recomputed. Only when a value carries no
+    text (people, tags) or an updated item isn't in the frame yet is the
+    single item fetched from the API.
+    """
+    def __init__(self, board_frames, client=None):
+        self.board_frames = board_frames
+        self.client = client
+        self.stats = {"created": 0, "updated": 0, "deleted": 0, "ignored": 0, "fetched_items": 0}
+        self._schemas = {}
+        self._lock = threading.Lock()
+
+    def _role(self, board_id):
+        for role, configured in self.board_frames.boards:
+            if str(configured) == str(board_id):
+                return role
+        return None
+
+    def _client(self, board_id):
+        if self.client is not None:
+            return self.client
+        # Boards of other accounts need their own API key
+        loader = getattr(self.board_frames, "loader", None)
+        if loader is not None and hasattr(loader, "client_for"):
+            return loader.client_for(board_id)
+        return self.board_frames.client
+
+    def _schema(self, board_id):
+        """
+        {column_id: (title, type)} of a board, fetched once per process.
+        """
+        if board_id not in self._schemas:
+            client = self._client(board_id)
+            schema = client.get_board_schema(board_id) if client is not None else []
+            self._schemas[board_id] = {col["id"]: (col["title"], col["type"]) for col in schema}
+        return self._schemas[board_id]
+
+    def apply(self, event):
+        """
+        Applies one event (the "event" object of a webhook payload) and
+        returns what it did: created, updated, deleted or ignored.
+        """
+        event_type = event.get("type")
+        board_id = event.get("boardId")
+        item_id = event.get("pulseId", event.get("itemId"))
+        role = self._role(board_id)
+
+        result = "ignored"
+        if role is not None and item_id is not None:
+            with tracer.span("webhook.apply"), self._lock:
+                if event_type in DELETE_EVENTS:
+                    result = self._delete(role, str(item_id))
+                elif event_type in CREATE_EVENTS:
+                    result = self._create(role, board_id, str(item_id), event)
+                elif event_type in UPDATE_EVENTS:
+                    result = self._update(role, board_id, str(item_id), event)
+
+        self.stats[result] += 1
+        tracer.count(f"webhook.{result}")
+        return result
+
+    def _event_frame(self, board_id, item_id, event, values):
+        """
+        One-row frame of the item from {column_id: webhook value}, or None
+        if the text of a value can't be derived from the event.
+        """
+        schema = self._schema(board_id)
+        column_values = []
+        for col_id, value in values.items():
+            if col_id not in schema:
+                continue
+            title, col_type = schema[col_id]
+            text = cell_text(col_type, value)
+            if text is UNKNOWN:
+                return None
+            column_values.append({"id": col_id, "text": text, "type": col_type})
+
+        item = {"id": item_id, "name": event.get("pulseName"), "updated_at": event.get("triggerTime"),
+                "column_values": column_values}
+        return self._normalize(board_id, [item])
+
+    def _fetched_frame(self, board_id, item_id):
+        client = self._client(board_id)
+        items = client.get_items([item_id]) if client is not None else []
+        self.stats["fetched_items"] += 1
+        return self._normalize(board_id, items) if items else None
+
+    def _normalize(self, board_id, items):
+        schema = self._schema(board_id)
+        df, _ = clean_frame(normalize_dataframe(
+            items,
+            {col_id: title for col_id, (title, _) in schema.items()},
+            {col_id: col_type for col_id, (_, col_type) in schema.items()},
+        ))
+        # Role frames of registry boards tag each row with its board
+        sources = getattr(self.board_frames, "sources", None)
+        if sources and int(board_id) in sources:
+            df = with_source(df, sources[int(board_id)])
+        return df
+
+    def _create(self, role, board_id, item_id, event):
+        row = self._event_frame(board_id, item_id, event, event.get("columnValues") or {})
+        if row is None:
+            row = self._fetched_frame(board_id, item_id)
+        if row is None:
+            return "ignored"
+        self.board_frames.apply_patch(role, lambda frame: _upsert(frame, row))
+        return "created"
+
+    def _update(self, role, board_id, item_id, event):
+        frame = (self.board_frames.frames or {}).get(role)
+        if frame is None:
+            # Nothing loaded yet; the first load picks the change up
+            return "ignored"
+        if frame.empty or not _rows(frame, item_id).any():
+            return self._replace(role, board_id, item_id)
+
+        column_id = event.get("columnId")
+        if column_id == "name":
+            value = event.get("value") or {}
+            changes = {"name": value.get("name") if isinstance(value, dict) else value}
+        else:
+            title = self._schema(board_id).get(column_id, (None,))[0]
+            # Projected frames don't keep every column
+            if title not in frame.columns:
+                return "ignored"
+            row = self._event_frame(board_id, item_id, event, {column_id: event.get("value")})
+            if row is None:
+                return self._replace(role, board_id, item_id)
+            changes = {title: row[title].values}
+        changes["updated_at"] = event.get("triggerTime")
+
+        self.board_frames.apply_patch(role, lambda frame: _patch_row(frame, item_id, changes))
+        return "updated"
+
+    def _replace(self, role, board_id, item_id):
+        """
+        Upserts the item as the API returns it, for changes the event alone can't describe.
+        """
+        row = self._fetched_frame(board_id, item_id)
+        if row is None:
+            return "ignored"
+        self.board_frames.apply_patch(role, lambda frame: _upsert(frame, row))
+        return "updated"
+
+    def _delete(self, role, item_id):
+        frame = (self.board_frames.frames or {}).get(role)
+        if frame is None or frame.empty or not _rows(frame, item_id).any():
+            return "ignored"
+        self.board_frames.apply_patch(role, lambda frame: frame[~_rows(frame, item_id)].reset_index(drop=True))
+        return "deleted"
+
+
+def _rows(frame, item_id):
+    # Compacted frames keep IDs as ints
+    return (frame["id"] == item_id_values(frame["id"], [item_id])[0]).values
+
+
+def _upsert(frame, row):
+    # Projected frames only keep their own columns
+    if not frame.empty:
+        row = row[[col for col in row.columns if col in frame.columns]]
+    return merge_items(frame, row)
+
+
+def _patch_row(frame, item_id, changes):
+    row = frame[_rows(frame, item_id)].copy()
+    for col, values in changes.items():
+        if col in row.columns:
+            row[col] = values
+    return merge_items(frame, row)
+
+
+def _b64decode(part):
+    return base64.urlsafe_b64decode(part + "=" * (-len(part) % 4))
+
+
+def verify_signature(authorization, secret):
+    """
+    Whether authorization (the Authorization header of a webhook request)
+    is a JWT signed with secret, Monday's app signing secret, using HS256
+    and not expired.
+    """
+    token = (authorization or "").split()[-1] if authorization else ""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return False
+    try:
+        header = json.loads(_b64decode(parts[0]))
+        claims = json.loads(_b64decode(parts[1]))
+        signature = _b64decode(parts[2])
+    except ValueError:
+        return False
+    if not isinstance(header, dict) or header.get("alg") != "HS256" or not isinstance(claims, dict):
+        return False
+    expected = hmac.new(secret.encode(), f"{parts[0]}.{parts[1]}".encode(), hashlib.sha256).digest()
+    if not hmac.compare_digest(signature, expected):
+        return False
+    return not isinstance(claims.get("exp"), (int, float)) or claims["exp"] > time.time()
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class WebhookServer:
+    """
+    Receives Monday webhooks on path and hands their events to a
+    WebhookPatcher. Answers Monday's challenge handshake. With a token,
+    only requests carrying ?token=<token> are accepted; with a signing
+    secret, only requests whose Authorization JWT it signed (see
+    verify_signature). With both, either is enough.
+    """
+    def __init__(self, patcher, host="127.0.0.1", port=0, path=DEFAULT_WEBHOOK_PATH, token=None,
+                 signing_secret=None):
+        self.patcher = patcher
+        self.path = path
+        self.token = token
+        self.signing_secret = signing_secret
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{self.path}"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name="monday-webhooks", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _authorized(self, url, authorization):
+        if not self.token and not self.signing_secret:
+            return True
+        if self.token and hmac.compare_digest(parse_qs(url.query).get("token", [""])[0], self.token):
+            return True
+        return bool(self.signing_secret) and verify_signature(authorization, self.signing_secret)
+
+    def handle(self, target, body, authorization=None):
+        """
+        Answers one POST. Returns (status, payload).
+        """
+        url = urlparse(target)
+        if url.path != self.path:
+            return 404, {"error": "Not found"}
+        if not self._authorized(url, authorization):
+            return 403, {"error": "Invalid token"}
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "Invalid JSON"}
+
+        if "challenge" in payload:
+            return 200, {"challenge": payload["challenge"]}
+        if not isinstance(payload.get("event"), dict):
+            return 400, {"error": "Missing event"}
+        try:
+            return 200, {"result": self.patcher.apply(payload["event"])}
+        except Exception as e:
+            print(f"Error applying webhook event: {e}")
+            return 500, {"error": str(e)}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, payload = server.handle(self.path, body, self.headers.get("Authorization"))
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def create_webhook_server(board_frames):
+    """
+    Returns a started WebhookServer patching board_frames when
+    MONDAY_WEBHOOK_PORT is set, otherwise None.
+
+    It listens on MONDAY_WEBHOOK_HOST (default 127.0.0.1). Anyone reaching
+    it can rewrite the boards, so it refuses to listen beyond loopback
+    unless MONDAY_WEBHOOK_TOKEN or MONDAY_SIGNING_SECRET is set.
+    """
+    port = os.getenv("MONDAY_WEBHOOK_PORT")
+    if not port:
+        return None
+    host = os.getenv("MONDAY_WEBHOOK_HOST", "127.0.0.1")
+    token = os.getenv("MONDAY_WEBHOOK_TOKEN") or None
+    signing_secret = os.getenv("MONDAY_SIGNING_SECRET") or None
+    if not is_loopback(host) and not token and not signing_secret:
+        print(f"Not receiving webhooks on {host}: set MONDAY_WEBHOOK_TOKEN or MONDAY_SIGNING_SECRET "
+              f"to accept them beyond this machine.")
+        return None
+    return WebhookServer(
+        WebhookPatcher(board_frames),
+        host=host,
+        port=int(port),
+        path=os.getenv("MONDAY_WEBHOOK_PATH", DEFAULT_WEBHOOK_PATH),
+        token=token,
+        signing_secret=signing_secret,
+    ).start()
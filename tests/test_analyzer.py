@@ -0,0 +1,110 @@
+import threading
+import pandas as pd
+from src.analyzer import Analyzer, AnalyzerVersions
+
+
+def deals(values=(1000, 5000)):
+    return pd.DataFrame({
+        'id': [str(i) for i in range(len(values))],
+        'Stage': pd.Categorical(['Lead'] * len(values), categories=['Lead', 'Won']),
+        'Deal Value': list(values),
+    })
+
+
+def work_orders():
+    return pd.DataFrame({'id': ['1', '2'], 'Status': ['Done', 'Stuck'], 'Priority': ['High', 'Low']})
+
+
+def count_computations(monkeypatch):
+    calls = {'pipeline': 0, 'operations': 0}
+    pipeline = Analyzer._compute_pipeline_metrics
+    operations = Analyzer._compute_operations_metrics
+
+    def counting_pipeline(self):
+        calls['pipeline'] += 1
+        return pipeline(self)
+
+    def counting_operations(self):
+        calls['operations'] += 1
+        return operations(self)
+
+    monkeypatch.setattr(Analyzer, '_compute_pipeline_metrics', counting_pipeline)
+    monkeypatch.setattr(Analyzer, '_compute_operations_metrics', counting_operations)
+    return calls
+
+
+def test_aggregates_are_computed_once(monkeypatch):
+    calls = count_computations(monkeypatch)
+    analyzer = Analyzer(deals(), work_orders())
+
+    analyzer.get_pipeline_benth()
+    analyzer.get_operational_status()
+    update = analyzer.generate_leadership_update()
+
+    assert calls == {'pipeline': 1, 'operations': 1}
+    assert "Total Pipeline Value: $6,000.00" in update
+    assert analyzer.pipeline_metrics()['avg_value'] == 3000
+
+
+def test_replacing_a_frame_invalidates_only_its_aggregates(monkeypatch):
+    calls = count_computations(monkeypatch)
+    orders = work_orders()
+    analyzer = Analyzer(deals(), orders)
+    analyzer.generate_leadership_update()
+
+    analyzer.deals_df = deals((1, 2, 3))
+    analyzer.work_orders_df = orders
+    assert "Total Deals in Pipeline: 3" in analyzer.generate_leadership_update()
+    assert calls == {'pipeline': 2, 'operations': 1}
+
+
+def test_unused_categories_are_not_reported():
+    analyzer = Analyzer(deals())
+
+    assert dict(analyzer.pipeline_metrics()['stage_counts']) == {'Lead': 2}
+    assert "Won" not in analyzer.get_pipeline_benth()
+
+
+def test_swapping_frames_during_a_computation_never_keeps_a_stale_aggregate(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    compute = Analyzer._compute_pipeline_metrics
+
+    def slow_pipeline(self):
+        started.set()
+        release.wait(5)
+        return compute(self)
+
+    monkeypatch.setattr(Analyzer, '_compute_pipeline_metrics', slow_pipeline)
+    analyzer = Analyzer(deals(), work_orders())
+    results = []
+    reader = threading.Thread(target=lambda: results.append(analyzer.pipeline_metrics()['total_value']))
+    reader.start()
+    started.wait(5)
+
+    swapper = threading.Thread(target=setattr, args=(analyzer, 'deals_df', deals((1, 2))))
+    swapper.start()
+    release.set()
+    reader.join(5)
+    swapper.join(5)
+
+    assert results == [6000]
+    assert analyzer.pipeline_metrics()['total_value'] == 3
+
+
+def test_each_data_version_keeps_its_own_analyzer(monkeypatch):
+    calls = count_computations(monkeypatch)
+    analyzers = AnalyzerVersions()
+    orders = work_orders()
+    first = analyzers.get(1, {'deals': deals(), 'work_orders': orders})
+    first.get_operational_status()
+    assert analyzers.get(1, None) is first
+
+    second = analyzers.get(2, {'deals': deals((1, 2)), 'work_orders': orders})
+    assert first.pipeline_metrics()['total_value'] == 6000
+    assert second.pipeline_metrics()['total_value'] == 3
+    second.get_operational_status()
+    # The work orders frame was not replaced, so its aggregates carry over
+    assert calls['operations'] == 1
+
+    analyzers.get(3, {'deals': deals(), 'work_orders': orders})
+    assert analyzers.get(1, {'deals': deals((7,)), 'work_orders': orders}) is not first
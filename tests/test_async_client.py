@@ -0,0 +1,110 @@
+import asyncio
+import time
+import pytest
+from benchmarks.fake_monday import FakeMondayServer
+from benchmarks.synthetic import SyntheticBoard
+from src.async_monday_api import (HAS_AIOHTTP, AiohttpTransport, AsyncMondayClient, SyncMondayClient, ThreadTransport,
+                                  create_client)
+from src.fetcher import ColumnProjection, fetch_boards
+from src.monday_api import MondayClient
+from src.sync import IncrementalSync
+
+BOARD_IDS = [1, 2, 3, 4]
+OPTIONS = {'api_key': 'test-key', 'backoff_base': 0.0, 'backoff_max': 0.0}
+
+
+def boards(items=1200):
+    return {board_id: SyntheticBoard(items, board_id=board_id) for board_id in BOARD_IDS}
+
+
+TRANSPORTS = [
+    pytest.param(AiohttpTransport, marks=pytest.mark.skipif(not HAS_AIOHTTP, reason="aiohttp is not installed")),
+    ThreadTransport,
+]
+
+
+@pytest.mark.parametrize('transport', TRANSPORTS)
+def test_async_client_pages_through_board_despite_rate_limits(transport):
+    board = SyntheticBoard(1200, column_count=8)
+
+    async def fetch(url):
+        client = AsyncMondayClient(api_url=url, transport=transport, **OPTIONS)
+        assert isinstance(client.transport, transport)
+        try:
+            return await client.get_board_items(board.board_id), client.stats.summary()
+        finally:
+            await client.close()
+
+    with FakeMondayServer({board.board_id: board}, rate_limit_every=3) as server:
+        items, stats = asyncio.run(fetch(server.url))
+
+    assert [item['id'] for item in items] == [item['id'] for item in board.items()]
+    assert stats['retries'] == server.stats['throttled'] > 0
+
+
+@pytest.mark.parametrize('transport', TRANSPORTS)
+def test_next_page_is_in_flight_while_the_current_one_is_processed(transport):
+    board = SyntheticBoard(1500)
+
+    async def first_page(url, server):
+        client = AsyncMondayClient(api_url=url, transport=transport, **OPTIONS)
+        pages = client.iter_board_pages(board.board_id)
+        try:
+            async for items in pages:
+                await asyncio.sleep(0.3)
+                return len(items), server.stats['requests']
+        finally:
+            await pages.aclose()
+            await client.close()
+
+    with FakeMondayServer({board.board_id: board}) as server:
+        count, requests_sent = asyncio.run(first_page(server.url, server))
+
+    assert count == 500
+    assert requests_sent == 2
+
+
+def test_sync_wrapper_fetches_boards_concurrently_like_the_blocking_client(monkeypatch):
+    monkeypatch.setenv('MONDAY_BATCH_QUERIES', 'off')
+    projection = ColumnProjection([('deals', board_id) for board_id in BOARD_IDS])
+    with FakeMondayServer(boards(), latency=0.05) as server:
+        blocking = MondayClient(api_url=server.url, **OPTIONS)
+        started = time.perf_counter()
+        expected = fetch_boards(blocking, BOARD_IDS, max_workers=1, projection=projection)
+        serial = time.perf_counter() - started
+        blocking.close()
+
+        client = SyncMondayClient(api_url=server.url, max_concurrency=4, **OPTIONS)
+        # Requests only go through the async client's pool
+        assert not hasattr(client, 'session')
+        started = time.perf_counter()
+        fetched = fetch_boards(client, BOARD_IDS, projection=projection)
+        concurrent = time.perf_counter() - started
+        client.close()
+
+    assert concurrent < serial
+    assert client.stats.summary()['requests'] > 0
+    for board_id in BOARD_IDS:
+        df, columns_map = fetched[board_id]
+        assert df.equals(expected[board_id][0])
+        assert columns_map == expected[board_id][1]
+
+
+def test_sync_wrapper_drives_incremental_sync(tmp_path):
+    with FakeMondayServer(boards(600)) as server:
+        client = SyncMondayClient(api_url=server.url, **OPTIONS)
+        df = IncrementalSync(client, snapshot_dir=str(tmp_path)).sync(1)
+        count = client.get_board_items_count(1)
+        item_ids = client.get_board_item_ids(1)
+        client.close()
+
+    assert len(df) == count == len(item_ids) == 600
+    assert df['id'].tolist() == [int(item_id) for item_id in item_ids]
+
+
+def test_create_client_follows_env(monkeypatch):
+    assert type(create_client(api_key='test-key')) is MondayClient
+    monkeypatch.setenv('MONDAY_ASYNC_CLIENT', 'on')
+    client = create_client(api_key='test-key')
+    assert isinstance(client, SyncMondayClient)
+    client.close()
@@ -0,0 +1,81 @@
+from benchmarks.fake_monday import PAGE_COMPLEXITY, FakeMondayServer
+from benchmarks.synthetic import SyntheticBoard
+from src.fetcher import ColumnProjection, fetch_boards
+from src.monday_api import BoardRequest, ComplexityBudget, MondayClient
+from src.sync import IncrementalSync
+
+BOARD_IDS = list(range(1, 13))
+
+
+def boards(items=600):
+    return {board_id: SyntheticBoard(items, board_id=board_id) for board_id in BOARD_IDS}
+
+
+def make_client(server, **options):
+    return MondayClient(api_key="test-key", api_url=server.url, backoff_base=0.0, backoff_max=0.0, **options)
+
+
+def test_batched_fetch_matches_per_board_fetch_in_fewer_requests(monkeypatch):
+    with FakeMondayServer(boards()) as server:
+        client = make_client(server)
+        batched = fetch_boards(client, BOARD_IDS)
+        batched_requests = server.stats['requests']
+
+        monkeypatch.setenv('MONDAY_BATCH_QUERIES', 'off')
+        per_board = fetch_boards(client, BOARD_IDS)
+        client.close()
+
+    # 2 requests for schemas and first pages of 12 boards, 2 for their second pages
+    assert batched_requests == 4
+    assert server.stats['requests'] - batched_requests == 36
+    for board_id in BOARD_IDS:
+        df, columns_map = batched[board_id]
+        assert df.equals(per_board[board_id][0])
+        assert columns_map == per_board[board_id][1]
+
+
+def test_batches_shrink_to_the_complexity_budget():
+    with FakeMondayServer(boards(1200)) as server:
+        # Refills a page's worth every 0.5s, starting nearly spent
+        budget = ComplexityBudget(120 * PAGE_COMPLEXITY)
+        budget.spend(119 * PAGE_COMPLEXITY)
+        client = make_client(server, budget=budget)
+        batch = client.batch_boards([BoardRequest(board_id, schema=False) for board_id in BOARD_IDS[:3]])
+        pages = [board_id for board_id, _ in batch.pages()]
+        client.close()
+
+    assert sorted(pages) == [1, 1, 1, 2, 2, 2, 3, 3, 3]
+    # Once the budget is spent, each request only carries what has refilled
+    assert batch.requests_sent > 3
+    assert client.budget.waited > 0
+
+
+def test_projected_batch_only_fetches_projected_columns():
+    with FakeMondayServer(boards(10)) as server:
+        client = make_client(server)
+        projection = ColumnProjection([('deals', board_id) for board_id in BOARD_IDS[:2]])
+        fetched = fetch_boards(client, BOARD_IDS[:2], projection=projection)
+        client.close()
+
+    df, columns_map = fetched[1]
+    assert set(columns_map.values()) <= set(df.columns)
+    assert 'Notes 0' not in df.columns
+    assert server.stats['requests'] == 2
+
+
+def test_sync_many_brings_every_board_up_to_date_in_one_round(tmp_path):
+    with FakeMondayServer(boards()) as server:
+        client = make_client(server)
+        syncer = IncrementalSync(client, snapshot_dir=str(tmp_path))
+        first = syncer.sync_many(BOARD_IDS)
+        full_requests = server.stats['requests']
+
+        second = syncer.sync_many(BOARD_IDS)
+        client.close()
+
+    assert full_requests == 4
+    assert syncer.stats['full_syncs'] == 12 and syncer.stats['incremental_syncs'] == 12
+    # Changed items, schemas and counts of all boards: one request per 10 boards,
+    # plus second pages for the boards with more than 500 changes
+    assert server.stats['requests'] - full_requests <= 4
+    assert all(len(second[board_id]) == len(first[board_id]) == 600 for board_id in BOARD_IDS)
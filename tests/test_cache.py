@@ -0,0 +1,124 @@
+import os
+import time
+from datetime import datetime, timezone
+import pandas as pd
+from src import cache as cache_module
+from src.cache import BoardCache, schema_hash
+from src.fetcher import BoardFrames
+
+
+def make_frame(rows=3):
+    return pd.DataFrame({'id': [str(i) for i in range(rows)], 'Status': ['Open'] * rows, 'Value': [1.0] * rows})
+
+
+def test_roundtrip_keeps_schema_and_sync_time(tmp_path):
+    board_cache = BoardCache(str(tmp_path))
+    synced_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    board_cache.put(1, make_frame(), {'status': 'Status'}, synced_at)
+
+    entry = board_cache.get(1)
+    pd.testing.assert_frame_equal(entry.df, make_frame())
+    assert entry.columns_map == {'status': 'Status'}
+    assert entry.synced_at == synced_at
+    assert not entry.stale
+    assert board_cache.get(1, {'status': 'Status', 'value': 'Value'}) is None
+
+
+def test_schema_change_replaces_old_entry(tmp_path):
+    board_cache = BoardCache(str(tmp_path))
+    board_cache.put(1, make_frame(), {'status': 'Status'})
+    board_cache.put(1, make_frame(1), {'status': 'Stage'})
+
+    assert len(board_cache.get(1).df) == 1
+    assert not any(schema_hash({'status': 'Status'}) in name for name in os.listdir(tmp_path))
+
+
+def test_mixed_type_columns_fall_back_to_pickle(tmp_path):
+    board_cache = BoardCache(str(tmp_path))
+    df = pd.DataFrame({'id': ['1', '2'], 'Value': [1.0, 'n/a']})
+    board_cache.put(1, df, {})
+
+    assert list(board_cache.get(1).df['Value']) == [1.0, 'n/a']
+
+
+def test_ttl_marks_stale_and_max_age_evicts(tmp_path, monkeypatch):
+    board_cache = BoardCache(str(tmp_path), ttl=10, max_age=100)
+    board_cache.put(1, make_frame(), {})
+
+    now = time.time()
+    monkeypatch.setattr(cache_module.time, "time", lambda: now + 50)
+    assert board_cache.get(1).stale
+
+    monkeypatch.setattr(cache_module.time, "time", lambda: now + 500)
+    assert board_cache.get(1) is None
+
+
+def test_size_limit_evicts_least_recently_read(tmp_path):
+    board_cache = BoardCache(str(tmp_path))
+    board_cache.put(1, make_frame(), {})
+    board_cache.put(2, make_frame(), {})
+    data_files = {path.name.split("_")[1]: path for path in tmp_path.iterdir() if path.suffix != ".json"}
+    os.utime(data_files["1"], (0, 0))
+
+    # Room for two entries only
+    board_cache.max_bytes = data_files["2"].stat().st_size * 2
+    board_cache.put(3, make_frame(), {})
+
+    assert board_cache.get(1) is None
+    assert board_cache.get(2) is not None
+    assert board_cache.get(3) is not None
+    assert board_cache.stats["evictions"] == 1
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = 0
+
+    def iter_board_pages(self, board_id, column_ids=None):
+        self.calls += 1
+        yield [{'id': '9', 'name': 'Fresh', 'column_values': []}]
+
+    def get_board_columns(self, board_id):
+        return {}
+
+
+def test_board_frames_serves_stale_cache_while_refreshing(tmp_path):
+    board_cache = BoardCache(str(tmp_path), ttl=0)
+    board_cache.put(1, make_frame(), {})
+    client = CountingClient()
+    board_frames = BoardFrames(client, [('deals', 1)], cache=board_cache)
+
+    frames = board_frames.load()
+    assert list(frames['deals']['id']) == ['0', '1', '2']
+    assert board_frames.loaded_from_cache
+
+    board_frames.refresh_async().join()
+    assert client.calls == 1
+    assert board_frames.version == 2
+    assert list(board_frames.frames['deals']['id']) == [9]
+    assert list(board_cache.get(1).df['id']) == [9]
+
+
+def test_typed_columns_roundtrip(tmp_path):
+    board_cache = BoardCache(str(tmp_path))
+    df = pd.DataFrame({
+        'id': ['1', '2'],
+        'Stage': pd.Series(['Lead', 'Won'], dtype='category'),
+        'Owner': [['Ann', 'Bob'], []],
+        'Close Date': pd.to_datetime(['2026-03-31', None]),
+    })
+    board_cache.put(1, df, {})
+
+    restored = board_cache.get(1).df
+    assert isinstance(restored['Stage'].dtype, pd.CategoricalDtype)
+    assert list(restored['Owner']) == [['Ann', 'Bob'], []]
+    assert restored['Close Date'].dtype == df['Close Date'].dtype
+
+
+def test_column_types_survive_the_cache(tmp_path):
+    board_cache = BoardCache(str(tmp_path))
+    df = make_frame()
+    df.attrs['column_types'] = {'Status': 'status', 'Value': 'numbers'}
+    board_cache.put(1, df, {})
+
+    assert board_cache.get(1).df.attrs['column_types'] == {'Status': 'status', 'Value': 'numbers'}
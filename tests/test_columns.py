@@ -0,0 +1,51 @@
+import pandas as pd
+from src.columns import _resolve, frame_schema, resolve_columns, resolve_frame_columns
+from src.data_processor import apply_column_titles, normalize_dataframe
+
+
+def test_stage_keyword_beats_earlier_status_column():
+    schema = (('Status', 'status'), ('Deal Stage', 'status'), ('Amount', 'numbers'))
+
+    resolved = resolve_columns(schema)
+    assert resolved['stage'] == 'Deal Stage'
+    assert resolved['status'] == 'Status'
+    assert resolved['value'] == 'Amount'
+
+
+def test_matching_type_wins_over_title_only_match():
+    schema = (('Value Notes', 'text'), ('Deal Value', 'numbers'), ('Updates', 'text'), ('Owner', 'people'))
+
+    resolved = resolve_columns(schema)
+    assert resolved['value'] == 'Deal Value'
+    assert resolved['owner'] == 'Owner'
+    # 'date' must not match "Updates" by title alone
+    assert 'date' not in resolved
+
+
+def test_resolution_is_memoized_per_schema():
+    schema = (('Stage', 'status'),)
+    resolve_columns(schema)
+    before = _resolve.cache_info().hits
+
+    resolved = resolve_columns(schema)
+    resolved['value'] = 'mutated'
+    assert _resolve.cache_info().hits == before + 1
+    assert resolve_columns(schema) == {'stage': 'Stage'}
+
+
+def test_frame_types_come_from_monday_cells():
+    items = [{'id': '1', 'name': 'A', 'column_values': [
+        {'id': 'text1', 'text': 'Q1 deal', 'type': 'text'},
+        {'id': 'date4', 'text': 'soon', 'type': 'date'},
+    ]}]
+    df = apply_column_titles(normalize_dataframe(items), {'text1': 'Deal Value', 'date4': 'Close Date'})
+
+    assert dict(frame_schema(df)) == {'Deal Value': 'text', 'Close Date': 'date'}
+    # Unparseable dates stay text but keep their Monday type
+    assert resolve_frame_columns(df)['date'] == 'Close Date'
+
+
+def test_frames_without_types_fall_back_to_dtypes():
+    df = pd.DataFrame({'id': [1], 'Stage': ['Lead'], 'Value': [10]})
+
+    assert resolve_frame_columns(df) == {'value': 'Value', 'stage': 'Stage'}
@@ -0,0 +1,216 @@
+import pandas as pd
+from src.data_processor import (DataProcessor, align_dtypes, apply_column_titles, clean_frame, compact_dataframe,
+                                compact_numbers, normalize_dataframe, normalize_dataframe_rowwise)
+
+
+def cell(col_id, text, col_type):
+    return {'id': col_id, 'text': text, 'value': None, 'type': col_type}
+
+
+ITEMS = [
+    {'id': '1', 'name': 'Deal A', 'updated_at': '2026-01-01T00:00:00Z', 'column_values': [
+        cell('deal_value', '1,200.50', 'numbers'),
+        cell('stage', 'Lead', 'status'),
+        cell('close_date', '2026-03-31', 'date'),
+        cell('owner', 'Ann, Bob', 'people'),
+        cell('sector', 'Mining', 'dropdown'),
+        cell('notes', 'first', 'text'),
+    ]},
+    {'id': '2', 'name': 'Deal B', 'updated_at': '2026-01-02T00:00:00Z', 'column_values': [
+        cell('deal_value', '', 'numbers'),
+        cell('stage', 'Won', 'status'),
+        cell('close_date', '', 'date'),
+        cell('owner', '', 'people'),
+        cell('sector', 'Energy', 'dropdown'),
+        cell('notes', None, 'text'),
+    ]},
+]
+
+COLUMNS = {'deal_value': 'Deal Value', 'stage': 'Stage', 'close_date': 'Close Date',
+           'owner': 'Owner', 'sector': 'Sector', 'notes': 'Notes'}
+
+
+def values(series):
+    return [None if not isinstance(v, list) and pd.isna(v) else v for v in series]
+
+
+def test_columns_get_typed_dtypes():
+    df = normalize_dataframe(ITEMS, COLUMNS)
+
+    assert df['Deal Value'].dtype == 'float64'
+    assert df['Deal Value'].iloc[0] == 1200.5
+    assert pd.isna(df['Deal Value'].iloc[1])
+    assert isinstance(df['Stage'].dtype, pd.CategoricalDtype)
+    assert isinstance(df['Sector'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(df['Close Date'])
+    assert pd.isna(df['Close Date'].iloc[1])
+    assert list(df['Owner']) == [['Ann', 'Bob'], []]
+
+
+def test_matches_rowwise_path():
+    typed = normalize_dataframe(ITEMS, COLUMNS)
+    reference = normalize_dataframe_rowwise(ITEMS, COLUMNS)
+
+    assert list(typed.columns) == list(reference.columns)
+    for col in ['id', 'name', 'updated_at', 'Notes']:
+        assert values(typed[col]) == values(reference[col])
+    assert values(typed['Stage']) == values(reference['Stage'])
+    assert typed['Deal Value'].iloc[0] == reference['Deal Value'].iloc[0]
+    assert typed['Close Date'].iloc[0] == pd.Timestamp(reference['Close Date'].iloc[0])
+    assert ', '.join(typed['Owner'].iloc[0]) == reference['Owner'].iloc[0]
+
+
+def test_unparseable_numbers_are_kept_as_text():
+    items = [
+        {'id': '1', 'name': 'A', 'column_values': [cell('value', '10', 'numbers')]},
+        {'id': '2', 'name': 'B', 'column_values': [cell('value', 'TBD', 'numbers')]},
+        {'id': '3', 'name': 'C', 'column_values': []},
+    ]
+
+    assert values(normalize_dataframe(items)['value']) == [10.0, 'TBD', None]
+    assert values(normalize_dataframe_rowwise(items)['value']) == [10.0, 'TBD', None]
+
+
+def test_column_types_override_cell_types():
+    items = [{'id': '1', 'name': 'A', 'column_values': [cell('amount', '5', 'text')]}]
+
+    assert normalize_dataframe(items, column_types={'amount': 'numbers'})['amount'].dtype == 'float64'
+
+
+def test_from_pages_matches_single_pass():
+    streamed = DataProcessor.from_pages([ITEMS[:1], ITEMS[1:]], COLUMNS).get_dataframe()
+    whole = normalize_dataframe(ITEMS, COLUMNS)
+
+    assert list(streamed.columns) == list(whole.columns)
+    assert isinstance(streamed['Stage'].dtype, pd.CategoricalDtype)
+    assert values(streamed['Stage']) == values(whole['Stage'])
+    assert values(streamed['Owner']) == values(whole['Owner'])
+
+
+def test_apply_column_titles_keeps_last_duplicate():
+    df = pd.DataFrame({'id': ['1'], 'a': ['first'], 'b': ['second']})
+
+    titled = apply_column_titles(df, {'a': 'Status', 'b': 'Status'})
+    assert list(titled.columns) == ['id', 'Status']
+    assert titled['Status'].iloc[0] == 'second'
+
+
+def test_compaction_keeps_values_and_shrinks_dtypes():
+    df = pd.DataFrame({
+        'id': ['101', '102', '103', '104'],
+        'name': ['A', 'B', 'C', 'D'],
+        'Seats': [1.0, 2.0, 3.0, 4.0],
+        'Price': [1.5, 2.0, 3.0, None],
+        'Priority': ['High', 'Low', 'High', 'High'],
+        'Notes': ['a', 'b', 'c', None],
+        'Owner': [['Ann'], [], ['Bob'], ['Ann']],
+    })
+    df.attrs['column_types'] = {'Seats': 'numbers'}
+
+    compact = compact_dataframe(df)
+    assert compact['id'].dtype == 'int64'
+    assert compact['Seats'].dtype == 'int32'
+    assert compact['Price'].dtype == 'float64'
+    assert isinstance(compact['Priority'].dtype, pd.CategoricalDtype)
+    assert not isinstance(compact['Notes'].dtype, pd.CategoricalDtype)
+    assert values(compact['Owner']) == values(df['Owner'])
+    assert compact.attrs == df.attrs
+
+
+def test_whole_numbers_beyond_int64_stay_float():
+    assert compact_numbers(pd.Series([3e9, 2.0])).dtype == 'int64'
+    assert compact_numbers(pd.Series([3e9, 2.0])).tolist() == [3000000000, 2]
+    for huge in (1e19, -1e19, 2.0 ** 63):
+        kept = compact_numbers(pd.Series([huge, 2.0]))
+        assert kept.dtype == 'float64' and kept.tolist() == [huge, 2.0]
+
+
+def test_memory_report_compares_columns_before_and_after():
+    items = [dict(ITEMS[0], id=str(i)) for i in range(1, 51)]
+    processor = DataProcessor(items, COLUMNS)
+    report = processor.memory_report()
+
+    assert list(report.index) == list(processor.df.columns) + ['total']
+    assert report.loc['id', 'dtype_after'] == 'int64'
+    assert report.loc['Notes', 'dtype_after'] == 'category'
+    assert report.loc['total', 'bytes_after'] < report.loc['total', 'bytes_before']
+    assert DataProcessor(items, COLUMNS, compact=False).df['id'].tolist()[0] == '1'
+
+
+def test_duplicates_keep_the_latest_update():
+    items = [
+        {'id': '1', 'name': 'A old', 'updated_at': '2026-01-02T00:00:00Z', 'column_values': []},
+        {'id': '2', 'name': 'B', 'updated_at': '2026-01-01T00:00:00Z', 'column_values': []},
+        {'id': '1', 'name': 'A older', 'updated_at': '2026-01-01T00:00:00Z', 'column_values': []},
+        {'id': '2', 'name': 'B again', 'updated_at': '2026-01-01T00:00:00Z', 'column_values': []},
+    ]
+    processor = DataProcessor(items)
+
+    assert processor.df['name'].tolist() == ['A old', 'B again']
+    assert processor.quality['duplicates'] == 2
+
+
+def test_amounts_are_parsed_once():
+    texts = ['$1,200.50', '12.5%', '(300)', '1.2M', 'EUR 40', 'TBD', '', '7']
+    items = [{'id': str(i), 'name': 'A', 'column_values': [cell('value', text, 'numbers')]}
+             for i, text in enumerate(texts)]
+    processor = DataProcessor(items, compact=False)
+
+    assert values(processor.df['value']) == [1200.5, 0.125, -300.0, 1_200_000.0, 40.0, None, None, 7.0]
+    assert processor.df['value'].dtype == 'float64'
+    assert processor.quality['amounts_parsed'] == 5
+    assert processor.quality['invalid_amounts'] == 1
+
+
+def test_only_currency_text_columns_become_amounts():
+    df = pd.DataFrame({'id': ['1', '2'], 'Budget': ['$1,000', None], 'Zip': ['02134', '10001']})
+    cleaned, quality = clean_frame(df, labels={})
+
+    assert values(cleaned['Budget']) == [1000.0, None]
+    assert cleaned['Zip'].tolist() == ['02134', '10001']
+    assert quality['amounts_parsed'] == 1
+
+
+def test_labels_are_canonicalized():
+    stages = ['Closed Won', ' closed  won', 'Closed Won', 'WIP', '']
+    items = [{'id': str(i), 'name': 'A', 'column_values': [cell('stage', text, 'status')]}
+             for i, text in enumerate(stages)]
+    df, quality = clean_frame(normalize_dataframe(items), labels={'wip': 'Working on it'})
+
+    assert values(df['stage']) == ['Closed Won', 'Closed Won', 'Closed Won', 'Working on it', None]
+    assert list(df['stage'].cat.categories) == ['Closed Won', 'Working on it']
+    assert quality['labels_canonicalized'] == 3
+
+
+def test_text_stage_labels_are_canonicalized():
+    rows = [('Won', 'note a'), ('won ', 'note b'), ('WON', 'note c'), ('Lead', 'note d'), ('lead', None)]
+    items = [{'id': str(i), 'name': 'A', 'column_values': [cell('stage', stage, 'text'), cell('notes', note, 'text')]}
+             for i, (stage, note) in enumerate(rows)]
+    df, quality = clean_frame(normalize_dataframe(items, {'stage': 'Deal Stage', 'notes': 'Notes'}), labels={})
+
+    assert df['Deal Stage'].tolist() == ['Won', 'Won', 'Won', 'Lead', 'Lead']
+    assert not isinstance(df['Deal Stage'].dtype, pd.CategoricalDtype)
+    assert values(df['Notes']) == ['note a', 'note b', 'note c', 'note d', None]
+    assert quality['labels_canonicalized'] == 3
+    assert compact_dataframe(df)['Deal Stage'].value_counts().to_dict() == {'Won': 3, 'Lead': 2}
+
+
+def test_changed_rows_take_the_board_spelling():
+    board = pd.DataFrame({'id': [1, 2], 'Status': pd.Categorical(['Done', 'Stuck'])})
+    changed = pd.DataFrame({'id': ['2'], 'Status': pd.Categorical(['done'])})
+
+    aligned = align_dtypes(changed, board)
+    assert aligned['Status'].tolist() == ['Done']
+    assert aligned['id'].tolist() == [2]
+
+    text = pd.DataFrame({'id': ['2'], 'Status': ['STUCK ']})
+    assert align_dtypes(text, board)['Status'].tolist() == ['Stuck']
+
+
+def test_label_map_file(tmp_path, monkeypatch):
+    path = tmp_path / 'labels.json'
+    path.write_text('{"Working On It ": "In Progress"}')
+    monkeypatch.setenv('MONDAY_LABEL_MAP', str(path))
+    items = [{'id': '1', 'name': 'A', 'column_values': [cell('status', 'working on it', 'status')]}]
+
+    assert DataProcessor(items).df['status'].tolist() == ['In Progress']
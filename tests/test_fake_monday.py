@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+from benchmarks.fake_monday import FakeMondayServer
+from benchmarks.synthetic import SyntheticBoard
+from src.monday_api import MondayClient
+
+
+def serve(board, **options):
+    return FakeMondayServer({board.board_id: board}, **options)
+
+
+def make_client(server):
+    return MondayClient(api_key="test-key", api_url=server.url, backoff_base=0.0, backoff_max=0.0)
+
+
+def test_synthetic_items_are_deterministic():
+    board = SyntheticBoard(50, column_count=8, messiness=0.5, seed=3)
+
+    assert board.items(10, 20) == SyntheticBoard(50, column_count=8, messiness=0.5, seed=3).items(10, 20)
+    assert [col['id'] for col in board.schema()][-2:] == ['text_0', 'numbers_1']
+    assert board.item(0, column_ids=['owner'], with_value=False)['column_values'][0].keys() == {'id', 'text', 'type'}
+
+
+def test_client_pages_through_board_despite_rate_limits():
+    board = SyntheticBoard(1200, column_count=8)
+    with serve(board, rate_limit_every=3) as server:
+        client = make_client(server)
+        items = client.get_board_items(board.board_id)
+        client.close()
+
+    assert [item['id'] for item in items] == [item['id'] for item in board.items()]
+    assert server.stats['throttled'] > 0
+    assert client.stats.summary()['retries'] == server.stats['throttled']
+
+
+def test_projected_columns_and_updated_since_filter():
+    board = SyntheticBoard(120)
+    since = datetime(2026, 11, 30, tzinfo=timezone.utc)
+    with serve(board) as server:
+        client = make_client(server)
+        schema = client.get_board_schema(board.board_id)
+        items = client.get_board_items(board.board_id, updated_since=since, column_ids=['deal_value'])
+        client.close()
+
+    assert schema == board.schema()
+    assert items and all(item['updated_at'] > '2026-11-30' for item in items)
+    assert {cell['id'] for item in items for cell in item['column_values']} == {'deal_value'}
+    assert all('value' not in cell for item in items for cell in item['column_values'])
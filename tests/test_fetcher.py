@@ -0,0 +1,99 @@
+import threading
+import time
+from src.fetcher import ColumnProjection, fetch_boards, load_board_config, load_role_frames
+
+
+class SlowClient:
+    """
+    Stand-in for MondayClient that records how many calls overlap.
+    """
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def _enter(self):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+
+    def iter_board_pages(self, board_id, column_ids=None):
+        self._enter()
+        yield [{'id': f'{board_id}-1', 'name': f'Item {board_id}', 'column_values': [
+            {'id': 'status', 'text': 'Done', 'type': 'status'},
+        ]}]
+
+    def get_board_columns(self, board_id):
+        self._enter()
+        return {'status': 'Status'}
+
+
+def test_load_board_config_prefers_monday_boards(monkeypatch):
+    monkeypatch.setenv("MONDAY_BOARDS", "deals=1, deals=2,work_orders=3")
+    monkeypatch.setenv("DEALS_BOARD_ID", "99")
+    assert load_board_config() == [('deals', 1), ('deals', 2), ('work_orders', 3)]
+
+
+def test_load_board_config_falls_back_to_legacy_vars(monkeypatch):
+    monkeypatch.delenv("MONDAY_BOARDS", raising=False)
+    monkeypatch.setenv("DEALS_BOARD_ID", "10")
+    monkeypatch.setenv("WORK_ORDERS_BOARD_ID", "20")
+    assert load_board_config() == [('deals', 10), ('work_orders', 20)]
+
+
+def test_fetch_boards_respects_concurrency_limit():
+    client = SlowClient()
+    results = fetch_boards(client, [1, 2, 3], max_workers=2)
+
+    assert sorted(results) == [1, 2, 3]
+    assert client.max_in_flight == 2
+
+
+def test_load_role_frames_concatenates_boards_per_role():
+    frames = load_role_frames(SlowClient(delay=0), [('deals', 1), ('deals', 2), ('work_orders', 3)])
+
+    assert list(frames['deals']['id']) == ['1-1', '2-1']
+    assert list(frames['work_orders']['Status']) == ['Done']
+
+
+def test_projection_keeps_only_analytics_columns():
+    projection = ColumnProjection([('deals', 1), ('other', 2)])
+    schema = [
+        {'id': 'name', 'title': 'Name', 'type': 'name'},
+        {'id': 'status', 'title': 'Status', 'type': 'status'},
+        {'id': 'deal_stage', 'title': 'Deal Stage', 'type': 'status'},
+        {'id': 'notes', 'title': 'Updates', 'type': 'text'},
+        {'id': 'numbers', 'title': 'Deal Value', 'type': 'numbers'},
+        {'id': 'date4', 'title': 'Close Date', 'type': 'date'},
+    ]
+
+    assert projection.select(1, schema) == {'deal_stage': 'Deal Stage', 'numbers': 'Deal Value', 'date4': 'Close Date'}
+    assert projection.select(2, schema) is None
+
+
+def test_fetch_boards_requests_projected_columns():
+    class ProjectingClient(SlowClient):
+        def iter_board_pages(self, board_id, column_ids=None):
+            self.requested = column_ids
+            yield [{'id': '1', 'name': 'Order', 'column_values': [
+                {'id': 'status', 'text': 'Done', 'type': 'status'},
+            ]}]
+
+        def get_board_schema(self, board_id):
+            return [
+                {'id': 'status', 'title': 'Status', 'type': 'status'},
+                {'id': 'notes', 'title': 'Notes', 'type': 'text'},
+                {'id': 'urgency', 'title': 'Urgency', 'type': 'status'},
+            ]
+
+    client = ProjectingClient(delay=0)
+    results = fetch_boards(client, [3], projection=ColumnProjection([('work_orders', 3)]))
+
+    df, columns_map = results[3]
+    assert client.requested == ['status', 'urgency']
+    assert columns_map == {'status': 'Status', 'urgency': 'Urgency'}
+    assert list(df['Status']) == ['Done']
@@ -0,0 +1,100 @@
+import pytest
+from benchmarks.fake_monday import FakeMondayServer
+from benchmarks.synthetic import SyntheticBoard
+from src.analyzer import Analyzer
+from src.ingest import ShardedLoader, create_board_frames, plan_shards
+from src.monday_api import ComplexityBudget
+from src.registry import BoardRegistry, BoardSpec, Tenant
+
+
+def registry(emea_url, apac_url):
+    tenants = {
+        'emea': Tenant('emea', 'TEST_KEY_EMEA', emea_url, complexity_per_minute=6000, max_concurrency=4),
+        'apac': Tenant('apac', 'TEST_KEY_APAC', apac_url),
+    }
+    return BoardRegistry([
+        BoardSpec(1, 'deals', 'emea', 'EMEA'),
+        BoardSpec(2, 'deals', 'emea', 'EMEA North'),
+        BoardSpec(3, 'work_orders', 'emea'),
+        BoardSpec(4, 'deals', 'apac', 'APAC'),
+    ], tenants)
+
+
+@pytest.fixture
+def servers(monkeypatch, tmp_path):
+    monkeypatch.setenv('TEST_KEY_EMEA', 'emea-key')
+    monkeypatch.setenv('TEST_KEY_APAC', 'apac-key')
+    monkeypatch.setenv('MONDAY_SNAPSHOT_DIR', str(tmp_path))
+    monkeypatch.setenv('MONDAY_SYNC_MODE', 'full')
+    emea = FakeMondayServer({board_id: SyntheticBoard(30 * board_id, board_id=board_id) for board_id in (1, 2, 3)})
+    apac = FakeMondayServer({4: SyntheticBoard(40, board_id=4)})
+    with emea, apac:
+        yield emea, apac
+
+
+def test_shards_split_each_tenants_budget():
+    shards = plan_shards(registry(None, None), workers=4)
+
+    assert [(shard.tenant.name, shard.boards) for shard in shards] == [
+        ('emea', [('deals', 1), ('work_orders', 3)]),
+        ('emea', [('deals', 2)]),
+        ('apac', [('deals', 4)]),
+    ]
+    assert [shard.complexity_per_minute for shard in shards] == [3000, 3000, None]
+    assert [shard.max_workers for shard in shards[:2]] == [2, 2]
+    assert len(plan_shards(registry(None, None))) == 2
+
+
+def test_budget_waits_once_spent():
+    budget = ComplexityBudget(60_000)
+    budget.wait()
+    budget.spend(60_050)
+    budget.wait()
+    assert budget.waited > 0
+    budget.spend(0, remaining=10)
+    assert budget.tokens <= 10
+
+
+def test_boards_of_every_tenant_merge_into_role_frames(servers):
+    emea, apac = servers
+    loader = ShardedLoader(registry(emea.url, apac.url))
+    frames = loader.load()
+
+    deals = frames['deals']
+    assert len(deals) == 30 + 60 + 40
+    assert deals.groupby('source', observed=True).size().to_dict() == {'APAC': 40, 'EMEA': 30, 'EMEA North': 60}
+    assert len(frames['work_orders']) == 90
+    assert set(frames['work_orders']['source']) == {'emea:3'}
+    assert loader.client_for(4).api_key == 'apac-key'
+    assert loader.client_for(4).budget is None
+    assert loader.client_for(1).budget.points_per_minute == 6000
+    assert loader.stats.requests > 0
+    assert "Pipeline Value by Source:\n  - " in Analyzer(deals).get_pipeline_benth()
+
+
+def test_worker_processes_ingest_shards(servers):
+    emea, apac = servers
+    loader = ShardedLoader(registry(emea.url, apac.url), workers=2)
+    try:
+        frames = loader.load()
+    finally:
+        loader.close()
+
+    assert len(frames['deals']) == 130
+    assert frames['deals']['id'].is_unique
+
+
+def test_board_frames_use_the_registry_file(servers, monkeypatch, tmp_path):
+    emea, _ = servers
+    path = tmp_path / 'boards.json'
+    path.write_text('{"tenants": {"emea": {"api_key_env": "TEST_KEY_EMEA", "api_url": "%s"}},'
+                    ' "boards": [{"id": 1, "role": "deals", "tenant": "emea", "source": "EMEA"}]}' % emea.url)
+    monkeypatch.setenv('MONDAY_BOARD_REGISTRY', str(path))
+
+    board_frames = create_board_frames(client=None)
+    deals = board_frames.load()['deals']
+    assert set(deals['source']) == {'EMEA'}
+    # Diagnostics count the loader's requests, not the unused client's
+    assert board_frames.stats is board_frames.loader.stats and board_frames.stats.requests > 0
+    # The next start is served from the cache, still labelled
+    assert set(create_board_frames(client=None).load()['deals']['source']) == {'EMEA'}
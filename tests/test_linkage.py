@@ -0,0 +1,100 @@
+import pandas as pd
+from src import linkage
+from src.analyzer import Analyzer
+from src.data_processor import normalize_dataframe
+from src.linkage import LinkIndex
+
+
+def deal_items():
+    return [
+        {'id': '1', 'name': 'Alpha Mine', 'updated_at': 't1', 'column_values': [
+            {'id': 'stage', 'text': 'Closed Won', 'type': 'status'},
+            {'id': 'value', 'text': '1000', 'type': 'numbers'},
+        ]},
+        {'id': '2', 'name': 'Beta Solar', 'updated_at': 't1', 'column_values': [
+            {'id': 'stage', 'text': 'Proposal', 'type': 'status'},
+            {'id': 'value', 'text': '5000', 'type': 'numbers'},
+        ]},
+        {'id': '3', 'name': 'Gamma Farms', 'updated_at': 't1', 'column_values': [
+            {'id': 'stage', 'text': 'Closed Won', 'type': 'status'},
+            {'id': 'value', 'text': '2500', 'type': 'numbers'},
+        ]},
+    ]
+
+
+def order_items(beta_status='Stuck'):
+    return [
+        {'id': '101', 'name': 'Install pumps', 'updated_at': 't1', 'column_values': [
+            {'id': 'status', 'text': 'Done', 'type': 'status'},
+            {'id': 'deal', 'text': 'Alpha Mine', 'type': 'board_relation'},
+        ]},
+        {'id': '102', 'name': 'Panel survey', 'updated_at': 't1', 'column_values': [
+            {'id': 'status', 'text': beta_status, 'type': 'status'},
+            {'id': 'deal', 'text': 'beta solar', 'type': 'board_relation'},
+        ]},
+        {'id': '103', 'name': 'Gamma  Farms!', 'updated_at': 't1', 'column_values': [
+            {'id': 'status', 'text': 'Working on it', 'type': 'status'},
+            {'id': 'deal', 'text': '', 'type': 'board_relation'},
+        ]},
+    ]
+
+
+def deals():
+    return normalize_dataframe(deal_items(), {'stage': 'Stage', 'value': 'Deal Value'})
+
+
+def orders(beta_status='Stuck'):
+    return normalize_dataframe(order_items(beta_status), {'status': 'Status', 'deal': 'Deal'})
+
+
+def test_links_resolve_relations_and_fall_back_to_names():
+    pairs = LinkIndex().update(deals(), orders())
+
+    assert sorted(map(tuple, pairs.values.tolist())) == [
+        ('1', '101', 'relation'),
+        ('2', '102', 'relation'),
+        ('3', '103', 'name'),
+    ]
+
+
+def test_only_changed_rows_are_renormalized(monkeypatch):
+    index = LinkIndex()
+    index.update(deals(), orders())
+
+    normalized = []
+    normalize_names = linkage.normalize_names
+    monkeypatch.setattr(linkage, 'normalize_names', lambda series: normalized.append(len(series)) or normalize_names(series))
+    items = order_items()
+    items[2]['updated_at'] = 't2'
+    items[2]['column_values'][1]['text'] = 'Alpha Mine'
+    pairs = index.update(index.deals.frame, normalize_dataframe(items, {'status': 'Status', 'deal': 'Deal'}))
+
+    assert normalized == [1, 1]
+    assert sorted(map(tuple, pairs.values.tolist())) == [
+        ('1', '101', 'relation'),
+        ('1', '103', 'relation'),
+        ('2', '102', 'relation'),
+    ]
+
+
+def test_cross_board_metrics():
+    analyzer = Analyzer(deals(), orders())
+    metrics = analyzer.cross_board_metrics()
+
+    assert metrics['linked_deals'] == 3
+    assert metrics['revenue_at_risk'] == 5000
+    assert list(metrics['at_risk']['id']) == ['2']
+    assert (metrics['won_deals'], metrics['won_with_work_orders'], metrics['won_delivered']) == (2, 2, 1)
+    assert metrics['delivery_rate'] == 0.5
+    assert "Revenue at Risk from Blocked Work Orders: $5,000.00" in analyzer.generate_leadership_update()
+
+    analyzer.work_orders_df = orders(beta_status='Done')
+    assert analyzer.cross_board_metrics()['revenue_at_risk'] == 0
+
+
+def test_unlinked_boards_leave_the_update_unchanged():
+    analyzer = Analyzer(pd.DataFrame({'id': ['1'], 'name': ['Deal A'], 'Value': [1.0]}),
+                        pd.DataFrame({'id': ['9'], 'name': ['Order X'], 'Status': ['Stuck']}))
+
+    assert analyzer.cross_board_metrics() is None
+    assert "DEALS TO DELIVERY" not in analyzer.generate_leadership_update()
@@ -0,0 +1,148 @@
+import time
+import pytest
+import requests
+from src import monday_api
+from src.monday_api import MondayClient
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None, headers=None, text=""):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.headers = headers or {}
+        self.text = text
+        self.content = text.encode() or b"{}"
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def post(self, url, json=None, timeout=None):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(monday_api.time, "sleep", recorded.append)
+    return recorded
+
+
+def make_client(responses, max_retries=3):
+    client = MondayClient(api_key="test-key", max_retries=max_retries)
+    client.session = FakeSession(responses)
+    return client
+
+
+def test_retries_on_429_honouring_retry_after(sleeps):
+    ok = FakeResponse(payload={"data": {"boards": []}})
+    client = make_client([FakeResponse(429, headers={"Retry-After": "7"}), ok])
+
+    assert client.execute_query("query { boards { id } }") == {"data": {"boards": []}}
+    assert sleeps[0] >= 7
+    summary = client.stats.summary()
+    assert summary["requests"] == 2
+    assert summary["retries"] == 1
+    assert summary["failures"] == 0
+
+
+def test_retries_on_complexity_budget_error(sleeps):
+    exhausted = FakeResponse(payload={"errors": [{
+        "message": "Complexity budget exhausted, query cost 30001 budget remaining 10 out of 1000000 reset in 12 seconds"
+    }]})
+    ok = FakeResponse(payload={"data": {"complexity": {"before": 100, "after": 90}}})
+    client = make_client([exhausted, ok])
+
+    client.execute_query("query { complexity { before after } }")
+    assert sleeps[0] >= 12
+    assert client.stats.last_complexity == {"before": 100, "after": 90}
+
+
+def test_connection_errors_are_retried(sleeps):
+    ok = FakeResponse(payload={"data": {}})
+    client = make_client([requests.ConnectionError("reset"), ok])
+
+    client.execute_query("query { me { id } }")
+    assert client.stats.retries == 1
+
+
+def test_gives_up_after_max_retries(sleeps):
+    client = make_client([FakeResponse(503, text="unavailable")] * 3, max_retries=2)
+
+    with pytest.raises(Exception, match="unavailable"):
+        client.execute_query("query { me { id } }")
+    assert client.session.calls == 3
+    assert client.stats.failures == 1
+
+
+def test_graphql_errors_are_not_retried(sleeps):
+    client = make_client([FakeResponse(payload={"errors": [{"message": "Field 'foo' doesn't exist"}]})])
+
+    with pytest.raises(Exception, match="GraphQL Errors"):
+        client.execute_query("query { foo }")
+    assert sleeps == []
+
+
+def page(item_ids, cursor):
+    items = [{"id": item_id, "name": item_id, "updated_at": None, "column_values": []} for item_id in item_ids]
+    return FakeResponse(payload={"data": {"boards": [{"items_page": {"cursor": cursor, "items": items}}]}})
+
+
+def test_iter_board_pages_follows_cursor(sleeps):
+    client = make_client([page(["1", "2"], "c1"), page(["3"], None)])
+
+    assert list(client.iter_board_pages(42)) == [
+        [{"id": "1", "name": "1", "updated_at": None, "column_values": []},
+         {"id": "2", "name": "2", "updated_at": None, "column_values": []}],
+        [{"id": "3", "name": "3", "updated_at": None, "column_values": []}],
+    ]
+    assert client.session.calls == 2
+
+
+def test_prefetch_stays_at_most_one_page_ahead():
+    produced = []
+
+    def pages():
+        for number in range(5):
+            produced.append(number)
+            yield [number]
+
+    consumed = []
+    for items in monday_api.prefetch_pages(pages()):
+        time.sleep(0.02)
+        # The page being consumed, one queued and one being fetched
+        assert len(produced) - len(consumed) <= 3
+        consumed.append(items)
+
+    assert consumed == [[0], [1], [2], [3], [4]]
+
+
+def test_prefetch_reraises_producer_errors():
+    def pages():
+        yield [1]
+        raise RuntimeError("page 2 failed")
+
+    with pytest.raises(RuntimeError, match="page 2 failed"):
+        list(monday_api.prefetch_pages(pages()))
+
+
+def test_projected_query_requests_only_listed_columns(sleeps):
+    client = make_client([page(["1"], None)])
+    posted = []
+    post = client.session.post
+    client.session.post = lambda url, json=None, timeout=None: posted.append(json) or post(url, json, timeout)
+
+    list(client.iter_board_pages(42, column_ids=["status", "numbers"], prefetch=False))
+
+    assert posted[0]["variables"]["column_ids"] == ["status", "numbers"]
+    assert "column_values (ids: $column_ids)" in posted[0]["query"]
+    assert "value" not in posted[0]["query"].split("column_values")[1]
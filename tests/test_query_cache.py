@@ -0,0 +1,60 @@
+import threading
+from src.query_cache import QueryCache
+
+
+class Answers:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+def test_repeat_questions_hit_until_the_version_changes():
+    cache = QueryCache()
+    compute = Answers()
+
+    assert cache.get_or_compute('leadership_update', {}, 1, compute) == "answer 1"
+    assert cache.get_or_compute('leadership_update', {}, 1, compute) == "answer 1"
+    assert cache.get_or_compute('pipeline', {'quarter': 'Q3'}, 1, compute) == "answer 2"
+    assert cache.get_or_compute('leadership_update', {}, 2, compute) == "answer 3"
+
+    assert compute.calls == 3
+    assert cache.stats() == {'entries': 1, 'max_entries': 128, 'hits': 1, 'misses': 3, 'hit_rate': 0.25}
+
+
+def test_answers_from_older_data_are_not_stored():
+    cache = QueryCache()
+    cache.get_or_compute('pipeline', {}, 5, Answers())
+
+    assert cache.get_or_compute('pipeline', {}, 4, lambda: "old") == "old"
+    assert cache.get_or_compute('pipeline', {}, 4, lambda: "older") == "older"
+    assert cache.get_or_compute('pipeline', {}, 5, lambda: "fresh") == "answer 1"
+
+
+def test_least_recently_used_answers_are_evicted():
+    cache = QueryCache(max_entries=2)
+    for intent in ('pipeline', 'operations'):
+        cache.get_or_compute(intent, {}, 1, lambda: intent)
+    cache.get_or_compute('pipeline', {}, 1, lambda: "recomputed")
+    cache.get_or_compute('leadership_update', {}, 1, lambda: "update")
+
+    assert cache.get_or_compute('pipeline', {}, 1, lambda: "recomputed") == 'pipeline'
+    assert cache.get_or_compute('operations', {}, 1, lambda: "recomputed") == "recomputed"
+
+
+def test_shared_between_threads():
+    cache = QueryCache()
+    compute = Answers()
+    cache.get_or_compute('leadership_update', {}, 1, compute)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('leadership_update', {}, 1, compute)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["answer 1"] * 8
+    assert cache.stats()['hits'] == 8
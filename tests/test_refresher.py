@@ -0,0 +1,100 @@
+import threading
+import time
+import pandas as pd
+from src.fetcher import BoardFrames
+from src.refresher import AutoRefresher
+
+
+class SlowSyncer:
+    cache = None
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.synced = threading.Event()
+
+    def sync(self, board_id):
+        self.calls += 1
+        time.sleep(self.delay)
+        self.synced.set()
+        if self.fail:
+            raise Exception("Monday API Error: down")
+        return pd.DataFrame({'id': [str(self.calls)]})
+
+
+def test_concurrent_refreshes_share_one_fetch():
+    syncer = SlowSyncer(delay=0.2)
+    board_frames = BoardFrames(None, [('deals', 1)], syncer=syncer)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(board_frames.refresh())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert syncer.calls == 1
+    assert board_frames.version == 1
+    assert all(frames is results[0] for frames in results)
+    assert board_frames.age < 5
+
+
+def test_webhook_patch_does_not_skip_a_requested_refresh():
+    syncer = SlowSyncer()
+    board_frames = BoardFrames(None, [('deals', 1)], syncer=syncer)
+    board_frames.refresh()
+
+    # The patch lands while the refresh waits for the refresh lock
+    board_frames._refresh_lock.acquire()
+    refresh = threading.Thread(target=board_frames.refresh)
+    refresh.start()
+    time.sleep(0.05)
+    board_frames.apply_patch('deals', lambda df: df.iloc[:0])
+    board_frames._refresh_lock.release()
+    refresh.join(5)
+
+    assert syncer.calls == 2
+    assert board_frames.frames['deals']['id'].tolist() == ['2']
+
+
+def test_refresher_swaps_in_new_frames_on_schedule():
+    syncer = SlowSyncer()
+    board_frames = BoardFrames(None, [('deals', 1)], syncer=syncer)
+    board_frames.refresh()
+    board_frames.updated_at -= 60
+
+    refresher = AutoRefresher(board_frames, interval=30).start()
+    try:
+        assert syncer.synced.wait(5)
+        deadline = time.time() + 5
+        # The next run is scheduled a full interval after the refresh
+        while (refresher.next_refresh_at or 0) < time.time() + 20 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        refresher.stop(timeout=5)
+
+    assert list(board_frames.frames['deals']['id']) == ['2']
+    assert board_frames.version == 2
+    assert not refresher.running
+
+
+def test_failed_refresh_keeps_last_good_frames():
+    syncer = SlowSyncer()
+    board_frames = BoardFrames(None, [('deals', 1)], syncer=syncer)
+    frames = board_frames.refresh()
+    syncer.fail = True
+    syncer.synced.clear()
+
+    refresher = AutoRefresher(board_frames, interval=3600).start()
+    try:
+        refresher.trigger()
+        assert syncer.synced.wait(5)
+        deadline = time.time() + 5
+        while not board_frames.error and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        refresher.stop(timeout=5)
+
+    assert board_frames.frames is frames
+    assert board_frames.version == 1
+    assert "down" in board_frames.error
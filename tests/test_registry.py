@@ -0,0 +1,43 @@
+import json
+import pytest
+from src.registry import DEFAULT_TENANT, create_registry, load_registry
+
+
+def write(tmp_path, config):
+    path = tmp_path / 'boards.json'
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+def test_registry_maps_boards_to_roles_and_tenants(tmp_path):
+    registry = load_registry(write(tmp_path, {
+        'tenants': {'emea': {'api_key_env': 'KEY_EMEA', 'complexity_per_minute': 1000}},
+        'boards': [
+            {'id': 1, 'role': 'deals', 'tenant': 'emea', 'source': 'EMEA'},
+            {'id': '2', 'role': 'deals'},
+            {'id': 3, 'role': 'work_orders', 'tenant': 'emea'},
+        ],
+    }))
+
+    assert registry.boards == [('deals', 1), ('deals', 2), ('work_orders', 3)]
+    assert registry.sources() == {1: 'EMEA', 2: 'default:2', 3: 'emea:3'}
+    assert {name: [spec.board_id for spec in specs] for name, specs in registry.by_tenant().items()} == \
+        {'emea': [1, 3], DEFAULT_TENANT: [2]}
+    assert registry.tenants['emea'].complexity_per_minute == 1000
+    assert registry.multi_tenant
+
+
+def test_registry_rejects_unknown_tenants_and_options(tmp_path):
+    with pytest.raises(ValueError):
+        load_registry(write(tmp_path, {'boards': [{'id': 1, 'role': 'deals', 'tenant': 'apac'}]}))
+    with pytest.raises(ValueError):
+        load_registry(write(tmp_path, {'tenants': {'apac': {'api_key': 'secret'}}}))
+
+
+def test_registry_falls_back_to_board_variables(monkeypatch):
+    monkeypatch.delenv('MONDAY_BOARD_REGISTRY', raising=False)
+    monkeypatch.setenv('MONDAY_BOARDS', 'deals=10,work_orders=20')
+
+    registry = create_registry()
+    assert registry.boards == [('deals', 10), ('work_orders', 20)]
+    assert registry.path is None and not registry.multi_tenant
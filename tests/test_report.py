@@ -0,0 +1,171 @@
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+import pandas as pd
+import pytest
+from src.analyzer import Analyzer, AnalyzerVersions
+from src.fetcher import BoardFrames
+from src.report import LeadershipReport, ReportScheduler, frame_fingerprint, parse_schedule
+from src.service import AnalyticsServer, AnalyticsService
+
+
+class StaticSyncer:
+    cache = None
+
+    def sync(self, board_id):
+        if board_id == 2:
+            return pd.DataFrame({'id': [50, 51, 52], 'name': ['Alpha Mine', 'Beta Solar', 'Delta Port'],
+                                 'Status': pd.Categorical(['Done', 'Stuck', 'Working on it']),
+                                 'Tags': [['urgent'], [], ['site', 'urgent']]})
+        return pd.DataFrame({
+            'id': [1, 2, 3],
+            'name': ['Alpha Mine', 'Beta Solar', 'Gamma Farms'],
+            'Deal Stage': pd.Categorical(['Lead', 'Won', 'Lead']),
+            'Deal Value': [1000.0, 2000.0, 500.0],
+        })
+
+
+def board_frames():
+    frames = BoardFrames(None, [('deals', 1), ('work_orders', 2)], syncer=StaticSyncer())
+    frames.load()
+    return frames
+
+
+def drop_deal(item_id):
+    return lambda df: df[df['id'] != item_id].reset_index(drop=True)
+
+
+def test_first_render_writes_the_leadership_update(tmp_path):
+    frames = board_frames()
+    report = LeadershipReport(frames, str(tmp_path))
+    snapshot = report.render()
+
+    analyzer = Analyzer(frames.frames['deals'], frames.frames['work_orders'])
+    assert snapshot['text'] == analyzer.generate_leadership_update()
+    assert snapshot['deltas'] == []
+    assert not any(section['reused'] for section in snapshot['sections'])
+    assert sorted(os.listdir(tmp_path)) == ['leadership.html', 'leadership.json', 'leadership.md']
+    assert "## Sales & pipeline" in (tmp_path / 'leadership.md').read_text()
+    assert report.current() is snapshot
+
+
+def test_only_sections_of_changed_frames_are_rendered(tmp_path):
+    frames = board_frames()
+    report = LeadershipReport(frames, str(tmp_path))
+    first = report.render()
+
+    frames.apply_patch('deals', drop_deal(3))
+    second = report.render()
+    rendered = {section['key']: not section['reused'] for section in second['sections']}
+    assert rendered == {'pipeline': True, 'operations': False, 'cross_board': True}
+    assert second['previous_rendered_at'] == first['rendered_at']
+
+    deltas = {delta['label']: delta for delta in second['deltas']}
+    assert deltas['Total Pipeline Value']['change'] == -500.0
+    assert deltas['Deals: Lead']['previous'] == 2 and deltas['Deals: Lead']['current'] == 1
+    assert "Total Pipeline Value: $3,500.00 -> $3,000.00 (-$500.00)" in second['text']
+    assert json.loads((tmp_path / 'leadership.json').read_text())['deltas'] == second['deltas']
+
+
+def test_refetched_but_unchanged_data_keeps_the_snapshot(tmp_path):
+    frames = board_frames()
+    report = LeadershipReport(frames, str(tmp_path))
+    first = report.render()
+    etag = report.etag
+
+    frames.refresh()
+    assert report.render() is first
+    assert report.etag == etag and report.version == frames.version
+
+    # A restarted process serves the stored snapshot and reuses its sections
+    restarted = LeadershipReport(board_frames(), str(tmp_path))
+    assert restarted.current() == first
+    assert restarted.render() == first
+    assert restarted.etag == etag
+
+
+def test_fingerprint_follows_values_not_objects():
+    df = StaticSyncer().sync(2)
+    assert frame_fingerprint(df) == frame_fingerprint(StaticSyncer().sync(2))
+    changed = df.assign(Tags=[['urgent'], ['late'], ['site', 'urgent']])
+    assert frame_fingerprint(changed) != frame_fingerprint(df)
+
+
+def test_scheduler_renders_each_new_data_version(tmp_path):
+    frames = board_frames()
+    report = LeadershipReport(frames, str(tmp_path))
+    scheduler = ReportScheduler(report, poll=0.02).start()
+    try:
+        frames.apply_patch('deals', drop_deal(3))
+        deadline = time.time() + 5
+        while report.version != frames.version and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        scheduler.stop()
+    assert report.latest['version'] == frames.version
+    assert "Total Deals in Pipeline: 2" in report.latest['text']
+
+
+def test_restarted_scheduler_renders_before_the_next_scheduled_time(tmp_path):
+    LeadershipReport(board_frames(), str(tmp_path)).render()
+
+    frames = board_frames()
+    frames.apply_patch('deals', drop_deal(3))
+    report = LeadershipReport(frames, str(tmp_path))
+    assert report.version is None
+    # The next scheduled time is hours away at most, but the stored snapshot is stale now
+    now = time.localtime()
+    scheduler = ReportScheduler(report, [((now.tm_hour + 12) % 24, now.tm_min)]).start()
+    try:
+        deadline = time.time() + 5
+        while report.version != frames.version and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        scheduler.stop()
+    assert "Total Deals in Pipeline: 2" in report.latest['text']
+    assert [section['reused'] for section in report.latest['sections']] == [False, True, False]
+
+
+def test_report_shares_the_analyzer_of_its_data_version(tmp_path):
+    frames = board_frames()
+    analyzers = AnalyzerVersions()
+    report = LeadershipReport(frames, str(tmp_path), analyzers)
+    report.render()
+
+    analyzer = analyzers.get(frames.version, None)
+    assert 'pipeline_text' in analyzer._aggregates
+    service = AnalyticsService(frames, report=report)
+    assert service.analyzers is analyzers
+
+
+def test_parse_schedule():
+    assert parse_schedule('change') == []
+    assert parse_schedule('13:00, 07:30') == [(7, 30), (13, 0)]
+    with pytest.raises(ValueError):
+        parse_schedule('25:00')
+
+
+def test_service_serves_the_prerendered_report(tmp_path):
+    frames = board_frames()
+    report = LeadershipReport(frames, str(tmp_path))
+    with AnalyticsServer(AnalyticsService(frames, report=report)) as server:
+        with urllib.request.urlopen(server.url + '/leadership') as response:
+            payload = json.loads(response.read())
+            etag = response.headers['ETag']
+        assert payload['text'] == report.latest['text']
+        assert [section['key'] for section in payload['report']['sections']] == ['pipeline', 'operations', 'cross_board']
+
+        with urllib.request.urlopen(server.url + '/reports/leadership.md') as response:
+            assert response.headers['Content-Type'].startswith('text/markdown')
+            assert response.read() == (tmp_path / 'leadership.md').read_bytes()
+
+        request = urllib.request.Request(server.url + '/leadership', headers={'If-None-Match': etag})
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(request)
+        assert error.value.code == 304
+
+        # Scoped updates are still answered live
+        with urllib.request.urlopen(server.url + '/leadership?sector=mining') as response:
+            assert 'report' not in json.loads(response.read())
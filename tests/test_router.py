@@ -0,0 +1,56 @@
+from datetime import date
+import pandas as pd
+from src.analyzer import Analyzer
+from src.router import Router, create_router
+
+
+def route(query):
+    return Router(owners=['Asha Rao'], today=date(2026, 10, 17)).route(query)
+
+
+def test_intents_follow_precedence():
+    assert route("Give me a leadership update").intent == 'leadership_update'
+    assert route("Prepare a report for the board").intent == 'leadership_update'
+    assert route("Which won deals have stuck work orders?").intent == 'cross_board'
+    assert route("How are sales tracking?").intent == 'pipeline'
+    assert route("Any work orders overdue?").intent == 'operations'
+    assert route("What is our execution backlog?").intent == 'operations'
+    assert route("What's the weather?") is None
+
+
+def test_parameters_are_extracted():
+    assert route("Pipeline for Asha Rao in Q3").params == {'owner': 'Asha Rao', 'quarter': '2026-Q3'}
+    assert route("mining deals closing next quarter").params == {'sector': 'mining', 'quarter': '2027-Q1'}
+    assert route("revenue for Mining in Q1 2027").params == {'sector': 'mining', 'quarter': '2027-Q1'}
+    assert route("revenue last quarter").params == {'quarter': '2026-Q3'}
+    assert route("Deals owned by Ben Ortiz").params == {'owner': 'Ben Ortiz'}
+    assert route("Pipeline for Asha").params == {'owner': 'Asha'}
+
+
+def test_owners_are_not_read_from_other_phrases():
+    assert route("How is the pipeline looking for This Quarter?").params == {'quarter': '2026-Q4'}
+    assert route("Can I get the leadership update for Monday").params == {}
+    assert route("pipeline for Acme Corp").params == {}
+    assert route("Deals for Mining owned by Asha Rao").params == {'sector': 'mining', 'owner': 'Asha Rao'}
+
+
+def test_routes_run_on_a_scoped_analyzer():
+    deals = pd.DataFrame({
+        'id': ['1', '2', '3'],
+        'Deal Value': [100.0, 200.0, 400.0],
+        'Sector': pd.Categorical(['Mining', 'Mining', 'Space']),
+        'Owner': [['Asha Rao'], ['Ben Ortiz'], ['Asha Rao']],
+        'Close Date': pd.to_datetime(['2026-08-01', '2026-11-15', '2026-09-30']),
+    })
+    analyzer = Analyzer(deals)
+    router = create_router(analyzer)
+
+    assert "Total Pipeline Value: $700.00" in router.route("How is the pipeline?").run(analyzer)
+    assert "Total Pipeline Value: $500.00" in router.route("Pipeline for Asha Rao").run(analyzer)
+    assert "Total Pipeline Value: $300.00" in router.route("Pipeline in mining").run(analyzer)
+    assert router.route("Space deals?").params == {'sector': 'space'}
+    assert analyzer.owners() == ['Asha Rao', 'Ben Ortiz']
+    route = Router(owners=analyzer.owners(), today=date(2026, 10, 17)).route("deals for Asha Rao in Q3")
+    assert "Total Pipeline Value: $500.00" in route.run(analyzer)
+    route = Router(owners=analyzer.owners(), today=date(2026, 10, 17)).route("Pipeline for This Quarter?")
+    assert "Total Pipeline Value: $200.00" in route.run(analyzer)
@@ -0,0 +1,129 @@
+import json
+import urllib.error
+import urllib.request
+import pandas as pd
+import pytest
+from src.fetcher import BoardFrames
+from src.service import AnalyticsServer, AnalyticsService, create_analytics_server
+from src.service_client import RemoteAnalyzer, ServiceClient
+
+
+class StaticSyncer:
+    cache = None
+
+    def __init__(self):
+        self.calls = 0
+
+    def sync(self, board_id):
+        self.calls += 1
+        if board_id == 2:
+            return pd.DataFrame({'id': [50, 51], 'Status': pd.Categorical(['Done', 'Stuck']),
+                                 'Due Date': pd.to_datetime(['2026-02-01', '2026-05-01'])})
+        return pd.DataFrame({
+            'id': [1, 2, 3],
+            'name': ['Alpha Mine', 'Beta Solar', 'Gamma Farms'],
+            'Deal Stage': pd.Categorical(['Lead', 'Won', 'Lead']),
+            'Deal Value': [1000.0, 2000.0, 500.0],
+            'Close Date': pd.to_datetime(['2026-01-15', '2026-04-10', '2026-04-20']),
+            'Sector': ['Mining', 'Energy', 'Mining'],
+        })
+
+
+@pytest.fixture
+def served():
+    syncer = StaticSyncer()
+    board_frames = BoardFrames(None, [('deals', 1), ('work_orders', 2)], syncer=syncer)
+    with AnalyticsServer(AnalyticsService(board_frames)) as server:
+        yield board_frames, syncer, server
+
+
+def get(url, etag=None):
+    request = urllib.request.Request(url, headers={'If-None-Match': etag} if etag else {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            body = response.read()
+            return response.status, json.loads(body) if body else None, response.headers.get('ETag')
+    except urllib.error.HTTPError as e:
+        body = e.read()
+        return e.code, json.loads(body) if body else None, e.headers.get('ETag')
+
+
+def test_endpoints_answer_from_one_warm_copy(served):
+    board_frames, syncer, server = served
+
+    status, pipeline, _ = get(server.url + '/pipeline')
+    assert status == 200
+    assert "Total Pipeline Value: $3,500.00" in pipeline['text']
+    assert pipeline['metrics']['stage_counts']['data'] == [2, 1]
+    assert "Total Work Orders: 2" in get(server.url + '/operations')[1]['text']
+    assert "EXECUTIVE LEADERSHIP UPDATE" in get(server.url + '/leadership')[1]['text']
+    assert "Total Pipeline Value: $1,500.00" in get(server.url + '/pipeline?sector=mining')[1]['text']
+    assert get(server.url + '/ask?q=How+is+the+pipeline')[1]['intent'] == 'pipeline'
+    assert syncer.calls == 2
+
+    health = get(server.url + '/health')[1]
+    assert health['rows'] == {'deals': 3, 'work_orders': 2}
+    assert get(server.url + '/trends?period=weekly')[0] == 400
+    assert get(server.url + '/nope')[0] == 404
+
+
+def test_etag_follows_the_data_version(served):
+    board_frames, _, server = served
+
+    status, _, etag = get(server.url + '/pipeline')
+    assert get(server.url + '/pipeline', etag) == (304, None, etag)
+
+    board_frames.apply_patch('deals', lambda df: df[df['id'] != 3].reset_index(drop=True))
+    status, pipeline, new_etag = get(server.url + '/pipeline', etag)
+    assert status == 200 and new_etag != etag
+    assert "Total Pipeline Value: $3,000.00" in pipeline['text']
+
+
+def test_writes_are_refused(served):
+    _, _, server = served
+    request = urllib.request.Request(server.url + '/pipeline', b'{}', method='POST')
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request)
+    assert error.value.code == 405
+
+
+def test_thin_client_revalidates_and_rebuilds_frames(served):
+    board_frames, _, server = served
+    client = ServiceClient(server.url)
+
+    first = client.pipeline()
+    assert client.pipeline() == first
+    assert client.stats == {'requests': 2, 'not_modified': 1}
+    assert client.version == board_frames.version
+
+    remote = RemoteAnalyzer(client)
+    assert remote.pipeline_metrics()['stage_counts'].to_dict() == {'Lead': 2, 'Won': 1}
+    trend = remote.pipeline_trend('quarter')
+    assert trend['value'].tolist() == [1000.0, 2500.0]
+    assert isinstance(trend.index, pd.DatetimeIndex)
+    assert client.frame('deals')['name'].tolist() == ['Alpha Mine', 'Beta Solar', 'Gamma Farms']
+    assert client.ask('what is the weather')['intent'] is None
+    client.close()
+
+
+def test_token_is_required_and_sent_by_the_client():
+    board_frames = BoardFrames(None, [('deals', 1), ('work_orders', 2)], syncer=StaticSyncer())
+    with AnalyticsServer(AnalyticsService(board_frames), token='s3cret') as server:
+        assert get(server.url + '/frames/deals')[0] == 401
+        assert get(server.url + '/health')[0] == 401
+        with pytest.raises(Exception, match='Invalid token'):
+            ServiceClient(server.url, token='wrong').health()
+        client = ServiceClient(server.url, token='s3cret')
+        assert client.frame('deals')['id'].tolist() == [1, 2, 3]
+        client.close()
+
+
+def test_service_stays_on_loopback_without_a_token(monkeypatch):
+    board_frames = BoardFrames(None, [('deals', 1), ('work_orders', 2)], syncer=StaticSyncer())
+    monkeypatch.setenv('MONDAY_SERVICE_PORT', '0')
+    monkeypatch.setenv('MONDAY_SERVICE_HOST', '0.0.0.0')
+    assert create_analytics_server(board_frames) is None
+    monkeypatch.setenv('MONDAY_SERVICE_TOKEN', 's3cret')
+    server = create_analytics_server(board_frames)
+    assert server is not None and server.token == 's3cret'
+    server.stop()
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from src.sync import IncrementalSync
+
+
+def make_item(item_id, status, updated_at="2026-01-01T00:00:00Z"):
+    return {'id': item_id, 'name': f'Item {item_id}', 'updated_at': updated_at, 'column_values': [
+        {'id': 'status', 'text': status, 'type': 'status'},
+    ]}
+
+
+class FakeBoardClient:
+    """
+    In-memory board that answers the MondayClient calls IncrementalSync makes.
+    """
+    def __init__(self, items):
+        self.items = {item['id']: item for item in items}
+        self.changed = set()
+        self.calls = []
+
+    def get_board_columns(self, board_id):
+        return {'status': 'Status'}
+
+    def iter_board_pages(self, board_id, updated_since=None, column_ids=None):
+        self.calls.append(('items', updated_since is not None))
+        if updated_since is None:
+            yield list(self.items.values())
+        else:
+            yield [self.items[item_id] for item_id in self.changed if item_id in self.items]
+
+    def get_board_items_count(self, board_id):
+        return len(self.items)
+
+    def get_board_item_ids(self, board_id):
+        self.calls.append(('ids',))
+        return list(self.items)
+
+
+def test_incremental_sync_merges_changes_and_deletions(tmp_path):
+    client = FakeBoardClient([make_item('1', 'Open'), make_item('2', 'Open'), make_item('3', 'Open')])
+    syncer = IncrementalSync(client, snapshot_dir=str(tmp_path))
+
+    df = syncer.sync(42)
+    assert len(df) == 3
+    assert syncer.stats['full_syncs'] == 1
+
+    client.items['2'] = make_item('2', 'Done')
+    client.items['4'] = make_item('4', 'Open')
+    del client.items['3']
+    client.changed = {'2', '4'}
+
+    df = syncer.sync(42).set_index('id')
+    assert sorted(df.index) == [1, 2, 4]
+    assert df.loc[2, 'Status'] == 'Done'
+    assert syncer.stats['incremental_syncs'] == 1
+    assert syncer.stats['deleted_items'] == 1
+    assert ('items', True) in client.calls
+
+
+def test_snapshot_survives_restart(tmp_path):
+    client = FakeBoardClient([make_item('1', 'Open')])
+    IncrementalSync(client, snapshot_dir=str(tmp_path)).sync(7)
+
+    restarted = IncrementalSync(client, snapshot_dir=str(tmp_path))
+    df = restarted.sync(7)
+
+    assert list(df['id']) == [1]
+    assert restarted.stats['full_syncs'] == 0
+    assert restarted.snapshots[7].synced_at <= datetime.now(timezone.utc)
+    # Count matched, so no ID scan was needed
+    assert ('ids',) not in client.calls
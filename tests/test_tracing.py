@@ -0,0 +1,105 @@
+import json
+import urllib.request
+import pandas as pd
+from src import tracing
+from src.analyzer import Analyzer
+from src.monday_api import MondayClient
+from src.tracing import JsonExporter, PrometheusExporter, Tracer, create_exporters, format_prometheus, format_report
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.status_code = 200
+        self._payload = payload
+        self.headers = {}
+        self.content = json.dumps(payload).encode()
+        self.text = self.content.decode()
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def post(self, url, json=None, timeout=None):
+        return self.responses.pop(0)
+
+
+def test_spans_aggregate_durations_and_numeric_attributes():
+    tracer = Tracer()
+    for size in (100, 300):
+        with tracer.span("fetch", bytes=size, board="deals") as span:
+            span.set(pages=1)
+    tracer.count("cache.hits", 2)
+
+    snapshot = tracer.snapshot()
+    assert snapshot["spans"]["fetch"]["count"] == 2
+    assert snapshot["spans"]["fetch"]["attrs"] == {"bytes": 400, "pages": 2}
+    assert snapshot["counters"] == {"cache.hits": 2}
+    assert "fetch" in format_report(snapshot)
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False)
+    with tracer.span("fetch"):
+        tracer.count("cache.hits")
+
+    assert tracer.snapshot() == {"spans": {}, "counters": {}}
+
+
+def test_exporters_write_json_and_serve_prometheus_text(tmp_path):
+    tracer = Tracer()
+    path = str(tmp_path / "trace.json")
+    tracer.add_exporter(JsonExporter(path))
+    prometheus = tracer.add_exporter(PrometheusExporter(tracer, port=0).start())
+    with tracer.span("analyzer.get_pipeline_benth"):
+        tracer.count("cache.misses")
+
+    try:
+        snapshot = tracer.export()
+        with urllib.request.urlopen(f"http://127.0.0.1:{prometheus.port}/metrics") as response:
+            text = response.read().decode()
+    finally:
+        prometheus.stop()
+
+    with open(path) as f:
+        assert json.load(f) == json.loads(json.dumps(snapshot))
+    assert text == format_prometheus(tracer.snapshot())
+    assert 'bi_agent_span_seconds_count{span="analyzer.get_pipeline_benth"} 1' in text
+    assert "bi_agent_cache_misses_total 1" in text
+
+
+def test_create_exporters_reads_the_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("MONDAY_TRACE_EXPORT", f"log, json:{tmp_path / 'trace.json'}, bogus")
+    tracer = Tracer()
+
+    exporters = create_exporters(tracer)
+
+    assert [type(exporter).__name__ for exporter in exporters] == ["LogExporter", "JsonExporter"]
+    assert tracer.exporters == exporters
+
+
+def test_hot_paths_are_instrumented():
+    tracing.tracer.reset()
+    client = MondayClient(api_key="test-key")
+    client.session = FakeSession([FakeResponse({"data": {
+        "complexity": {"query": 120, "after": 9000},
+        "boards": [{"items_page": {"cursor": None, "items": [{"id": "1", "name": "A", "column_values": []}]}}],
+    }})])
+    assert len(client.get_board_items(1)) == 1
+
+    analyzer = Analyzer(pd.DataFrame({'id': ['1'], 'Deal Value': [5.0]}))
+    analyzer.generate_leadership_update()
+    analyzer.generate_leadership_update()
+
+    snapshot = tracing.tracer.snapshot()
+    query = snapshot["spans"]["monday.execute_query"]
+    assert query["count"] == 1
+    assert query["attrs"]["complexity"] == 120
+    assert query["attrs"]["bytes"] > 0
+    assert {"monday.http", "monday.decode_json", "analyzer.get_pipeline_benth"} <= set(snapshot["spans"])
+    assert snapshot["spans"]["analyzer.generate_leadership_update"]["count"] == 2
+    assert snapshot["counters"]["monday.pages"] == 1
+    assert snapshot["counters"]["analyzer.cache.hits"] > 0
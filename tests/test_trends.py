@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.analyzer import Analyzer
+
+
+def deals():
+    return pd.DataFrame({
+        'id': ['1', '2', '3', '4', '5'],
+        'Stage': pd.Categorical(['Won', 'Lost', 'Won', 'Lead', 'Lead']),
+        'Deal Value': [100.0, 200.0, 400.0, 800.0, 50.0],
+        'Close Date': pd.to_datetime(['2026-01-10', '2026-02-20', '2026-04-05', '2026-04-30', None]),
+    })
+
+
+def work_orders():
+    return pd.DataFrame({
+        'id': ['1', '2', '3'],
+        'Status': ['Done', 'Stuck', 'Working on it'],
+        'Due Date': pd.to_datetime(['2026-03-01', '2026-03-15', '2026-05-01']),
+    })
+
+
+def test_pipeline_trend_by_quarter_and_month():
+    analyzer = Analyzer(deals(), work_orders())
+
+    quarters = analyzer.pipeline_trend('quarter')
+    assert list(quarters.index) == [pd.Timestamp('2026-01-01'), pd.Timestamp('2026-04-01')]
+    assert quarters['deals'].tolist() == [2, 2]
+    assert quarters['value'].tolist() == [300.0, 1200.0]
+    assert quarters['won_value'].tolist() == [100.0, 400.0]
+    assert quarters['win_rate'].tolist() == [0.5, 1.0]
+
+    months = analyzer.pipeline_trend('month')
+    assert months['deals'].tolist() == [1, 1, 0, 2]
+    # Months without decided deals have no win rate
+    assert np.isnan(months['win_rate'].iloc[2])
+
+
+def test_rolling_trend_sums_a_trailing_window():
+    analyzer = Analyzer(deals(), work_orders())
+
+    rolling = analyzer.throughput_trend('rolling_30d')
+    assert rolling.loc['2026-03-15', 'total'] == 2
+    assert rolling.loc['2026-03-31', 'total'] == 1
+    assert rolling.loc['2026-03-15', 'done_rate'] == 0.5
+    assert rolling['blocked'].max() == 1
+
+
+def test_trends_are_cached_per_period_and_invalidated_with_their_frame():
+    analyzer = Analyzer(deals(), work_orders())
+    quarters = analyzer.pipeline_trend('quarter')
+    throughput = analyzer.throughput_trend('quarter')
+
+    assert analyzer.pipeline_trend('quarter') is quarters
+    assert analyzer.pipeline_trend('month') is not quarters
+
+    analyzer.deals_df = deals().iloc[:2]
+    assert analyzer.pipeline_trend('quarter')['deals'].tolist() == [2]
+    assert analyzer.throughput_trend('quarter') is throughput
+
+
+def test_unknown_period_and_undated_boards():
+    analyzer = Analyzer(deals().drop(columns='Close Date'), work_orders())
+
+    assert analyzer.pipeline_trend('quarter') is None
+    with pytest.raises(ValueError):
+        analyzer.throughput_trend('fortnight')
+
+
+def test_quarter_scope_slices_the_date_index():
+    scoped = Analyzer(deals(), work_orders()).scoped(quarter='2026-Q1')
+
+    assert scoped.deals_df['id'].tolist() == ['1', '2']
+    assert scoped.work_orders_df['id'].tolist() == ['1', '2']
+    assert list(scoped.deals_df.index) == [0, 1]
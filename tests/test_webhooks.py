@@ -0,0 +1,201 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+import pandas as pd
+import pytest
+from src.analyzer import Analyzer
+from src.data_processor import compact_dataframe, normalize_dataframe
+from src.fetcher import BoardFrames
+from src.webhooks import UNKNOWN, WebhookPatcher, WebhookServer, cell_text, create_webhook_server
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'monday_webhook_events.json')
+
+SCHEMA = [
+    {'id': 'deal_stage', 'title': 'Deal Stage', 'type': 'status'},
+    {'id': 'deal_value', 'title': 'Deal Value', 'type': 'numbers'},
+    {'id': 'close_date', 'title': 'Close Date', 'type': 'date'},
+    {'id': 'owner', 'title': 'Owner', 'type': 'people'},
+]
+
+
+def item(item_id, name, stage, value, owner='Ann Lee', close='2026-03-31'):
+    return {'id': str(item_id), 'name': name, 'updated_at': '2026-03-01T00:00:00Z', 'column_values': [
+        {'id': 'deal_stage', 'text': stage, 'type': 'status'},
+        {'id': 'deal_value', 'text': value, 'type': 'numbers'},
+        {'id': 'close_date', 'text': close, 'type': 'date'},
+        {'id': 'owner', 'text': owner, 'type': 'people'},
+    ]}
+
+
+class WebhookClient:
+    def __init__(self):
+        self.schema_calls = 0
+        self.fetched = []
+
+    def get_board_schema(self, board_id):
+        self.schema_calls += 1
+        return SCHEMA
+
+    def get_items(self, item_ids):
+        self.fetched.extend(item_ids)
+        return [item(3, 'Gamma Farms', 'Proposal', '1000', owner='Ben Ortiz', close='2026-04-30')]
+
+
+class StaticSyncer:
+    cache = None
+
+    def sync(self, board_id):
+        if board_id == 222:
+            return pd.DataFrame({'id': ['50'], 'Status': ['Done']})
+        items = [item(1, 'Alpha Mine', 'Lead', '1000'), item(2, 'Beta Solar', 'Lead', '2000')]
+        return normalize_dataframe(items, {col['id']: col['title'] for col in SCHEMA})
+
+
+def load_frames(client):
+    board_frames = BoardFrames(client, [('deals', 111), ('work_orders', 222)], syncer=StaticSyncer())
+    board_frames.load()
+    return board_frames
+
+
+def post(url, payload):
+    request = urllib.request.Request(url, json.dumps(payload).encode(), {'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def test_cell_text_matches_monday_text():
+    assert cell_text('status', {'label': {'index': 1, 'text': 'Done'}, 'post_id': None}) == 'Done'
+    assert cell_text('numbers', {'value': 4500, 'unit': None}) == '4500'
+    assert cell_text('date', {'date': '2026-04-30', 'time': '10:00:00'}) == '2026-04-30 10:00:00'
+    assert cell_text('dropdown', {'chosenValues': [{'id': 1, 'name': 'Mining'}, {'id': 2, 'name': 'Energy'}]}) == 'Mining, Energy'
+    assert cell_text('text', {'value': ''}) is None
+    assert cell_text('people', {'personsAndTeams': [{'id': 1, 'kind': 'person'}]}) is UNKNOWN
+
+
+def test_replayed_events_patch_frames_and_invalidate_only_their_aggregates():
+    with open(FIXTURES) as f:
+        payloads = json.load(f)
+    client = WebhookClient()
+    board_frames = load_frames(client)
+    orders = board_frames.frames['work_orders']
+    analyzer = Analyzer(board_frames.frames['deals'], orders)
+    assert analyzer.pipeline_metrics()['total_value'] == 3000
+    operations = analyzer.operations_metrics()
+
+    patcher = WebhookPatcher(board_frames)
+    with WebhookServer(patcher) as server:
+        results = [post(server.url, payload) for payload in payloads]
+
+    assert results == [
+        {'challenge': payloads[0]['challenge']},
+        {'result': 'updated'},
+        {'result': 'updated'},
+        {'result': 'created'},
+        {'result': 'updated'},
+        {'result': 'deleted'},
+        {'result': 'ignored'},
+    ]
+    deals = board_frames.frames['deals'].set_index('id')
+    assert list(deals.index) == ['2', '3']
+    assert deals.loc['2', 'Deal Value'] == 4500
+    assert deals.loc['2', 'updated_at'] == '2026-03-02T09:16:11.000Z'
+    assert deals.loc['3', 'Deal Stage'] == 'Proposal'
+    assert deals.loc['3', 'Close Date'] == pd.Timestamp('2026-04-30')
+    assert deals.loc['3', 'Owner'] == ['Ben Ortiz']
+    assert isinstance(deals['Deal Stage'].dtype, pd.CategoricalDtype)
+    # Only the people value needed the API, and the schema is read once
+    assert client.fetched == ['3']
+    assert client.schema_calls == 1
+
+    analyzer.deals_df = board_frames.frames['deals']
+    analyzer.work_orders_df = board_frames.frames['work_orders']
+    assert board_frames.frames['work_orders'] is orders
+    assert analyzer.operations_metrics() is operations
+    assert analyzer.pipeline_metrics()['total_value'] == 5500
+    assert dict(analyzer.pipeline_metrics()['stage_counts']) == {'Lead': 1, 'Proposal': 1}
+
+
+def test_status_change_to_a_new_label_extends_categories():
+    board_frames = load_frames(WebhookClient())
+    WebhookPatcher(board_frames).apply({
+        'type': 'update_column_value', 'boardId': 111, 'pulseId': 1, 'columnId': 'deal_stage',
+        'value': {'label': {'index': 5, 'text': 'Negotiation'}}, 'triggerTime': '2026-03-02T10:00:00.000Z',
+    })
+
+    stages = board_frames.frames['deals'].set_index('id')['Deal Stage']
+    assert stages['1'] == 'Negotiation'
+    assert set(stages.cat.categories) >= {'Lead', 'Negotiation'}
+
+
+def test_events_patch_compacted_frames():
+    board_frames = load_frames(WebhookClient())
+    board_frames.apply_patch('deals', compact_dataframe)
+    patcher = WebhookPatcher(board_frames)
+
+    assert patcher.apply({'type': 'update_column_value', 'boardId': 111, 'pulseId': 2, 'columnId': 'deal_value',
+                          'value': {'value': 4500}, 'triggerTime': '2026-03-02T10:00:00.000Z'}) == 'updated'
+    assert patcher.apply({'type': 'delete_pulse', 'boardId': 111, 'pulseId': 1}) == 'deleted'
+    assert patcher.apply({'type': 'create_pulse', 'boardId': 111, 'pulseId': 3, 'pulseName': 'Gamma Farms',
+                          'columnValues': {'deal_value': {'value': 1000}}}) == 'created'
+
+    deals = board_frames.frames['deals'].set_index('id')
+    assert deals['Deal Value'].to_dict() == {2: 4500, 3: 1000}
+    assert deals.index.dtype == 'int64'
+
+
+def test_server_rejects_requests_without_the_token():
+    board_frames = load_frames(WebhookClient())
+    with WebhookServer(WebhookPatcher(board_frames), token='s3cret') as server:
+        try:
+            post(server.url, {'challenge': 'x'})
+        except urllib.error.HTTPError as e:
+            assert e.code == 403
+        else:
+            raise AssertionError("expected a 403")
+        assert post(server.url + '?token=s3cret', {'challenge': 'x'}) == {'challenge': 'x'}
+
+
+def signed(claims, secret):
+    encode = lambda data: base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b'=').decode()
+    unsigned = f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode(claims)}"
+    signature = hmac.new(secret.encode(), unsigned.encode(), hashlib.sha256).digest()
+    return f"{unsigned}.{base64.urlsafe_b64encode(signature).rstrip(b'=').decode()}"
+
+
+def test_unauthenticated_events_are_rejected():
+    board_frames = load_frames(WebhookClient())
+    version = board_frames.version
+    delete = {'event': {'type': 'delete_pulse', 'boardId': 111, 'pulseId': 1}}
+    with WebhookServer(WebhookPatcher(board_frames), token='s3cret', signing_secret='sign-me') as server:
+        for authorization in (None, signed({'exp': time.time() + 60}, 'wrong'), signed({'exp': time.time() - 1}, 'sign-me')):
+            request = urllib.request.Request(server.url, json.dumps(delete).encode(),
+                                             {'Authorization': authorization} if authorization else {})
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(request)
+            assert error.value.code == 403
+        assert board_frames.version == version
+
+        request = urllib.request.Request(server.url, json.dumps(delete).encode(),
+                                         {'Authorization': signed({'exp': time.time() + 60}, 'sign-me')})
+        urllib.request.urlopen(request).close()
+    assert board_frames.frames['deals']['id'].tolist() == ['2']
+
+
+def test_receiver_stays_on_loopback_without_credentials(monkeypatch):
+    board_frames = load_frames(WebhookClient())
+    monkeypatch.setenv('MONDAY_WEBHOOK_PORT', '0')
+    server = create_webhook_server(board_frames)
+    assert server.url.startswith('http://127.0.0.1:')
+    server.stop()
+
+    monkeypatch.setenv('MONDAY_WEBHOOK_HOST', '0.0.0.0')
+    assert create_webhook_server(board_frames) is None
+    monkeypatch.setenv('MONDAY_WEBHOOK_TOKEN', 's3cret')
+    server = create_webhook_server(board_frames)
+    assert server is not None and server.token == 's3cret'
+    server.stop()